@@ -0,0 +1,222 @@
+# app/db/crud.py
+#
+# Non-blocking data-access layer over the Supabase client.
+# supabase-py is synchronous, so every `.execute()` runs on a dedicated, bounded thread pool
+# (which also caps concurrent HTTP connections to PostgREST) instead of on the event loop.
+# Only the client's PostgREST interface is used, so SUPABASE_URL can point at any
+# PostgREST-compatible server exposing /rest/v1 (handy for local testing).
+
+import os
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from app.db.database import get_supabase
+from app.utils.metrics import DB_REQUEST_SECONDS, WRITE_BEHIND_DROPPED
+
+logger = logging.getLogger("db")
+
+DB_MAX_WORKERS = int(os.getenv("DB_MAX_WORKERS", "16"))
+WRITE_BEHIND_INTERVAL = float(os.getenv("WRITE_BEHIND_INTERVAL", "1.0"))
+WRITE_BEHIND_MAX_BATCH = int(os.getenv("WRITE_BEHIND_MAX_BATCH", "200"))
+# A buffered write that keeps failing is dropped after this many flushes
+WRITE_BEHIND_MAX_ATTEMPTS = int(os.getenv("WRITE_BEHIND_MAX_ATTEMPTS", "5"))
+
+_db_executor = ThreadPoolExecutor(max_workers=DB_MAX_WORKERS, thread_name_prefix="supabase")
+
+
+# --------------------------------------------------------------------------------------
+#  CORE
+# --------------------------------------------------------------------------------------
+async def execute(query, table: str = "", op: str = "") -> Any:
+    """Runs a built postgrest query (anything with `.execute()`) off the event loop."""
+    loop = asyncio.get_running_loop()
+    with DB_REQUEST_SECONDS.time(table=table, op=op):
+        return await loop.run_in_executor(_db_executor, query.execute)
+
+
+def _apply_filters(query, filters: Optional[Dict[str, Any]]):
+    for column, value in (filters or {}).items():
+        query = query.eq(column, value)
+    return query
+
+
+async def select(table: str, columns: str = "*", filters: Optional[Dict[str, Any]] = None, limit: Optional[int] = None,
+                 order: Optional[str] = None) -> List[dict]:
+    query = _apply_filters(get_supabase().table(table).select(columns), filters)
+    if order is not None:
+        query = query.order(order)
+    if limit is not None:
+        query = query.limit(limit)
+    result = await execute(query, table, "select")
+    return result.data or []
+
+
+async def select_one(table: str, columns: str = "*", filters: Optional[Dict[str, Any]] = None) -> Optional[dict]:
+    rows = await select(table, columns, filters, limit=1)
+    return rows[0] if rows else None
+
+
+async def insert(table: str, rows: Union[dict, List[dict]]) -> List[dict]:
+    """Single- or multi-row insert in one round-trip. Returns the inserted rows."""
+    result = await execute(get_supabase().table(table).insert(rows), table, "insert")
+    return result.data or []
+
+
+async def upsert(table: str, rows: Union[dict, List[dict]], on_conflict: str, ignore_duplicates: bool = False) -> List[dict]:
+    """Insert that skips (or overwrites) rows clashing on `on_conflict`, so replays are idempotent."""
+    query = get_supabase().table(table).upsert(rows, on_conflict=on_conflict, ignore_duplicates=ignore_duplicates)
+    result = await execute(query, table, "upsert")
+    return result.data or []
+
+
+async def update(table: str, values: dict, filters: Dict[str, Any]) -> List[dict]:
+    result = await execute(_apply_filters(get_supabase().table(table).update(values), filters), table, "update")
+    return result.data or []
+
+
+def shutdown():
+    _db_executor.shutdown(wait=True)
+
+
+def _rejected(error: Exception) -> bool:
+    """
+    True when PostgREST answered with a client error (unknown column, constraint, bad JWT...),
+    which no retry will fix. Its connection errors (PGRST0xx) and Postgres' transient classes
+    (connection, serialization, resources, timeouts) are worth another try.
+    """
+    code = str(getattr(error, "code", "") or "")
+    if not code:
+        return False
+    return not (code.startswith("PGRST0") or code[:2] in ("08", "40", "53", "57"))
+
+
+# --------------------------------------------------------------------------------------
+#  WRITE-BEHIND QUEUE
+# --------------------------------------------------------------------------------------
+class WriteBehindQueue:
+    """
+    Buffers non-critical writes and flushes them in the background:
+    inserts to the same table become one multi-row insert, and repeated updates
+    to the same row are merged so only the latest values are written.
+    A failed write is retried on the next flushes, up to WRITE_BEHIND_MAX_ATTEMPTS, unless
+    PostgREST rejected it outright; dropped writes are counted in WRITE_BEHIND_DROPPED.
+
+    Anything the caller must read back immediately (e.g. a new row's id) should use insert() directly.
+    """
+
+    def __init__(self, interval: float = WRITE_BEHIND_INTERVAL, max_batch: int = WRITE_BEHIND_MAX_BATCH,
+                 max_attempts: int = WRITE_BEHIND_MAX_ATTEMPTS):
+        self.interval = interval
+        self.max_batch = max_batch
+        self.max_attempts = max_attempts
+        # (row, failed attempts so far)
+        self._inserts: Dict[str, List[Tuple[dict, int]]] = {}
+        self._updates: Dict[Tuple[str, Tuple], dict] = {}
+        self._update_attempts: Dict[Tuple[str, Tuple], int] = {}
+        self._on_flushed: Dict[Tuple[str, Tuple], Callable[[], None]] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._flush_lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+
+    def enqueue_insert(self, table: str, row: dict):
+        self._inserts.setdefault(table, []).append((row, 0))
+        if len(self._inserts[table]) >= self.max_batch:
+            self._wakeup.set()
+
+    def enqueue_update(self, table: str, filters: Dict[str, Any], values: dict,
+                       on_flushed: Optional[Callable[[], None]] = None):
+        """
+        `on_flushed` runs once the update is written, e.g. to drop caches of the row.
+        Updates to the same row share one write, so the latest callback replaces earlier ones.
+        """
+        key = (table, tuple(sorted(filters.items())))
+        self._updates.setdefault(key, {}).update(values)
+        if on_flushed is not None:
+            self._on_flushed[key] = on_flushed
+
+    @property
+    def pending(self) -> int:
+        return sum(len(rows) for rows in self._inserts.values()) + len(self._updates)
+
+    async def flush(self):
+        async with self._flush_lock:
+            inserts, self._inserts = self._inserts, {}
+            updates, self._updates = self._updates, {}
+            on_flushed, self._on_flushed = self._on_flushed, {}
+
+            for table, entries in inserts.items():
+                for start in range(0, len(entries), self.max_batch):
+                    chunk = entries[start:start + self.max_batch]
+                    try:
+                        await insert(table, [row for row, _ in chunk])
+                    except Exception as e:
+                        logger.error(f"❌ Write-behind insert into {table} failed ({len(chunk)} rows): {e}")
+                        retry = [] if _rejected(e) else [(row, attempts + 1) for row, attempts in chunk
+                                                         if attempts + 1 < self.max_attempts]
+                        self._drop(table, "insert", len(chunk) - len(retry))
+                        # Put them back for the next flush
+                        self._inserts.setdefault(table, [])[:0] = retry
+
+            for key, values in updates.items():
+                table, filters = key
+                try:
+                    await update(table, values, dict(filters))
+                except Exception as e:
+                    logger.error(f"❌ Write-behind update on {table} failed: {e}")
+                    attempts = self._update_attempts.pop(key, 0) + 1
+                    if _rejected(e) or attempts >= self.max_attempts:
+                        # Anything enqueued meanwhile still gets its own attempts
+                        self._drop(table, "update", 1)
+                        continue
+                    # Newer values enqueued meanwhile win over the failed ones
+                    self._updates[key] = {**values, **self._updates.get(key, {})}
+                    self._update_attempts[key] = attempts
+                    if key in on_flushed:
+                        self._on_flushed.setdefault(key, on_flushed[key])
+                    continue
+                self._update_attempts.pop(key, None)
+                callback = on_flushed.get(key)
+                if callback is not None:
+                    try:
+                        callback()
+                    except Exception as e:
+                        logger.warning(f"⚠️ Write-behind callback for {table} failed: {e}")
+
+    @staticmethod
+    def _drop(table: str, op: str, count: int):
+        if count:
+            logger.error(f"❌ Write-behind gave up on {count} {op}(s) on {table}")
+            WRITE_BEHIND_DROPPED.inc(count, table=table, op=op)
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            if self.pending:
+                # Shielded so a shutdown mid-flush does not drop the rows already swapped out
+                await asyncio.shield(self.flush())
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stops the background loop and flushes whatever is still buffered."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+        if self.pending:
+            logger.error(f"❌ {self.pending} buffered writes could not be flushed on shutdown")
+
+
+write_behind = WriteBehindQueue()
@@ -1,63 +1,47 @@
 import os
 import logging
+import threading
+
 from dotenv import load_dotenv
-from supabase import create_client, Client
+
+logger = logging.getLogger("db")
 
 # absolute path to the backend/.env file
 BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
 ENV_PATH = os.path.join(BACKEND_DIR, ".env")
 
-print("Loading .env from:", ENV_PATH)
-print("Exists:", os.path.exists(ENV_PATH))
-
+# Loading the file is cheap and has to happen before the other modules read their settings;
+# building the client is deferred to first use (see get_supabase)
 load_dotenv(ENV_PATH)
 
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_KEY")
 
+_client = None
+_client_lock = threading.Lock()
 
-if not SUPABASE_URL or not SUPABASE_KEY:
-
-    raise ValueError("Supabase credentials missing in .env")
 
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+def supabase_configured() -> bool:
+    return bool(SUPABASE_URL and SUPABASE_KEY)
 
-# --------------------------------------------------------------------------------------
-#  CREATE THE RESUME_DATA TABLE IF IT DOESN'T EXIST
-# --------------------------------------------------------------------------------------
 
-def create_tables():
-    """Creates users and resume_data tables if they don't exist."""
-
-    users_sql = """
-    CREATE TABLE IF NOT EXISTS public.users (
-        id SERIAL PRIMARY KEY,
-        email TEXT UNIQUE NOT NULL,
-        name TEXT,
-        created_at TIMESTAMP DEFAULT NOW()
-    );
+def get_supabase():
     """
-
-    resume_sql = """
-    CREATE TABLE IF NOT EXISTS public.resume_data (
-        id SERIAL PRIMARY KEY,
-        user_id TEXT,
-        name TEXT,
-        email TEXT,
-        phone TEXT,
-        skills TEXT[] DEFAULT '{}',
-        education TEXT[] DEFAULT '{}',
-        experience TEXT[] DEFAULT '{}',
-        projects TEXT[] DEFAULT '{}',
-        raw_text TEXT,
-        created_at TIMESTAMP DEFAULT NOW()
-    );
+    Returns the process-wide Supabase client, creating it on first use.
+    Nothing connects at import time, so workers boot without touching Supabase.
     """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                if not supabase_configured():
+                    raise ValueError(f"Supabase credentials missing (looked in the environment and {ENV_PATH})")
+                from supabase import create_client
+
+                _client = create_client(SUPABASE_URL, SUPABASE_KEY)
+                logger.info("🔌 Supabase client created")
+    return _client
+
 
-    # Execute SQL on Supabase
-    try:
-        supabase.rpc("exec", {"query": users_sql})
-        supabase.rpc("exec", {"query": resume_sql})
-        print("✅ Tables created successfully!")
-    except Exception as e:
-        print(f"❌ Error creating tables: {e}")
\ No newline at end of file
+def supabase_client_built() -> bool:
+    return _client is not None
@@ -0,0 +1,80 @@
+# app/db/migrate.py
+#
+# Schema setup, run once per deploy instead of on every worker boot:
+#
+#   python -m app.db.migrate
+#
+# Every statement is idempotent (IF NOT EXISTS), so re-running it is safe.
+
+import sys
+import logging
+
+from app.db.database import get_supabase
+
+logger = logging.getLogger("db")
+
+# --------------------------------------------------------------------------------------
+#  CREATE THE USERS / RESUME_DATA / INTERVIEW_TRANSCRIPTS TABLES IF THEY DON'T EXIST
+# --------------------------------------------------------------------------------------
+USERS_SQL = """
+CREATE TABLE IF NOT EXISTS public.users (
+    id SERIAL PRIMARY KEY,
+    email TEXT UNIQUE NOT NULL,
+    name TEXT,
+    created_at TIMESTAMP DEFAULT NOW()
+);
+"""
+
+RESUME_SQL = """
+CREATE TABLE IF NOT EXISTS public.resume_data (
+    id SERIAL PRIMARY KEY,
+    user_id TEXT,
+    name TEXT,
+    email TEXT,
+    phone TEXT,
+    skills TEXT[] DEFAULT '{}',
+    education TEXT[] DEFAULT '{}',
+    experience TEXT[] DEFAULT '{}',
+    projects TEXT[] DEFAULT '{}',
+    raw_text TEXT,
+    content_hash TEXT,
+    created_at TIMESTAMP DEFAULT NOW()
+);
+ALTER TABLE public.resume_data ADD COLUMN IF NOT EXISTS content_hash TEXT;
+CREATE INDEX IF NOT EXISTS resume_data_content_hash_idx ON public.resume_data (content_hash);
+"""
+
+TRANSCRIPTS_SQL = """
+CREATE TABLE IF NOT EXISTS public.interview_transcripts (
+    id TEXT PRIMARY KEY,
+    interview_id TEXT NOT NULL,
+    role TEXT NOT NULL,
+    text TEXT NOT NULL,
+    final BOOLEAN DEFAULT TRUE,
+    interrupted BOOLEAN DEFAULT FALSE,
+    at DOUBLE PRECISION NOT NULL,
+    created_at TIMESTAMP DEFAULT NOW()
+);
+CREATE INDEX IF NOT EXISTS interview_transcripts_interview_idx ON public.interview_transcripts (interview_id, at);
+"""
+
+MIGRATIONS = [("users", USERS_SQL), ("resume_data", RESUME_SQL), ("interview_transcripts", TRANSCRIPTS_SQL)]
+
+
+def create_tables() -> bool:
+    """Creates the app's tables if they don't exist. Returns False if any step failed."""
+    supabase = get_supabase()
+    ok = True
+    for name, sql in MIGRATIONS:
+        try:
+            supabase.rpc("exec", {"query": sql}).execute()
+            logger.info(f"✅ {name} table ready")
+        except Exception as e:
+            logger.error(f"❌ Error creating {name} table: {e}")
+            ok = False
+    return ok
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(0 if create_tables() else 1)
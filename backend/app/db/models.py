@@ -0,0 +1,52 @@
+# app/db/models.py
+#
+# Table names, column projections and row shapes for the Supabase (PostgREST) tables.
+# Keeping projections here means every query asks only for the columns it actually uses.
+
+from typing import List, Optional, TypedDict
+
+INTERVIEWS_TABLE = "interviews"
+RESUME_DATA_TABLE = "resume_data"
+USERS_TABLE = "users"
+TRANSCRIPTS_TABLE = "interview_transcripts"
+
+INTERVIEW_COLUMNS = "id, user_id, role, job_type, rounds, job_description, resume_id, status"
+# Everything the prompt builder needs from a resume (raw_text deliberately excluded)
+RESUME_PROFILE_COLUMNS = "id, name, skills, experience, projects"
+RESUME_PARSED_COLUMNS = "name, email, phone, skills, education, experience, projects, raw_text"
+TRANSCRIPT_COLUMNS = "id, role, text, final, interrupted, at"
+
+
+class InterviewRow(TypedDict, total=False):
+    id: str
+    user_id: str
+    role: str
+    job_type: str
+    rounds: List[str]
+    job_description: Optional[str]
+    resume_id: Optional[int]
+    status: str
+
+
+class ResumeRow(TypedDict, total=False):
+    id: int
+    user_id: str
+    name: Optional[str]
+    email: Optional[str]
+    phone: Optional[str]
+    skills: List[str]
+    education: List[str]
+    experience: List[str]
+    projects: List[str]
+    raw_text: Optional[str]
+    content_hash: Optional[str]
+
+
+class TranscriptRow(TypedDict, total=False):
+    id: str                 # "<log id>.<seq>", unique so WAL replays are idempotent
+    interview_id: str
+    role: str               # "user" | "assistant"
+    text: str
+    final: bool             # False for interim ASR hypotheses
+    interrupted: bool       # assistant reply cut off by barge-in
+    at: float               # unix time the entry was recorded
@@ -0,0 +1,155 @@
+# app/dependencies.py
+#
+# Service container. Nothing here connects at import time: the Supabase client, the Groq
+# connection pool and the PDF workers are all built on first use, routes get them through
+# the FastAPI dependencies at the bottom, and the background pieces are started/stopped
+# from main.py's lifespan via `services.startup()` / `services.shutdown()`.
+#
+# Schema setup is not part of boot any more; run `python -m app.db.migrate` once per deploy.
+
+import os
+import time
+import asyncio
+import logging
+from typing import Optional
+
+from app.db import crud
+from app.db.database import get_supabase, supabase_configured
+from app.services.llm_gateway import llm_gateway, LLMGateway
+from app.services.pdf_service import pdf_extractor
+from app.services.webrtc_manager import manager, ConnectionManager
+from app.services.warmup_service import warmup_service
+from app.services.transcript_store import transcript_store, TranscriptStore
+from app.services.bulk_ingest_service import bulk_ingest_service
+
+logger = logging.getLogger("services")
+
+# Build clients in the background right after boot instead of on the first request
+STARTUP_WARMUP = os.getenv("STARTUP_WARMUP", "false").lower() in ("1", "true", "yes")
+# Local development convenience only; deployments run the migrate command instead
+MIGRATE_ON_STARTUP = os.getenv("MIGRATE_ON_STARTUP", "false").lower() in ("1", "true", "yes")
+# /readyz probes Supabase at most this often; in between, the last result is reused
+READINESS_DB_CHECK_TTL = float(os.getenv("READINESS_DB_CHECK_TTL", "30"))
+READINESS_DB_TIMEOUT = float(os.getenv("READINESS_DB_TIMEOUT", "2"))
+
+
+class ServiceContainer:
+
+    def __init__(self):
+        self.started = False
+        self.draining = False
+        self._warmup_task: Optional[asyncio.Task] = None
+        self._recovery_task: Optional[asyncio.Task] = None
+        self._db_checked_at = 0.0
+        self._db_ok = False
+        self._db_lock = asyncio.Lock()
+
+    # ----------------------------------------------------------------------------------
+    #  CLIENTS (built on first access)
+    # ----------------------------------------------------------------------------------
+    @property
+    def supabase(self):
+        return get_supabase()
+
+    @property
+    def llm(self) -> LLMGateway:
+        return llm_gateway
+
+    @property
+    def sessions(self) -> ConnectionManager:
+        return manager
+
+    # ----------------------------------------------------------------------------------
+    #  LIFECYCLE
+    # ----------------------------------------------------------------------------------
+    async def startup(self):
+        if MIGRATE_ON_STARTUP:
+            from app.db.migrate import create_tables
+            await asyncio.to_thread(create_tables)
+        crud.write_behind.start()
+        transcript_store.start()
+        manager.start()
+        # Transcripts a crashed worker never flushed; nobody waits on this
+        self._recovery_task = asyncio.create_task(transcript_store.recover())
+        if STARTUP_WARMUP:
+            self._warmup_task = asyncio.create_task(self.warmup())
+        self.started = True
+
+    async def warmup(self):
+        """Builds the clients ahead of the first request. Failures are logged, never fatal."""
+        started = time.perf_counter()
+        try:
+            # Importing supabase-py and building the client is the slow part; keep it off the loop
+            await asyncio.to_thread(get_supabase)
+            llm_gateway.client
+            pdf_extractor.executor
+            logger.info(f"🔥 Warm-up finished in {time.perf_counter() - started:.2f}s")
+        except Exception as e:
+            logger.warning(f"⚠️ Warm-up failed: {e}")
+
+    async def shutdown(self):
+        self.draining = True
+        if self._warmup_task is not None:
+            self._warmup_task.cancel()
+        await manager.shutdown()
+        if self._recovery_task is not None:
+            await asyncio.gather(self._recovery_task, return_exceptions=True)
+        await transcript_store.stop()
+        await warmup_service.shutdown()
+        # Before the write-behind/DB teardown: a cancelled job still saves the batch it holds
+        await bulk_ingest_service.shutdown()
+        await crud.write_behind.stop()
+        crud.shutdown()
+        await llm_gateway.aclose()
+        pdf_extractor.shutdown()
+
+    # ----------------------------------------------------------------------------------
+    #  HEALTH
+    # ----------------------------------------------------------------------------------
+    async def readiness(self) -> dict:
+        """
+        Whether this worker should receive new traffic. The database probe is cached for
+        READINESS_DB_CHECK_TTL, so frequent probes from the orchestrator don't reach Supabase.
+        """
+        checks = {
+            "started": self.started and not self.draining,
+            "config": supabase_configured() and bool(llm_gateway.api_key),
+            "capacity": not manager.at_capacity,
+        }
+        if checks["started"] and checks["config"]:
+            checks["database"] = await self._database_ok()
+        return {"ready": all(checks.values()), "checks": checks}
+
+    async def _database_ok(self) -> bool:
+        if time.monotonic() - self._db_checked_at < READINESS_DB_CHECK_TTL:
+            return self._db_ok
+        async with self._db_lock:
+            # Another probe may have refreshed it while we waited
+            if time.monotonic() - self._db_checked_at < READINESS_DB_CHECK_TTL:
+                return self._db_ok
+            try:
+                await asyncio.wait_for(crud.select("resume_data", "id", limit=1), timeout=READINESS_DB_TIMEOUT)
+                self._db_ok = True
+            except Exception as e:
+                logger.warning(f"⚠️ Readiness: database check failed: {e}")
+                self._db_ok = False
+            self._db_checked_at = time.monotonic()
+        return self._db_ok
+
+
+services = ServiceContainer()
+
+
+# --------------------------------------------------------------------------------------
+#  FASTAPI DEPENDENCIES
+# --------------------------------------------------------------------------------------
+def get_services() -> ServiceContainer:
+    return services
+
+
+def get_connection_manager() -> ConnectionManager:
+    return services.sessions
+
+
+def get_transcript_store() -> TranscriptStore:
+    return transcript_store
@@ -14,4 +14,9 @@ class InterviewCreateRequest(BaseModel):
 class InterviewResponse(BaseModel):
     interview_id: str
     status: str
-    message: str
\ No newline at end of file
+    message: str
+
+# Schema for a message routed to a live interview (whichever worker holds it)
+class InterviewMessageRequest(BaseModel):
+    message: str
+    mode: str = "token"
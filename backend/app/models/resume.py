@@ -1,12 +1,25 @@
-from pydantic import BaseModel
-from typing import List, Optional
+from pydantic import BaseModel, BeforeValidator, Field, TypeAdapter
+from typing import Annotated, List, Optional
+
+from app.utils.validation import as_optional_text, as_term_list, as_text_list
+
+# Columns are TEXT / TEXT[]: whatever shape the LLM returns (objects, grouped skills,
+# comma-joined strings) is normalized on the way in
+Text = Annotated[Optional[str], BeforeValidator(as_optional_text)]
+TextList = Annotated[List[str], BeforeValidator(as_text_list)]
+TermList = Annotated[List[str], BeforeValidator(as_term_list)]
 
 class ResumeParsed(BaseModel):
-    name: Optional[str]
-    email: Optional[str]
-    phone: Optional[str]
-    skills: Optional[List[str]] = []
-    education: Optional[List[str]] = []
-    experience: Optional[List[str]] = []
-    projects: Optional[List[str]] = []
-    raw_text: Optional[str]
+    name: Text = None
+    email: Text = None
+    phone: Text = None
+    skills: TermList = Field(default_factory=list)
+    education: TextList = Field(default_factory=list)
+    experience: TextList = Field(default_factory=list)
+    projects: TextList = Field(default_factory=list)
+    raw_text: Optional[str] = None
+
+# Built once at import: validating LLM output is on every parse
+RESUME_ADAPTER = TypeAdapter(ResumeParsed)
+# What the LLM is asked for (raw_text is ours)
+RESUME_LLM_FIELDS = ("name", "email", "phone", "skills", "education", "experience", "projects")
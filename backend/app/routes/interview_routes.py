@@ -1,6 +1,10 @@
-from fastapi import APIRouter, HTTPException
-from app.models.interview import InterviewCreateRequest, InterviewResponse
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException
+from app.models.interview import InterviewCreateRequest, InterviewResponse, InterviewMessageRequest
 from app.services.interview_service import InterviewService
+from app.services.webrtc_manager import ConnectionManager
+from app.services.transcript_store import TranscriptStore
+from app.dependencies import get_connection_manager, get_transcript_store
 
 router = APIRouter()
 
@@ -23,4 +27,65 @@ async def create_interview_session(request: InterviewCreateRequest):
     except Exception as e:
         # Log the error and return a 500 to the frontend
         print(f"Error creating session: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/{interview_id}/message")
+async def send_interview_message(
+    interview_id: str,
+    request: InterviewMessageRequest,
+    manager: ConnectionManager = Depends(get_connection_manager),
+):
+    """
+    Sends a candidate message into a live interview. The reply is streamed on the
+    interview's websocket, even when that websocket lives on a different worker.
+    """
+    delivery = await manager.dispatch(
+        interview_id,
+        {"type": "chat", "message": request.message, "mode": request.mode}
+    )
+    if delivery is None:
+        raise HTTPException(status_code=404, detail="No live session for this interview")
+
+    return {"status": "success", "delivery": delivery}
+
+
+@router.post("/{interview_id}/end")
+async def end_interview(
+    interview_id: str,
+    manager: ConnectionManager = Depends(get_connection_manager),
+):
+    """
+    Ends an interview: closes its live session (on whichever worker holds it), marks it
+    completed (written behind, nothing here needs the row back), and drops its warm-up
+    and conversation memory.
+    """
+    delivery = await manager.dispatch(interview_id, {"type": "end"})
+    try:
+        await InterviewService.update_session(interview_id, {"status": "completed"}, background=True)
+    except Exception as e:
+        print(f"Error ending interview: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+    return {"status": "success", "delivery": delivery}
+
+
+@router.get("/{interview_id}/transcript")
+async def get_interview_transcript(
+    interview_id: str,
+    partials: bool = False,
+    since: Optional[float] = None,
+    transcripts: TranscriptStore = Depends(get_transcript_store),
+):
+    """
+    The interview transcript in order, for replay. Includes entries a live session on this
+    worker has not flushed yet. `partials=true` adds interim ASR hypotheses; `since` (unix
+    time of the last entry you have) returns only newer entries.
+    """
+    try:
+        entries = await transcripts.read(interview_id, include_partials=partials, since=since)
+    except Exception as e:
+        print(f"Error reading transcript: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+    return {"interview_id": interview_id, "entries": entries}
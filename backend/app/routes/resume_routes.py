@@ -1,5 +1,10 @@
-from fastapi import APIRouter, UploadFile, File, Form
+import asyncio
+from typing import List
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException
+from fastapi.responses import StreamingResponse
 from app.services.resume_service import parse_resume, save_resume_to_db
+from app.services.bulk_ingest_service import bulk_ingest_service, BULK_MAX_FILES, BULK_MAX_ZIP_BYTES
+from app.utils.file_utils import spool_upload, expand_zip, remove_file, UploadTooLarge, InvalidArchive
 
 router = APIRouter()
 
@@ -8,7 +13,7 @@ async def upload_resume(
     file: UploadFile = File(...),
     user_id: str = Form(...)
 ):
-    parsed = await parse_resume(file)
+    parsed = await parse_resume(file, user_id)
 
     if "error" in parsed:
         return {"status": "error", "details": parsed}
@@ -24,3 +29,57 @@ async def upload_resume(
         "parsed": parsed,
         "saved": saved
     }
+
+
+@router.post("/bulk-upload")
+async def bulk_upload_resumes(
+    files: List[UploadFile] = File(...),
+    user_id: str = Form(...)
+):
+    """
+    Accepts many PDFs and/or zip archives of PDFs in one multipart request.
+    Streams one NDJSON line per resume as it finishes; reconnect with GET /bulk-upload/{job_id}.
+    """
+    items = []
+    try:
+        for upload in files:
+            filename = upload.filename or "resume.pdf"
+            if filename.lower().endswith(".zip"):
+                zip_path, _, _ = await spool_upload(upload, max_bytes=BULK_MAX_ZIP_BYTES, suffix=".zip")
+                try:
+                    members = await asyncio.to_thread(expand_zip, zip_path, BULK_MAX_FILES - len(items))
+                finally:
+                    remove_file(zip_path)
+                items.extend((name, path, digest) for name, path, digest, _ in members)
+            else:
+                if len(items) >= BULK_MAX_FILES:
+                    raise UploadTooLarge(f"More than {BULK_MAX_FILES} files in one request")
+                path, digest, _ = await spool_upload(upload)
+                items.append((filename, path, digest))
+    except BaseException as e:
+        # Whatever went wrong, nothing spooled so far is handed to a job
+        for _, path, _ in items:
+            remove_file(path)
+        if isinstance(e, UploadTooLarge):
+            raise HTTPException(status_code=413, detail=str(e))
+        if isinstance(e, InvalidArchive):
+            raise HTTPException(status_code=400, detail=str(e))
+        raise
+
+    if not items:
+        raise HTTPException(status_code=400, detail="No PDF files found in upload")
+
+    job = bulk_ingest_service.start_job(user_id, items)
+    return StreamingResponse(job.stream(), media_type="application/x-ndjson")
+
+
+@router.get("/bulk-upload/{job_id}")
+async def bulk_upload_progress(job_id: str, offset: int = 0):
+    """
+    Re-attaches to a running (or recently finished) bulk job, streaming results from `offset`.
+    """
+    job = bulk_ingest_service.get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Bulk job not found or expired")
+
+    return StreamingResponse(job.stream(offset), media_type="application/x-ndjson")
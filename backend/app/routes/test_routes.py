@@ -1,7 +1,9 @@
+import json
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from app.services.interview_flow_service import flow_service
-from app.services.llm_service import llm_service
+from app.services.llm_service import llm_service, StreamInterrupted
 import logging
 
 # Setup Logger
@@ -13,6 +15,7 @@ router = APIRouter()
 class TestChatRequest(BaseModel):
     interview_id: str
     user_message: str
+    mode: str = "token"  # "token" or "sentence" (streaming endpoint only)
 
 @router.post("/chat/test")
 async def test_interview_chat(request: TestChatRequest):
@@ -25,7 +28,7 @@ async def test_interview_chat(request: TestChatRequest):
     
     # 1. Fetch Data from Supabase
     logger.info(f"🔍 Fetching Context for ID: {request.interview_id}")
-    context = flow_service.fetch_interview_context(request.interview_id)
+    context = await flow_service.fetch_interview_context(request.interview_id)
     
     if not context:
         raise HTTPException(status_code=404, detail="Interview ID not found")
@@ -39,7 +42,7 @@ async def test_interview_chat(request: TestChatRequest):
     print("="*50 + "\n")
 
     # 2. Generate Prompt
-    system_prompt = flow_service.generate_system_prompt(context)
+    system_prompt = await flow_service.get_system_prompt(request.interview_id, context)
     
     # --- DEBUG LOGGING: SEE THE EXACT PROMPT ---
     print("\n" + "="*50)
@@ -48,7 +51,7 @@ async def test_interview_chat(request: TestChatRequest):
     print("="*50 + "\n")
 
     # 3. Get AI Response
-    ai_reply = llm_service.get_ai_response(system_prompt, request.user_message)
+    ai_reply = await llm_service.get_ai_response(system_prompt, request.user_message)
 
     return {
         "status": "success",
@@ -58,4 +61,36 @@ async def test_interview_chat(request: TestChatRequest):
             "role": context['interview'].get('role'),
             "skills_found": len(context['resume'].get('skills', []))
         }
-    }
\ No newline at end of file
+    }
+
+@router.post("/chat/test/stream")
+async def test_interview_chat_stream(request: TestChatRequest):
+    """
+    Same turn as /chat/test, but the reply is streamed as Server-Sent Events.
+    Each event is a JSON object: {"type": "ai_chunk", "text": ...}, then a final {"type": "ai_done", ...}.
+    """
+    context = await flow_service.fetch_interview_context(request.interview_id)
+
+    if not context:
+        raise HTTPException(status_code=404, detail="Interview ID not found")
+
+    system_prompt = await flow_service.get_system_prompt(request.interview_id, context)
+
+    if request.mode == "sentence":
+        chunks = llm_service.stream_ai_sentences(system_prompt, request.user_message)
+    else:
+        chunks = llm_service.stream_ai_response(system_prompt, request.user_message)
+
+    async def event_stream():
+        parts = []
+        try:
+            async for chunk in chunks:
+                parts.append(chunk)
+                yield f"data: {json.dumps({'type': 'ai_chunk', 'text': chunk})}\n\n"
+        except StreamInterrupted as e:
+            yield f"data: {json.dumps({'type': 'error', 'detail': str(e)})}\n\n"
+
+        separator = " " if request.mode == "sentence" else ""
+        yield f"data: {json.dumps({'type': 'ai_done', 'text': separator.join(parts)})}\n\n"
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
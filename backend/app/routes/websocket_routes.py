@@ -1,33 +1,70 @@
 # app/routes/websocket_routes.py
 import json
+import itertools
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 from app.services.webrtc_manager import manager
+from app.utils.logging import get_trace_id, set_trace_id
+from app.utils.metrics import WS_MESSAGE_SECONDS
 
 router = APIRouter()
 
+# Anything else is labelled "other" so clients can't blow up the metric's cardinality
+MESSAGE_TYPES = {"ping", "offer", "candidate", "chat", "interrupt"}
+
 @router.websocket("/ws/interview/{interview_id}")
 async def interview_websocket(websocket: WebSocket, interview_id: str):
-    # 1. Connect
-    await manager.connect(interview_id, websocket)
-    
+    # 1. Connect (may be rejected when this worker is at capacity)
+    session = await manager.connect(interview_id, websocket)
+    if session is None:
+        return
+
+    connection_trace = get_trace_id()
+
     try:
-        while True:
+        for sequence in itertools.count(1):
             # 2. Listen
             data = await websocket.receive_text()
             message = json.loads(data)
+            session.touch()
+
+            # One trace id per message; anything spawned while handling it inherits the id
+            set_trace_id(f"{connection_trace}.{sequence}")
+
+            kind = message.get("type") if message.get("type") in MESSAGE_TYPES else "other"
+            with WS_MESSAGE_SECONDS.time(type=kind):
+                # Heartbeat
+                if message.get("type") == "ping":
+                    await websocket.send_json({"type": "pong"})
+
+                # 3. Handle Offer
+                elif message.get("type") == "offer":
+                    response = await manager.handle_offer(
+                        interview_id,
+                        message["sdp"],
+                        message["type"],
+                        trickle=message.get("trickle", False)
+                    )
+                    if response:
+                        await websocket.send_json(response)
+
+                # Trickle ICE: remote candidate (or end-of-candidates)
+                elif message.get("type") == "candidate":
+                    await manager.add_ice_candidate(interview_id, message)
+
+                # 4. Handle Chat (streamed reply, runs in the background)
+                elif message.get("type") == "chat":
+                    await manager.stream_reply(
+                        interview_id,
+                        message["message"],
+                        message.get("mode", "token")
+                    )
 
-            # 3. Handle Offer
-            if message.get("type") == "offer":
-                response = await manager.handle_offer(
-                    interview_id, 
-                    message["sdp"], 
-                    message["type"]
-                )
-                if response:
-                    await websocket.send_json(response)
+                # 5. Candidate cut the interviewer off: stop the reply mid-stream
+                elif message.get("type") == "interrupt":
+                    await manager.interrupt(interview_id, message.get("reason", "interrupt"))
 
     except WebSocketDisconnect:
-        manager.disconnect(interview_id)
+        await manager.disconnect(interview_id, session)
     except Exception as e:
         print(f"Error in websocket: {e}")
-        manager.disconnect(interview_id)
\ No newline at end of file
+        await manager.disconnect(interview_id, session)
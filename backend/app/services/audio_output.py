@@ -0,0 +1,216 @@
+# app/services/audio_output.py
+#
+# Interviewer reply text -> sentences -> TTS -> outbound aiortc audio track.
+#
+#   feed():     LLM deltas accumulate until a sentence is complete, which is queued right away
+#   synthesis:  one task works through the queue, writing PCM into the track's jitter buffer
+#   playout:    aiortc pulls a 20 ms frame every 20 ms (recv), paced against the wall clock
+# Synthesis only waits for buffer space, not for playback, so sentence N+1 is synthesized
+# while sentence N is playing and the LLM is still writing N+2.
+
+import os
+import time
+import asyncio
+import fractions
+import logging
+from contextlib import aclosing
+from typing import Optional
+
+import numpy as np
+from av import AudioFrame
+from aiortc.mediastreams import MediaStreamError, MediaStreamTrack
+
+from app.services.audio_pipeline import AudioRingBuffer
+from app.services.llm_service import SENTENCE_END
+from app.services.tts_service import TTSBackend, TTS_SAMPLE_RATE, TTS_BACKEND
+from app.utils.metrics import TTS_FIRST_AUDIO_SECONDS, TTS_UNDERRUNS
+
+logger = logging.getLogger("audio_output")
+
+TTS_FRAME_MS = 20
+# Synthesized audio allowed ahead of playback; synthesis waits once this much is queued
+TTS_BUFFER_SECONDS = float(os.getenv("TTS_BUFFER_SECONDS", "15"))
+# Audio held back before playback (re)starts, to ride out uneven synthesis
+TTS_JITTER_MS = int(os.getenv("TTS_JITTER_MS", "60"))
+
+_END_OF_REPLY = object()
+
+
+class OutboundAudioTrack(MediaStreamTrack):
+    """
+    Audio track the interviewer speaks on. Plays silence until there is speech; PCM written with
+    `write` goes through a preallocated int16 jitter buffer and comes out as 20 ms frames.
+    Playback of an utterance starts once TTS_JITTER_MS are buffered (or the reply is complete);
+    an underrun mid-reply pads the frame with silence and re-primes the buffer.
+    """
+
+    kind = "audio"
+
+    def __init__(self, sample_rate: int = TTS_SAMPLE_RATE, buffer_seconds: float = TTS_BUFFER_SECONDS,
+                 jitter_ms: int = TTS_JITTER_MS):
+        super().__init__()
+        self.sample_rate = sample_rate
+        self.samples_per_frame = sample_rate * TTS_FRAME_MS // 1000
+        self._ring = AudioRingBuffer(int(sample_rate * buffer_seconds), dtype=np.int16)
+        self._frame = np.zeros((1, self.samples_per_frame), dtype=np.int16)
+        self._time_base = fractions.Fraction(1, sample_rate)
+        self._prebuffer = sample_rate * jitter_ms // 1000
+        self._space = asyncio.Event()
+        self._playing = False
+        self._reply_complete = False
+        self._start: Optional[float] = None
+        self._timestamp = 0
+
+    @property
+    def buffered_seconds(self) -> float:
+        return len(self._ring) / self.sample_rate
+
+    async def write(self, pcm: np.ndarray):
+        """Queues mono int16 samples for playback, waiting while the buffer is full."""
+        self._reply_complete = False
+        offset = 0
+        while offset < len(pcm):
+            if self._ring.free == 0:
+                self._space.clear()
+                await self._space.wait()
+                continue
+            n = min(self._ring.free, len(pcm) - offset)
+            self._ring.write(pcm[offset:offset + n])
+            offset += n
+
+    def end_of_reply(self):
+        """Nothing more is coming for this reply: play out what is left, however short."""
+        self._reply_complete = True
+
+    def clear(self):
+        """Drops everything not yet played (barge-in)."""
+        self._ring.clear()
+        self._playing = False
+        self._reply_complete = False
+        self._space.set()
+
+    async def recv(self) -> AudioFrame:
+        if self.readyState != "live":
+            raise MediaStreamError
+
+        if self._start is None:
+            self._start = time.time()
+        else:
+            self._timestamp += self.samples_per_frame
+            wait = self._start + self._timestamp / self.sample_rate - time.time()
+            if wait > 0:
+                await asyncio.sleep(wait)
+
+        buffered = len(self._ring)
+        if not self._playing and buffered and (buffered >= self._prebuffer or self._reply_complete):
+            self._playing = True
+
+        out = self._frame[0]
+        if self._playing:
+            n = self._ring.read_into(out)
+            if n < self.samples_per_frame:
+                out[n:] = 0
+                self._playing = False
+                if not self._reply_complete:
+                    TTS_UNDERRUNS.inc()
+            self._space.set()
+        else:
+            out[:] = 0
+
+        frame = AudioFrame.from_ndarray(self._frame, format="s16", layout="mono")
+        frame.sample_rate = self.sample_rate
+        frame.pts = self._timestamp
+        frame.time_base = self._time_base
+        return frame
+
+
+class SpeechPipeline:
+    """
+    Speaks interviewer replies on an OutboundAudioTrack. `feed` takes reply text as it streams,
+    `finish` marks the end of a reply, and `cancel` drops everything queued or playing.
+    """
+
+    def __init__(self, interview_id: str, track: OutboundAudioTrack, tts: TTSBackend):
+        self.interview_id = interview_id
+        self.track = track
+        self.tts = tts
+        self._pending = ""
+        self._sentences: asyncio.Queue = asyncio.Queue()
+        self._synthesizing = False
+        self._worker: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self._worker is None:
+            self._worker = asyncio.create_task(self._run())
+
+    @property
+    def active(self) -> bool:
+        """True while anything of a reply is queued, being synthesized or still playing."""
+        return bool(self._pending.strip()) or not self._sentences.empty() or self._synthesizing or self.track.buffered_seconds > 0
+
+    def feed(self, text: str):
+        self._pending += text
+        parts = SENTENCE_END.split(self._pending)
+        # Everything but the last part is a finished sentence
+        for sentence in parts[:-1]:
+            if sentence.strip():
+                self._sentences.put_nowait((sentence.strip(), time.perf_counter()))
+        self._pending = parts[-1]
+
+    def finish(self):
+        if self._pending.strip():
+            self._sentences.put_nowait((self._pending.strip(), time.perf_counter()))
+        self._pending = ""
+        self._sentences.put_nowait((_END_OF_REPLY, None))
+
+    def say(self, text: str):
+        """Speaks a complete reply (e.g. the pre-generated opening)."""
+        self.feed(text + " ")
+        self.finish()
+
+    async def cancel(self) -> bool:
+        """Stops speaking immediately. Returns whether anything was being spoken."""
+        was_active = self.active
+        self._pending = ""
+        while not self._sentences.empty():
+            self._sentences.get_nowait()
+        if self._worker is not None:
+            self._worker.cancel()
+            await asyncio.gather(self._worker, return_exceptions=True)
+            self._worker = None
+        self._synthesizing = False
+        self.track.clear()
+        if self.track.readyState == "live":
+            self.start()
+        return was_active
+
+    async def _run(self):
+        while True:
+            sentence, queued_at = await self._sentences.get()
+            if sentence is _END_OF_REPLY:
+                self.track.end_of_reply()
+                continue
+
+            self._synthesizing = True
+            first = True
+            try:
+                async with aclosing(self.tts.synthesize(sentence)) as chunks:
+                    async for pcm in chunks:
+                        if first:
+                            TTS_FIRST_AUDIO_SECONDS.observe(time.perf_counter() - queued_at, backend=TTS_BACKEND)
+                            first = False
+                        await self.track.write(pcm)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"❌ [TTS] Synthesis failed for {self.interview_id}: {e}")
+            finally:
+                self._synthesizing = False
+
+    async def stop(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            await asyncio.gather(self._worker, return_exceptions=True)
+            self._worker = None
+        await self.tts.close()
+        self.track.stop()
@@ -0,0 +1,313 @@
+# app/services/audio_pipeline.py
+#
+# aiortc audio track -> ring buffer -> mono 16 kHz PCM16 -> streaming transcriber.
+#
+# Each stage is its own task and they only share preallocated NumPy buffers:
+#   ingest:    frame.to_ndarray() -> downmix -> float32 ring (source rate)
+#   process:   fixed-size chunks out of the ring -> resample -> int16 slot from a small pool
+#   transmit:  slot -> transcriber.send()
+# A VAD stage between process and transmit drops silence and emits speech_start / end_of_turn.
+# The process->transmit queue is bounded; when the transcriber falls behind, `process` waits
+# and the ring absorbs the slack, overwriting the oldest audio only once it is full.
+#
+# Because silence is gated out, the transcriber can go many seconds without audio; `transmit`
+# sends a keep-alive after TRANSCRIBER_KEEPALIVE_SECONDS of nothing. If the transcriber fails
+# anyway it is closed and reconnected with backoff; audio arriving meanwhile is dropped, but
+# the queue keeps draining so VAD events (turn-taking) are never held up.
+
+import os
+import time
+import asyncio
+import logging
+from typing import Awaitable, Callable, Optional
+
+import numpy as np
+from aiortc.mediastreams import MediaStreamError
+
+from app.services.transcription_service import Transcriber, TRANSCRIBER_SAMPLE_RATE
+from app.services.vad import VoiceActivityDetector, SPEECH_START, END_OF_TURN
+
+logger = logging.getLogger("audio_pipeline")
+
+AUDIO_CHUNK_MS = int(os.getenv("AUDIO_CHUNK_MS", "100"))
+AUDIO_RING_SECONDS = float(os.getenv("AUDIO_RING_SECONDS", "4"))
+AUDIO_QUEUE_CHUNKS = int(os.getenv("AUDIO_QUEUE_CHUNKS", "8"))
+AUDIO_VAD_ENABLED = os.getenv("AUDIO_VAD_ENABLED", "true").lower() == "true"
+TRANSCRIBER_KEEPALIVE_SECONDS = float(os.getenv("TRANSCRIBER_KEEPALIVE_SECONDS", "4"))
+TRANSCRIBER_RETRY_MAX_SECONDS = float(os.getenv("TRANSCRIBER_RETRY_MAX_SECONDS", "10"))
+
+# on_event(SPEECH_START | END_OF_TURN)
+AudioEventCallback = Callable[[str], Awaitable[None]]
+
+
+class AudioRingBuffer:
+    """
+    Fixed-capacity sample ring (float32 unless told otherwise). Writes never allocate;
+    when full, the oldest samples are overwritten.
+    """
+
+    def __init__(self, capacity: int, dtype=np.float32):
+        self.capacity = capacity
+        self._buf = np.zeros(capacity, dtype=dtype)
+        self._read = 0
+        self._size = 0
+        self.dropped = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def free(self) -> int:
+        return self.capacity - self._size
+
+    def clear(self):
+        self._read = 0
+        self._size = 0
+
+    def write(self, samples: np.ndarray):
+        n = len(samples)
+        if n > self.capacity:
+            self.dropped += n - self.capacity
+            samples = samples[-self.capacity:]
+            n = self.capacity
+
+        overflow = self._size + n - self.capacity
+        if overflow > 0:
+            self._read = (self._read + overflow) % self.capacity
+            self._size -= overflow
+            self.dropped += overflow
+
+        start = (self._read + self._size) % self.capacity
+        first = min(n, self.capacity - start)
+        self._buf[start:start + first] = samples[:first]
+        self._buf[:n - first] = samples[first:]
+        self._size += n
+
+    def read_into(self, out: np.ndarray) -> int:
+        """Copies up to len(out) of the oldest samples into `out`; returns how many were copied."""
+        n = min(len(out), self._size)
+        first = min(n, self.capacity - self._read)
+        out[:first] = self._buf[self._read:self._read + first]
+        out[first:n] = self._buf[:n - first]
+        self._read = (self._read + n) % self.capacity
+        self._size -= n
+        return n
+
+
+def downmix(frame_samples: np.ndarray, channels: int, out: np.ndarray) -> np.ndarray:
+    """Interleaved int16 -> mono float32 in [-1, 1), written into `out`."""
+    n = len(frame_samples) // channels
+    mono = out[:n]
+    if channels == 1:
+        np.multiply(frame_samples, 1 / 32768, out=mono, casting="unsafe")
+    else:
+        np.mean(frame_samples.reshape(n, channels), axis=1, out=mono)
+        mono *= 1 / 32768
+    return mono
+
+
+def resample_to_pcm16(mono: np.ndarray, source_rate: int, out: np.ndarray) -> np.ndarray:
+    """
+    Mono float32 at `source_rate` -> int16 at TRANSCRIBER_SAMPLE_RATE, written into `out`.
+    Integer ratios (48k/32k -> 16k) use a box filter + decimation; anything else falls back to linear interpolation.
+    """
+    if source_rate % TRANSCRIBER_SAMPLE_RATE == 0:
+        factor = source_rate // TRANSCRIBER_SAMPLE_RATE
+        resampled = mono.reshape(-1, factor).mean(axis=1) if factor > 1 else mono
+    else:
+        target_len = int(len(mono) * TRANSCRIBER_SAMPLE_RATE / source_rate)
+        positions = np.arange(target_len) * (source_rate / TRANSCRIBER_SAMPLE_RATE)
+        resampled = np.interp(positions, np.arange(len(mono)), mono)
+
+    pcm = out[:len(resampled)]
+    np.multiply(np.clip(resampled, -1.0, 32767 / 32768), 32768, out=pcm, casting="unsafe")
+    return pcm
+
+
+class AudioPipeline:
+    """
+    Consumes one remote audio track for one interview and streams it to a Transcriber.
+    """
+
+    def __init__(self, interview_id: str, transcriber: Transcriber, on_event: Optional[AudioEventCallback] = None):
+        self.interview_id = interview_id
+        self.transcriber = transcriber
+        self.on_event = on_event
+        self.vad = VoiceActivityDetector(TRANSCRIBER_SAMPLE_RATE) if AUDIO_VAD_ENABLED else None
+        self.source_rate: Optional[int] = None
+        self.channels: Optional[int] = None
+        self._ring: Optional[AudioRingBuffer] = None
+        self._frame_scratch: Optional[np.ndarray] = None
+        self._chunk: Optional[np.ndarray] = None
+        self._pcm_pool: Optional[np.ndarray] = None
+        self._pool_index = 0
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=AUDIO_QUEUE_CHUNKS)
+        self._available = asyncio.Event()
+        self._ended = False
+        # monotonic time of the last frame received; the session's idle check reads it
+        self.last_frame_at: Optional[float] = None
+        self._tasks = []
+        self._connected = False
+        self._failures = 0
+        self._retry_at = 0.0
+
+    def _allocate(self, sample_rate: int, channels: int, frame_samples: int):
+        """Sizes every buffer once, from the first frame's format."""
+        self.source_rate = sample_rate
+        self.channels = channels
+        chunk_samples = sample_rate * AUDIO_CHUNK_MS // 1000
+        # Keep chunks an exact multiple of the decimation factor
+        factor = max(1, sample_rate // TRANSCRIBER_SAMPLE_RATE)
+        chunk_samples -= chunk_samples % factor
+
+        self._ring = AudioRingBuffer(int(sample_rate * AUDIO_RING_SECONDS))
+        self._frame_scratch = np.zeros(frame_samples, dtype=np.float32)
+        self._chunk = np.zeros(chunk_samples, dtype=np.float32)
+        pcm_samples = chunk_samples * TRANSCRIBER_SAMPLE_RATE // sample_rate + 1
+        # queue size + one being resampled + one being transmitted
+        self._pcm_pool = np.zeros((AUDIO_QUEUE_CHUNKS + 2, pcm_samples), dtype=np.int16)
+
+    def start(self, track):
+        self._tasks = [
+            asyncio.create_task(self._ingest(track)),
+            asyncio.create_task(self._process()),
+            asyncio.create_task(self._transmit()),
+        ]
+        logger.info(f"🎧 Audio pipeline started for {self.interview_id}")
+
+    async def _ingest(self, track):
+        try:
+            while True:
+                frame = await track.recv()
+                self.last_frame_at = time.monotonic()
+                samples = frame.to_ndarray()
+                if frame.format.is_planar:
+                    # (channels, n) -> interleaved
+                    samples = samples.T
+                samples = samples.reshape(-1)
+                channels = len(frame.layout.channels)
+
+                if self._ring is None:
+                    self._allocate(frame.sample_rate, channels, len(samples) // channels)
+                elif len(samples) // channels > len(self._frame_scratch):
+                    self._frame_scratch = np.zeros(len(samples) // channels, dtype=np.float32)
+
+                self._ring.write(downmix(samples, channels, self._frame_scratch))
+                self._available.set()
+        except MediaStreamError:
+            logger.info(f"🔇 Audio track ended for {self.interview_id}")
+        finally:
+            self._ended = True
+            self._available.set()
+
+    async def _process(self):
+        while True:
+            await self._available.wait()
+            self._available.clear()
+
+            while self._ring is not None and (len(self._ring) >= len(self._chunk) or (self._ended and len(self._ring))):
+                n = self._ring.read_into(self._chunk)
+                n -= n % max(1, self.source_rate // TRANSCRIBER_SAMPLE_RATE)
+                if n == 0:
+                    break
+
+                slot = self._pcm_pool[self._pool_index]
+                self._pool_index = (self._pool_index + 1) % len(self._pcm_pool)
+                pcm = resample_to_pcm16(self._chunk[:n], self.source_rate, slot)
+
+                if self.vad is None:
+                    forward, events = True, []
+                else:
+                    forward, events = self.vad.process(pcm)
+
+                # Blocks when the transcriber is behind (backpressure onto the ring)
+                if SPEECH_START in events:
+                    await self._queue.put(SPEECH_START)
+                    # The word onset the VAD only recognised afterwards
+                    pre_roll = self.vad.take_pre_roll()
+                    if len(pre_roll):
+                        await self._queue.put(pre_roll)
+                if forward:
+                    await self._queue.put(pcm)
+                if END_OF_TURN in events:
+                    await self._queue.put(END_OF_TURN)
+
+            if self._ended:
+                await self._queue.put(None)
+                return
+
+    async def _transmit(self):
+        await self._connect()
+        while True:
+            try:
+                pcm = await asyncio.wait_for(self._queue.get(), timeout=TRANSCRIBER_KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                # Candidate silent or interviewer talking: keep the stream open
+                await self._to_transcriber(self.transcriber.keep_alive)
+                continue
+            if pcm is None:
+                break
+            if isinstance(pcm, str):
+                await self._handle_event(pcm)
+                continue
+            await self._to_transcriber(self.transcriber.send, pcm)
+
+    async def _connect(self) -> bool:
+        if self._connected:
+            return True
+        if time.monotonic() < self._retry_at:
+            return False
+        try:
+            await self.transcriber.start()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            await self._transcriber_failed(e)
+            return False
+        if self._failures:
+            logger.info(f"🔁 Transcriber reconnected for {self.interview_id}")
+        self._connected = True
+        self._failures = 0
+        return True
+
+    async def _to_transcriber(self, method, *args):
+        """Calls into the transcriber, reconnecting first if it failed earlier. Never raises."""
+        if not await self._connect():
+            return
+        try:
+            await method(*args)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            await self._transcriber_failed(e)
+
+    async def _transcriber_failed(self, error: Exception):
+        self._connected = False
+        self._failures += 1
+        self._retry_at = time.monotonic() + min(TRANSCRIBER_RETRY_MAX_SECONDS, 0.5 * 2 ** self._failures)
+        logger.error(f"❌ Transcriber failed for {self.interview_id} (attempt {self._failures}): {error}")
+        try:
+            await self.transcriber.close()
+        except Exception as e:
+            logger.warning(f"⚠️ Transcriber close failed for {self.interview_id}: {e}")
+
+    async def _handle_event(self, event: str):
+        if event == END_OF_TURN:
+            await self._to_transcriber(self.transcriber.flush)
+        if self.on_event:
+            try:
+                await self.on_event(event)
+            except Exception as e:
+                logger.error(f"❌ Audio event handler failed for {self.interview_id}: {e}")
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        try:
+            await self.transcriber.close()
+        except Exception as e:
+            logger.warning(f"⚠️ Transcriber close failed for {self.interview_id}: {e}")
+        if self._ring is not None and self._ring.dropped:
+            logger.warning(f"⚠️ {self.interview_id}: dropped {self._ring.dropped} samples (transcriber too slow)")
@@ -0,0 +1,211 @@
+# app/services/bulk_ingest_service.py
+
+import os
+import json
+import uuid
+import time
+import asyncio
+import logging
+from typing import AsyncIterator, List, Optional, Set, Tuple
+
+from app.services.resume_service import parse_resume_path, save_resumes_to_db
+from app.services.rate_limiter import PRIORITY_BACKGROUND
+from app.utils.cache import TTLCache
+from app.utils.file_utils import remove_file
+
+logger = logging.getLogger("bulk_ingest")
+
+BULK_MAX_FILES = int(os.getenv("BULK_MAX_FILES", "500"))
+# Compressed size of one uploaded zip (members are still capped at RESUME_MAX_UPLOAD_BYTES each)
+BULK_MAX_ZIP_BYTES = int(os.getenv("BULK_MAX_ZIP_BYTES", str(200 * 1024 * 1024)))
+BULK_LLM_CONCURRENCY = int(os.getenv("BULK_LLM_CONCURRENCY", "8"))
+BULK_INSERT_BATCH_SIZE = int(os.getenv("BULK_INSERT_BATCH_SIZE", "25"))
+BULK_INSERT_MAX_WAIT = float(os.getenv("BULK_INSERT_MAX_WAIT", "1.0"))
+BULK_JOB_TTL = float(os.getenv("BULK_JOB_TTL", "3600"))
+
+# (filename, spooled_path, sha256_hexdigest)
+BulkItem = Tuple[str, str, str]
+
+
+class BulkIngestJob:
+    """
+    One bulk upload. Results are appended in completion order and kept until the job expires,
+    so a client that disconnects can re-attach with the job id and an offset.
+    """
+
+    def __init__(self, user_id: str, items: List[BulkItem]):
+        self.job_id = uuid.uuid4().hex
+        self.user_id = user_id
+        self.items = items
+        self.total = len(items)
+        self.results: List[dict] = []
+        self.done = False
+        self.started_at = time.time()
+        self._changed = asyncio.Condition()
+        self._task: Optional[asyncio.Task] = None
+
+    def summary(self) -> dict:
+        succeeded = sum(1 for r in self.results if r["status"] == "success")
+        return {
+            "type": "done" if self.done else "progress",
+            "job_id": self.job_id,
+            "total": self.total,
+            "completed": len(self.results),
+            "succeeded": succeeded,
+            "failed": len(self.results) - succeeded,
+            "elapsed_sec": round(time.time() - self.started_at, 2),
+        }
+
+    async def _publish(self, results: List[dict]):
+        async with self._changed:
+            self.results.extend(results)
+            self._changed.notify_all()
+
+    async def _finish(self):
+        async with self._changed:
+            self.done = True
+            self._changed.notify_all()
+
+    async def stream(self, offset: int = 0) -> AsyncIterator[str]:
+        """
+        NDJSON lines: a 'job' header, one 'item' per result from `offset`, then the 'done' summary.
+        """
+        yield json.dumps({"type": "job", "job_id": self.job_id, "total": self.total, "offset": offset}) + "\n"
+
+        position = max(0, offset)
+        while True:
+            async with self._changed:
+                await self._changed.wait_for(lambda: self.done or len(self.results) > position)
+                batch = self.results[position:]
+                finished = self.done
+
+            for result in batch:
+                yield json.dumps({"type": "item", "offset": position, **result}) + "\n"
+                position += 1
+
+            if finished and position >= len(self.results):
+                break
+
+        yield json.dumps(self.summary()) + "\n"
+
+
+class BulkIngestService:
+    """
+    Pipeline: PDF extraction (process pool, parallel) -> Groq parsing (BULK_LLM_CONCURRENCY at a time)
+    -> batched multi-row inserts into resume_data. Every stage overlaps with the others.
+    """
+
+    def __init__(self):
+        self._jobs = TTLCache(maxsize=1024, ttl=BULK_JOB_TTL)
+        self._running: Set[asyncio.Task] = set()
+
+    def get_job(self, job_id: str) -> Optional[BulkIngestJob]:
+        return self._jobs.get(job_id)
+
+    def start_job(self, user_id: str, items: List[BulkItem]) -> BulkIngestJob:
+        job = BulkIngestJob(user_id, items)
+        self._jobs.set(job.job_id, job)
+        # Runs independently of the HTTP response, so a dropped client does not stop the job
+        job._task = asyncio.create_task(self._run(job))
+        self._running.add(job._task)
+        job._task.add_done_callback(self._running.discard)
+        logger.info(f"📦 Bulk job {job.job_id} started: {job.total} resumes for user {user_id}")
+        return job
+
+    async def _run(self, job: BulkIngestJob):
+        llm_slots = asyncio.Semaphore(BULK_LLM_CONCURRENCY)
+        parsed_queue: asyncio.Queue = asyncio.Queue()
+
+        async def parse_one(index: int, filename: str, path: str, digest: str):
+            try:
+                parsed = await parse_resume_path(path, digest, llm_slots, PRIORITY_BACKGROUND, job.user_id)
+            except Exception as e:
+                parsed = {"error": str(e)}
+            finally:
+                remove_file(path)
+            await parsed_queue.put((index, filename, parsed))
+
+        writer = asyncio.create_task(self._write_batches(job, parsed_queue))
+        try:
+            await asyncio.gather(*[
+                parse_one(index, filename, path, digest)
+                for index, (filename, path, digest) in enumerate(job.items)
+            ])
+        except asyncio.CancelledError:
+            # Items whose parse never got to run still have their spooled file
+            for _, path, _ in job.items:
+                remove_file(path)
+            raise
+        finally:
+            await parsed_queue.put(None)
+            await writer
+            await job._finish()
+            logger.info(f"✅ Bulk job {job.job_id} finished: {job.summary()}")
+
+    async def shutdown(self):
+        """Cancels running jobs (their clients see a partial 'done' summary) and waits for them."""
+        if not self._running:
+            return
+        logger.info(f"🛑 Cancelling {len(self._running)} running bulk job(s)")
+        tasks = list(self._running)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _write_batches(self, job: BulkIngestJob, parsed_queue: asyncio.Queue):
+        """
+        Drains parsed results, inserting successes in batches of up to BULK_INSERT_BATCH_SIZE
+        (or whatever arrived within BULK_INSERT_MAX_WAIT seconds).
+        """
+        finished = False
+        while not finished:
+            batch = []
+            first = await parsed_queue.get()
+            if first is None:
+                break
+            batch.append(first)
+
+            deadline = asyncio.get_running_loop().time() + BULK_INSERT_MAX_WAIT
+            while len(batch) < BULK_INSERT_BATCH_SIZE:
+                remaining = deadline - asyncio.get_running_loop().time()
+                if remaining <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(parsed_queue.get(), timeout=remaining)
+                except asyncio.TimeoutError:
+                    break
+                if item is None:
+                    finished = True
+                    break
+                batch.append(item)
+
+            await job._publish(await self._save_batch(job.user_id, batch))
+
+    @staticmethod
+    async def _save_batch(user_id: str, batch: list) -> List[dict]:
+        results = []
+        to_save = []
+        for index, filename, parsed in batch:
+            if "error" in parsed:
+                results.append({"index": index, "filename": filename, "status": "error", "error": parsed["error"]})
+            else:
+                to_save.append((index, filename, parsed))
+
+        saved = await save_resumes_to_db([parsed for _, _, parsed in to_save], user_id)
+
+        for position, (index, filename, parsed) in enumerate(to_save):
+            if isinstance(saved, dict) and "error" in saved:
+                results.append({"index": index, "filename": filename, "status": "error", "error": saved["error"]})
+                continue
+            results.append({
+                "index": index,
+                "filename": filename,
+                "status": "success",
+                "resume_id": saved[position].get("id"),
+                "name": parsed.get("name"),
+                "email": parsed.get("email"),
+            })
+        return results
+
+
+bulk_ingest_service = BulkIngestService()
@@ -0,0 +1,148 @@
+# app/services/conversation_memory.py
+#
+# Per-interview conversation memory with a constant-size footprint in the prompt:
+# the most recent turns are kept verbatim under a token budget, and anything older
+# is folded into a rolling summary by a background LLM call (never on the reply path).
+
+import os
+import asyncio
+import logging
+from collections import deque
+from typing import Deque, List, Optional
+
+from app.services.llm_gateway import llm_gateway
+from app.services.rate_limiter import PRIORITY_NORMAL
+from app.utils.cache import TTLCache
+from app.utils.tokens import count_tokens
+
+logger = logging.getLogger("conversation_memory")
+
+# Verbatim turns sent with every request
+MEMORY_TOKEN_BUDGET = int(os.getenv("MEMORY_TOKEN_BUDGET", "1500"))
+# Upper bound for the rolling summary of everything older
+MEMORY_SUMMARY_MAX_TOKENS = int(os.getenv("MEMORY_SUMMARY_MAX_TOKENS", "300"))
+# Summaries don't need the big model
+MEMORY_SUMMARY_MODEL = os.getenv("MEMORY_SUMMARY_MODEL", "llama-3.1-8b-instant")
+# Conversations nobody touched for this long are dropped
+MEMORY_TTL = float(os.getenv("MEMORY_TTL", "7200"))
+MEMORY_MAX_INTERVIEWS = int(os.getenv("MEMORY_MAX_INTERVIEWS", "1024"))
+
+SUMMARY_SYSTEM_PROMPT = (
+    "You maintain running notes for a job interview. Merge the new exchanges into the "
+    "existing notes. Keep: questions already asked, the candidate's claims, strengths and "
+    "weak spots, and topics still open. Be terse, use plain sentences, no preamble."
+)
+
+
+class ConversationMemory:
+    """
+    One interview's history. `messages()` is what goes into the next request;
+    `summary` is what goes into the system prompt.
+    """
+
+    def __init__(self, interview_id: str, token_budget: int = MEMORY_TOKEN_BUDGET):
+        self.interview_id = interview_id
+        self.token_budget = token_budget
+        self.summary = ""
+        self._recent: Deque[dict] = deque()
+        self._recent_tokens = 0
+        # Evicted from the verbatim window, not yet merged into the summary
+        self._pending: List[dict] = []
+        self._summarizer: Optional[asyncio.Task] = None
+
+    def add(self, role: str, content: str):
+        content = (content or "").strip()
+        if not content:
+            return
+
+        tokens = count_tokens(content)
+        self._recent.append({"role": role, "content": content, "tokens": tokens})
+        self._recent_tokens += tokens
+
+        # Always keep the last exchange verbatim, even if it alone is over budget
+        while self._recent_tokens > self.token_budget and len(self._recent) > 2:
+            turn = self._recent.popleft()
+            self._recent_tokens -= turn["tokens"]
+            self._pending.append(turn)
+
+        if self._pending:
+            self._schedule_summary()
+
+    def messages(self) -> List[dict]:
+        """
+        Chat messages for the next request. Turns waiting to be summarized are still
+        included so nothing drops out of context while the summarizer catches up.
+        """
+        return [{"role": t["role"], "content": t["content"]} for t in (*self._pending, *self._recent)]
+
+    # ----------------------------------------------------------------------------------
+    #  BACKGROUND SUMMARIZATION
+    # ----------------------------------------------------------------------------------
+    def _schedule_summary(self):
+        if self._summarizer is not None and not self._summarizer.done():
+            return
+        try:
+            self._summarizer = asyncio.get_running_loop().create_task(self._summarize())
+        except RuntimeError:
+            # No loop (e.g. a sync caller); the next add() from async code picks it up
+            self._summarizer = None
+
+    async def _summarize(self):
+        while self._pending:
+            batch = list(self._pending)
+            transcript = "\n".join(f"{t['role'].upper()}: {t['content']}" for t in batch)
+            try:
+                completion = await llm_gateway.chat(
+                    messages=[
+                        {"role": "system", "content": SUMMARY_SYSTEM_PROMPT},
+                        {"role": "user", "content": f"EXISTING NOTES:\n{self.summary or '(none)'}\n\nNEW EXCHANGES:\n{transcript}"},
+                    ],
+                    model=MEMORY_SUMMARY_MODEL,
+                    temperature=0.2,
+                    max_tokens=MEMORY_SUMMARY_MAX_TOKENS,
+                    priority=PRIORITY_NORMAL,
+                )
+                summary = completion["choices"][0]["message"]["content"].strip()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"⚠️ Summary update failed for {self.interview_id}: {e}")
+                self._trim_pending()
+                return
+
+            self.summary = summary
+            del self._pending[:len(batch)]
+            logger.info(f"📝 Folded {len(batch)} turns into the summary for {self.interview_id}")
+
+    def _trim_pending(self):
+        """If the summarizer keeps failing, don't let unsummarized turns grow without bound."""
+        pending_tokens = sum(t["tokens"] for t in self._pending)
+        while self._pending and pending_tokens > self.token_budget:
+            pending_tokens -= self._pending.pop(0)["tokens"]
+
+    async def close(self):
+        if self._summarizer is not None and not self._summarizer.done():
+            self._summarizer.cancel()
+            await asyncio.gather(self._summarizer, return_exceptions=True)
+
+
+class ConversationStore:
+
+    def __init__(self):
+        self._memories = TTLCache(maxsize=MEMORY_MAX_INTERVIEWS, ttl=MEMORY_TTL)
+
+    def get(self, interview_id: str) -> ConversationMemory:
+        """Returns the interview's memory, creating it on first use (and refreshing its TTL)."""
+        memory = self._memories.get(interview_id)
+        if memory is None:
+            memory = ConversationMemory(interview_id)
+        self._memories.set(interview_id, memory)
+        return memory
+
+    async def drop(self, interview_id: str):
+        memory = self._memories.pop(interview_id)
+        if memory is not None:
+            await memory.close()
+
+
+conversation_store = ConversationStore()
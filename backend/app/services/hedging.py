@@ -0,0 +1,204 @@
+# app/services/hedging.py
+#
+# Tail-latency control for LLM calls. If the primary model has not produced its first
+# token by an adaptive deadline (its recent p95), a second request goes to a faster
+# fallback model; whichever answers first wins and the other one is cancelled.
+# A primary that fails outright fails over to the fallback immediately.
+
+import os
+import time
+import asyncio
+import logging
+from collections import deque
+from typing import AsyncIterator, Awaitable, Callable, Deque, Dict, List, Optional
+
+logger = logging.getLogger("hedging")
+
+# Used until a model has HEDGE_MIN_SAMPLES observations
+HEDGE_DEADLINE = float(os.getenv("HEDGE_DEADLINE", "1.0"))
+HEDGE_MIN_DEADLINE = float(os.getenv("HEDGE_MIN_DEADLINE", "0.3"))
+HEDGE_MAX_DEADLINE = float(os.getenv("HEDGE_MAX_DEADLINE", "3.0"))
+# Hedge after the p95: roughly 5% extra requests for a much shorter tail
+HEDGE_PERCENTILE = float(os.getenv("HEDGE_PERCENTILE", "0.95"))
+HEDGE_MIN_SAMPLES = int(os.getenv("HEDGE_MIN_SAMPLES", "20"))
+HEDGE_WINDOW = int(os.getenv("HEDGE_WINDOW", "200"))
+
+
+class LatencyTracker:
+    """
+    Rolling window of latencies per model, used to derive each model's hedge deadline.
+    """
+
+    def __init__(self, window: int = HEDGE_WINDOW):
+        self.window = window
+        self._samples: Dict[str, Deque[float]] = {}
+
+    def record(self, model: str, seconds: float):
+        self._samples.setdefault(model, deque(maxlen=self.window)).append(seconds)
+
+    def percentile(self, model: str, q: float) -> Optional[float]:
+        samples = self._samples.get(model)
+        if not samples:
+            return None
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def deadline(self, model: str) -> float:
+        samples = self._samples.get(model)
+        if not samples or len(samples) < HEDGE_MIN_SAMPLES:
+            return HEDGE_DEADLINE
+        p = self.percentile(model, HEDGE_PERCENTILE)
+        return min(HEDGE_MAX_DEADLINE, max(HEDGE_MIN_DEADLINE, p))
+
+    def snapshot(self) -> Dict[str, dict]:
+        return {
+            model: {
+                "samples": len(samples),
+                "p50": self.percentile(model, 0.5),
+                "p95": self.percentile(model, 0.95),
+                "deadline": self.deadline(model),
+            }
+            for model, samples in self._samples.items()
+        }
+
+
+# Time to first token (streaming) and time to full response (non-streaming) behave differently
+ttft_tracker = LatencyTracker()
+response_tracker = LatencyTracker()
+
+
+class _StreamAttempt:
+    def __init__(self, model: str, stream: AsyncIterator[str]):
+        self.model = model
+        self.stream = stream
+        self.started = time.monotonic()
+        self.first = asyncio.ensure_future(stream.__anext__())
+
+    async def close(self):
+        if not self.first.done():
+            self.first.cancel()
+        await asyncio.gather(self.first, return_exceptions=True)
+        try:
+            await self.stream.aclose()
+        except Exception:
+            pass
+
+
+async def hedged_stream(
+    model: str,
+    open_stream: Callable[[str], AsyncIterator[str]],
+    fallback_model: Optional[str] = None,
+    hedge: bool = True,
+    tracker: LatencyTracker = ttft_tracker,
+) -> AsyncIterator[str]:
+    """
+    Yields the deltas of whichever stream produces a first token first.
+    `open_stream(model)` must return a fresh stream for the given model.
+    """
+    primary = _StreamAttempt(model, open_stream(model))
+    attempts: List[_StreamAttempt] = [primary]
+    deadline = tracker.deadline(model) if hedge and fallback_model else None
+    last_error: Optional[BaseException] = None
+
+    def start_fallback(why: str):
+        if fallback_model and len(attempts) == 1:
+            logger.info(f"🏎️ Hedging {model} -> {fallback_model} ({why})")
+            attempts.append(_StreamAttempt(fallback_model, open_stream(fallback_model)))
+
+    try:
+        winner, first = None, None
+        while winner is None:
+            waiting = {a.first: a for a in attempts if not a.first.done()}
+            if not waiting:
+                raise last_error
+
+            timeout = None
+            if deadline is not None and len(attempts) == 1:
+                timeout = max(0.0, primary.started + deadline - time.monotonic())
+
+            done, _ = await asyncio.wait(waiting, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                start_fallback(f"no first token after {deadline:.2f}s")
+                continue
+
+            for future in done:
+                attempt = waiting[future]
+                error = future.exception()
+                if error is None or isinstance(error, StopAsyncIteration):
+                    winner, first = attempt, (None if error else future.result())
+                    break
+                last_error = error
+                logger.warning(f"⚠️ {attempt.model} failed before its first token: {error!r}")
+                start_fallback("primary failed")
+
+        now = time.monotonic()
+        tracker.record(winner.model, now - winner.started)
+        for attempt in attempts:
+            if attempt is not winner:
+                # The loser was at least this slow; keeps its deadline honest
+                if not attempt.first.done():
+                    tracker.record(attempt.model, now - attempt.started)
+                await attempt.close()
+
+        if first is None:
+            return
+        yield first
+        async for delta in winner.stream:
+            yield delta
+
+    finally:
+        for attempt in attempts:
+            await attempt.close()
+
+
+async def hedged_call(
+    model: str,
+    call: Callable[[str], Awaitable[dict]],
+    fallback_model: Optional[str] = None,
+    hedge: bool = True,
+    tracker: LatencyTracker = response_tracker,
+) -> dict:
+    """
+    Non-streaming version of hedged_stream: `call(model)` returns the full completion.
+    """
+    tasks: Dict[asyncio.Future, tuple] = {asyncio.ensure_future(call(model)): (model, time.monotonic())}
+    deadline = tracker.deadline(model) if hedge and fallback_model else None
+    last_error: Optional[BaseException] = None
+
+    def start_fallback(why: str):
+        if fallback_model and len(tasks) == 1:
+            logger.info(f"🏎️ Hedging {model} -> {fallback_model} ({why})")
+            tasks[asyncio.ensure_future(call(fallback_model))] = (fallback_model, time.monotonic())
+
+    try:
+        while True:
+            waiting = [t for t in tasks if not t.done()]
+            if not waiting:
+                raise last_error
+
+            timeout = None
+            if deadline is not None and len(tasks) == 1:
+                _, started = tasks[waiting[0]]
+                timeout = max(0.0, started + deadline - time.monotonic())
+
+            done, _ = await asyncio.wait(waiting, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                start_fallback(f"no response after {deadline:.2f}s")
+                continue
+
+            for task in done:
+                error = task.exception()
+                if error is None:
+                    now = time.monotonic()
+                    for other, (other_model, other_started) in tasks.items():
+                        if other is task or not other.done():
+                            tracker.record(other_model, now - other_started)
+                    return task.result()
+                last_error = error
+                logger.warning(f"⚠️ {tasks[task][0]} failed: {error!r}")
+                start_fallback("primary failed")
+
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
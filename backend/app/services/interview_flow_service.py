@@ -1,45 +1,86 @@
+import os
 import logging
-from app.db.database import supabase
+from app.db import crud
+from app.db.models import INTERVIEWS_TABLE, INTERVIEW_COLUMNS, RESUME_DATA_TABLE, RESUME_PROFILE_COLUMNS
+from app.utils.cache import TTLCache
 
 logger = logging.getLogger("interview_flow")
 
+CONTEXT_CACHE_TTL = float(os.getenv("CONTEXT_CACHE_TTL", "300"))
+CONTEXT_CACHE_SIZE = int(os.getenv("CONTEXT_CACHE_SIZE", "512"))
+
 class InterviewFlowService:
-    
-    @staticmethod
-    def fetch_interview_context(interview_id: str):
+
+    def __init__(self):
+        self._context_cache = TTLCache(maxsize=CONTEXT_CACHE_SIZE, ttl=CONTEXT_CACHE_TTL)
+        self._prompt_cache = TTLCache(maxsize=CONTEXT_CACHE_SIZE, ttl=CONTEXT_CACHE_TTL)
+
+    async def fetch_interview_context(self, interview_id: str, use_cache: bool = True):
         """
         Fetches interview details AND the linked resume data from Supabase.
+        Uses a single embedded (joined) query and caches the result per interview_id.
         """
+        if use_cache:
+            cached = self._context_cache.get(interview_id)
+            if cached is not None:
+                return cached
+
         try:
-            # 1. Get Interview Data
-            interview_res = supabase.table("interviews").select("*").eq("id", interview_id).execute()
+            # Interview + linked resume in one round-trip (resume_id -> resume_data.id)
+            interview_data = await crud.select_one(
+                INTERVIEWS_TABLE,
+                f"{INTERVIEW_COLUMNS}, {RESUME_DATA_TABLE}({RESUME_PROFILE_COLUMNS})",
+                {"id": interview_id},
+            )
             
-            if not interview_res.data:
+            if not interview_data:
                 logger.error(f"Interview {interview_id} not found.")
                 return None
             
-            interview_data = interview_res.data[0]
-            resume_id = interview_data.get("resume_id")
-
-            # 2. Get Resume Data (if linked)
-            resume_data = {}
-            if resume_id:
-                # Note: resume_id is a BigInt, so we query directly
-                resume_res = supabase.table("resume_data").select("*").eq("id", resume_id).execute()
-                if resume_res.data:
-                    resume_data = resume_res.data[0]
+            resume_data = interview_data.pop(RESUME_DATA_TABLE, None) or {}
 
             logger.info(f"✅ Context loaded for Interview: {interview_id}")
             
-            return {
+            context = {
                 "interview": interview_data,
                 "resume": resume_data
             }
+            self._context_cache.set(interview_id, context)
+            return context
 
         except Exception as e:
             logger.error(f"Failed to fetch context: {e}")
             return None
 
+    async def get_system_prompt(self, interview_id: str, context: dict = None, summary: str = ""):
+        """
+        Returns the compiled system prompt for an interview, building it at most once per TTL.
+        The conversation summary changes every few turns, so it is appended to the cached base.
+        """
+        system_prompt = self._prompt_cache.get(interview_id)
+        if system_prompt is None:
+            context = context or await self.fetch_interview_context(interview_id)
+            if not context:
+                return None
+
+            system_prompt = self.generate_system_prompt(context)
+            self._prompt_cache.set(interview_id, system_prompt)
+
+        if summary:
+            system_prompt = f"{system_prompt}\n\n{self.summary_section(summary)}"
+        return system_prompt
+
+    def invalidate(self, interview_id: str):
+        """
+        Drops cached context/prompt. Call after anything that changes the interview row.
+        """
+        self._context_cache.pop(interview_id)
+        self._prompt_cache.pop(interview_id)
+
+    @staticmethod
+    def summary_section(summary: str) -> str:
+        return f"CONVERSATION SO FAR (older turns, summarized):\n{summary.strip()}"
+
     @staticmethod
     def generate_system_prompt(context: dict):
         """
@@ -84,4 +125,4 @@ class InterviewFlowService:
         return system_prompt.strip()
 
 # Singleton Instance
-flow_service = InterviewFlowService()
\ No newline at end of file
+flow_service = InterviewFlowService()
@@ -1,5 +1,10 @@
-from app.db.database import supabase
+from app.db import crud
+from app.db.crud import write_behind
+from app.db.models import INTERVIEWS_TABLE
 from app.models.interview import InterviewCreateRequest
+from app.services.interview_flow_service import flow_service
+from app.services.conversation_memory import conversation_store
+from app.services.warmup_service import warmup_service
 
 class InterviewService:
     
@@ -20,23 +25,45 @@ class InterviewService:
             }
 
             # Insert into Supabase
-            response = supabase.table("interviews").insert(interview_data).execute()
+            rows = await crud.insert(INTERVIEWS_TABLE, interview_data)
 
             # Check for success
-            if not response.data:
+            if not rows:
                 raise Exception("Failed to insert interview record into Supabase")
 
-            new_interview_id = response.data[0]['id']
+            new_interview_id = rows[0]['id']
+            flow_service.invalidate(str(new_interview_id))
 
-            # --- FUTURE AI HOOK ---
-            # This is where you will trigger the AI to read the resume data
-            # if data.resume_id:
-            #     resume_data = supabase.table("resume_data").select("*").eq("id", data.resume_id).execute()
-            #     AIService.generate_first_question(resume_data, data.job_description)
-            # ----------------------
+            # Warm up in the background: context + prompt + opening question,
+            # ready by the time the candidate's websocket connects
+            warmup_service.schedule(str(new_interview_id))
 
             return new_interview_id
 
         except Exception as e:
             print(f"[InterviewService] Error: {str(e)}")
-            raise e
\ No newline at end of file
+            raise e
+
+    @staticmethod
+    async def update_session(interview_id: str, updates: dict, background: bool = False):
+        """
+        Updates an interview row and drops any cached context/prompt for it.
+        With background=True the write goes through the write-behind queue (no round-trip).
+        The cache is dropped after the write lands, so a concurrent fetch can't re-cache the old row.
+        """
+        try:
+            if updates.get("status", "active") != "active":
+                warmup_service.cancel(interview_id)
+                await conversation_store.drop(interview_id)
+            if background:
+                write_behind.enqueue_update(INTERVIEWS_TABLE, {"id": interview_id}, updates,
+                                            on_flushed=lambda: flow_service.invalidate(interview_id))
+                return None
+
+            rows = await crud.update(INTERVIEWS_TABLE, updates, {"id": interview_id})
+            flow_service.invalidate(interview_id)
+            return rows[0] if rows else None
+
+        except Exception as e:
+            print(f"[InterviewService] Error: {str(e)}")
+            raise e
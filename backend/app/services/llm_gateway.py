@@ -0,0 +1,218 @@
+# app/services/llm_gateway.py
+
+import os
+import json
+import time
+import random
+import asyncio
+import logging
+from typing import AsyncIterator, List, Optional
+
+import httpx
+
+from app.services.rate_limiter import rate_limiter, estimate_tokens, PRIORITY_NORMAL
+from app.utils.logging import get_trace_id, TRACE_HEADER
+from app.utils.metrics import LLM_REQUEST_SECONDS, LLM_TTFT_SECONDS, LLM_TOKENS, LLM_RETRIES
+
+logger = logging.getLogger("llm_gateway")
+
+GROQ_API_URL = os.getenv("GROQ_API_URL", "https://api.groq.com/openai/v1/chat/completions")
+
+# Pool / concurrency / retry knobs (all overridable from .env)
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "20"))
+LLM_MAX_KEEPALIVE = int(os.getenv("LLM_MAX_KEEPALIVE", "10"))
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "16"))
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "20"))
+LLM_CONNECT_TIMEOUT = float(os.getenv("LLM_CONNECT_TIMEOUT", "5"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "2"))
+LLM_RETRY_BASE_DELAY = float(os.getenv("LLM_RETRY_BASE_DELAY", "0.5"))
+LLM_RETRY_MAX_DELAY = float(os.getenv("LLM_RETRY_MAX_DELAY", "8"))
+
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+class LLMGateway:
+    """
+    Single async entry point for every Groq (OpenAI-compatible) chat call.
+    One keep-alive connection pool is shared by live chat and resume parsing,
+    and a semaphore caps how many requests are in flight at once.
+    Every attempt first gets quota from the rate limiter (see rate_limiter.py); attempts
+    that are retried hand their token estimate back.
+    """
+
+    def __init__(self):
+        self.api_key = os.getenv("GROQ_API_KEY")
+        self.api_url = GROQ_API_URL
+        self._client: Optional[httpx.AsyncClient] = None
+        self._semaphore = asyncio.Semaphore(LLM_MAX_CONCURRENCY)
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        # Built lazily so it binds to the running event loop
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(LLM_TIMEOUT, connect=LLM_CONNECT_TIMEOUT),
+                limits=httpx.Limits(
+                    max_connections=LLM_MAX_CONNECTIONS,
+                    max_keepalive_connections=LLM_MAX_KEEPALIVE,
+                ),
+            )
+        return self._client
+
+    def _headers(self) -> dict:
+        return {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {self.api_key}",
+            TRACE_HEADER: get_trace_id(),
+        }
+
+    @staticmethod
+    def _backoff(attempt: int, response: Optional[httpx.Response] = None) -> float:
+        """Full-jitter exponential backoff; honours Retry-After when the provider sends one."""
+        if response is not None:
+            retry_after = response.headers.get("retry-after")
+            if retry_after:
+                try:
+                    return min(float(retry_after), LLM_RETRY_MAX_DELAY)
+                except ValueError:
+                    pass
+        ceiling = min(LLM_RETRY_MAX_DELAY, LLM_RETRY_BASE_DELAY * (2 ** attempt))
+        return random.uniform(0, ceiling)
+
+    @staticmethod
+    def _throttled(model: str, response: httpx.Response):
+        """On 429, hold every queued request for this model until the provider's retry-after."""
+        if response.status_code != 429:
+            return
+        try:
+            pause = float(response.headers.get("retry-after", ""))
+        except ValueError:
+            pause = LLM_RETRY_BASE_DELAY * 2
+        rate_limiter.for_model(model).pause(pause)
+
+    @staticmethod
+    def _record_usage(model: str, usage: Optional[dict], estimated: int):
+        """Exports the provider's token counts and corrects the rate limiter's estimate."""
+        if not usage:
+            return
+        LLM_TOKENS.inc(usage.get("prompt_tokens") or 0, model=model, direction="prompt")
+        LLM_TOKENS.inc(usage.get("completion_tokens") or 0, model=model, direction="completion")
+        if usage.get("total_tokens"):
+            rate_limiter.for_model(model).settle(estimated, usage["total_tokens"])
+
+    async def chat(self, messages: List[dict], model: str, timeout: Optional[float] = None,
+                   priority: int = PRIORITY_NORMAL, user_id: Optional[str] = None, **params) -> dict:
+        """
+        Non-streaming completion. Returns the provider's JSON body.
+        Raises httpx.HTTPStatusError / httpx.RequestError once retries are exhausted,
+        or RateLimitTimeout if no quota freed up in time.
+        """
+        payload = {"model": model, "messages": messages, **params}
+        request_timeout = timeout if timeout is not None else httpx.USE_CLIENT_DEFAULT
+        limiter = rate_limiter.for_model(model)
+        estimated = estimate_tokens(messages, params.get("max_tokens"))
+
+        with LLM_REQUEST_SECONDS.time(model=model, kind="chat"):
+            for attempt in range(LLM_MAX_RETRIES + 1):
+                try:
+                    await limiter.acquire(estimated, priority, user_id)
+                    async with self._semaphore:
+                        response = await self.client.post(
+                            self.api_url, headers=self._headers(), json=payload, timeout=request_timeout
+                        )
+                    self._throttled(model, response)
+
+                    if response.status_code in RETRYABLE_STATUS and attempt < LLM_MAX_RETRIES:
+                        delay = self._backoff(attempt, response)
+                        logger.warning(f"⚠️ Groq returned {response.status_code}, retrying in {delay:.2f}s")
+                        LLM_RETRIES.inc(model=model, reason=response.status_code)
+                        limiter.refund(estimated)
+                        await asyncio.sleep(delay)
+                        continue
+
+                    response.raise_for_status()
+                    body = response.json()
+                    self._record_usage(model, body.get("usage"), estimated)
+                    return body
+
+                except httpx.TransportError as e:
+                    if attempt >= LLM_MAX_RETRIES:
+                        raise
+                    delay = self._backoff(attempt)
+                    LLM_RETRIES.inc(model=model, reason="transport")
+                    limiter.refund(estimated)
+                    logger.warning(f"⚠️ Groq transport error ({e!r}), retrying in {delay:.2f}s")
+                    await asyncio.sleep(delay)
+
+    async def stream_chat(self, messages: List[dict], model: str, timeout: Optional[float] = None,
+                          priority: int = PRIORITY_NORMAL, user_id: Optional[str] = None, **params) -> AsyncIterator[str]:
+        """
+        Streaming completion. Yields content deltas as they arrive.
+        Retries only happen before the first delta, so callers never see duplicated text.
+        """
+        payload = {"model": model, "messages": messages, "stream": True, **params}
+        request_timeout = timeout if timeout is not None else httpx.USE_CLIENT_DEFAULT
+        limiter = rate_limiter.for_model(model)
+        estimated = estimate_tokens(messages, params.get("max_tokens"))
+
+        timer = LLM_REQUEST_SECONDS.time(model=model, kind="stream")
+        with timer:
+            for attempt in range(LLM_MAX_RETRIES + 1):
+                started = False
+                try:
+                    await limiter.acquire(estimated, priority, user_id)
+                    async with self._semaphore:
+                        async with self.client.stream(
+                            "POST", self.api_url, headers=self._headers(), json=payload, timeout=request_timeout
+                        ) as response:
+                            self._throttled(model, response)
+
+                            if response.status_code in RETRYABLE_STATUS and attempt < LLM_MAX_RETRIES:
+                                delay = self._backoff(attempt, response)
+                                logger.warning(f"⚠️ Groq returned {response.status_code}, retrying in {delay:.2f}s")
+                                LLM_RETRIES.inc(model=model, reason=response.status_code)
+                                limiter.refund(estimated)
+                            else:
+                                if response.is_error:
+                                    await response.aread()
+                                response.raise_for_status()
+
+                                async for line in response.aiter_lines():
+                                    if not line.startswith("data:"):
+                                        continue
+                                    data = line[len("data:"):].strip()
+                                    if data == "[DONE]":
+                                        break
+                                    chunk = json.loads(data)
+                                    # Usage rides on the last chunk (OpenAI style, or Groq's x_groq block)
+                                    usage = chunk.get("usage") or (chunk.get("x_groq") or {}).get("usage")
+                                    if usage:
+                                        self._record_usage(model, usage, estimated)
+                                    if not chunk.get("choices"):
+                                        continue
+                                    delta = chunk["choices"][0].get("delta", {}).get("content")
+                                    if delta:
+                                        if not started:
+                                            started = True
+                                            LLM_TTFT_SECONDS.observe(time.perf_counter() - timer.started, model=model)
+                                        yield delta
+                                return
+
+                    await asyncio.sleep(delay)
+
+                except httpx.TransportError as e:
+                    if started or attempt >= LLM_MAX_RETRIES:
+                        raise
+                    delay = self._backoff(attempt)
+                    LLM_RETRIES.inc(model=model, reason="transport")
+                    limiter.refund(estimated)
+                    logger.warning(f"⚠️ Groq transport error ({e!r}), retrying in {delay:.2f}s")
+                    await asyncio.sleep(delay)
+
+    async def aclose(self):
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
+
+
+llm_gateway = LLMGateway()
@@ -1,40 +1,143 @@
 import os
+import re
 import logging
-from groq import Groq
+from contextlib import aclosing
+from typing import AsyncIterator, List, Optional
+from app.services.llm_gateway import llm_gateway
+from app.services.hedging import hedged_call, hedged_stream
+from app.services.rate_limiter import PRIORITY_INTERACTIVE
 
 # Configure logging to see EVERYTHING
 logger = logging.getLogger("ai_brain")
 logger.setLevel(logging.INFO)
 
+# Canned reply when Groq fails (callers compare against it to avoid caching a failure)
+FALLBACK_REPLY = "I apologize, I am having trouble processing that right now."
+
+# Faster model used to hedge slow first tokens and to fail over on errors ("" disables it)
+LLM_FALLBACK_MODEL = os.getenv("LLM_FALLBACK_MODEL", "llama-3.1-8b-instant")
+# With hedging off the fallback is only used when the primary fails
+LLM_HEDGE_ENABLED = os.getenv("LLM_HEDGE_ENABLED", "true").lower() in ("1", "true", "yes")
+
+# A sentence ends at . ! or ? followed by whitespace (keeps "3.5" and "e.g." mid-token intact)
+SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+
+class StreamInterrupted(Exception):
+    """The stream failed after part of the reply was already yielded; what was sent is all there is."""
+
 class LLMService:
     def __init__(self):
         self.api_key = os.getenv("GROQ_API_KEY")
         if not self.api_key:
             logger.warning("⚠️ GROQ_API_KEY not found in .env")
-        self.client = Groq(api_key=self.api_key)
+        self.gateway = llm_gateway
         self.model = "llama-3.3-70b-versatile" # Good balance of speed/intelligence
+        self.fallback_model = LLM_FALLBACK_MODEL or None
+        self.hedge = LLM_HEDGE_ENABLED
+
+    @staticmethod
+    def build_messages(system_prompt: str, user_message: str, history: Optional[List[dict]] = None) -> List[dict]:
+        """System prompt, then earlier turns (see ConversationMemory), then the new message."""
+        return [
+            {"role": "system", "content": system_prompt},
+            *(history or []),
+            {"role": "user", "content": user_message}
+        ]
 
-    def get_ai_response(self, system_prompt: str, user_message: str):
+    async def get_ai_response(self, system_prompt: str, user_message: str, history: Optional[List[dict]] = None,
+                              priority: int = PRIORITY_INTERACTIVE, user_id: Optional[str] = None):
         try:
             logger.info("🧠 Sending request to Groq...")
             
-            # Call Groq API
-            chat_completion = self.client.chat.completions.create(
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_message}
-                ],
-                model=self.model,
-                temperature=0.6, # Slightly creative but focused
-                max_tokens=250,  # Keep answers concise (good for interviews)
+            messages = self.build_messages(system_prompt, user_message, history)
+
+            # Call Groq API (hedged against the fast model if the primary is slow)
+            chat_completion = await hedged_call(
+                self.model,
+                lambda model: self.gateway.chat(
+                    messages=messages,
+                    model=model,
+                    temperature=0.6, # Slightly creative but focused
+                    max_tokens=250,  # Keep answers concise (good for interviews)
+                    priority=priority,
+                    user_id=user_id,
+                ),
+                fallback_model=self.fallback_model,
+                hedge=self.hedge,
             )
 
-            response_text = chat_completion.choices[0].message.content
+            response_text = chat_completion["choices"][0]["message"]["content"]
             logger.info("✅ Groq Response Received")
             return response_text
 
         except Exception as e:
             logger.error(f"❌ AI Generation Failed: {e}")
-            return "I apologize, I am having trouble processing that right now."
+            return FALLBACK_REPLY
+
+    async def stream_ai_response(self, system_prompt: str, user_message: str, history: Optional[List[dict]] = None,
+                                 priority: int = PRIORITY_INTERACTIVE, user_id: Optional[str] = None) -> AsyncIterator[str]:
+        """
+        Streams the reply as raw token deltas, as soon as Groq emits them.
+        Closing this generator early (barge-in) closes the HTTP stream, so Groq stops generating.
+        If the first token is late, the fast model is raced against it (see hedging.py).
+        A failure before the first delta yields FALLBACK_REPLY instead; a failure after it raises
+        StreamInterrupted, so the fallback is never glued onto half a reply.
+        """
+        streamed = False
+        try:
+            logger.info("🧠 Streaming request to Groq...")
+            messages = self.build_messages(system_prompt, user_message, history)
+
+            async with aclosing(hedged_stream(
+                self.model,
+                lambda model: self.gateway.stream_chat(
+                    messages=messages,
+                    model=model,
+                    temperature=0.6,
+                    max_tokens=250,
+                    priority=priority,
+                    user_id=user_id,
+                ),
+                fallback_model=self.fallback_model,
+                hedge=self.hedge,
+            )) as deltas:
+                async for delta in deltas:
+                    streamed = True
+                    yield delta
+
+            logger.info("✅ Groq Stream Finished")
+
+        except Exception as e:
+            logger.error(f"❌ AI Streaming Failed: {e}")
+            if streamed:
+                raise StreamInterrupted(str(e)) from e
+            yield FALLBACK_REPLY
+
+    async def stream_ai_sentences(self, system_prompt: str, user_message: str, history: Optional[List[dict]] = None,
+                                  priority: int = PRIORITY_INTERACTIVE, user_id: Optional[str] = None) -> AsyncIterator[str]:
+        """
+        Groups the token stream into complete sentences.
+        Useful when the consumer (UI bubbles, TTS) wants whole phrases instead of fragments.
+        """
+        buffer = ""
+        try:
+            async with aclosing(self.stream_ai_response(system_prompt, user_message, history, priority, user_id)) as tokens:
+                async for token in tokens:
+                    buffer += token
+                    parts = SENTENCE_END.split(buffer)
+                    # Everything but the last part is a finished sentence
+                    for sentence in parts[:-1]:
+                        if sentence.strip():
+                            yield sentence.strip()
+                    buffer = parts[-1]
+        except StreamInterrupted:
+            # Hand over the fragment that was already generated, then report the failure
+            if buffer.strip():
+                yield buffer.strip()
+            raise
+
+        if buffer.strip():
+            yield buffer.strip()
 
-llm_service = LLMService()
\ No newline at end of file
+llm_service = LLMService()
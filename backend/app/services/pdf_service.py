@@ -0,0 +1,102 @@
+# app/services/pdf_service.py
+
+import os
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+
+from app.utils.metrics import PDF_EXTRACT_SECONDS
+
+logger = logging.getLogger("pdf_service")
+
+PDF_WORKERS = int(os.getenv("PDF_WORKERS", str(min(4, os.cpu_count() or 1))))
+PDF_EXTRACT_TIMEOUT = float(os.getenv("PDF_EXTRACT_TIMEOUT", "15"))
+PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", "30"))
+
+
+class PDFExtractionError(Exception):
+    pass
+
+
+def _extract_text(path: str, max_pages: int) -> str:
+    """
+    Runs inside a worker process. Kept at module level (and this module kept light)
+    so the spawned workers only import PyMuPDF, not the whole app.
+    """
+    import fitz  # PyMuPDF
+
+    with fitz.open(path, filetype="pdf") as doc:
+        if doc.page_count > max_pages:
+            raise ValueError(f"PDF has {doc.page_count} pages (limit is {max_pages})")
+        # Form feed between pages, so running headers/footers can be told apart (see compact_text)
+        return "\f".join([page.get_text() for page in doc]).strip()
+
+
+class PDFExtractor:
+    """
+    Extracts PDF text in a bounded process pool so parsing never runs on the event loop.
+    A job that exceeds the timeout gets its pool torn down (the only way to stop a stuck worker).
+    """
+
+    def __init__(self, workers: int = PDF_WORKERS, timeout: float = PDF_EXTRACT_TIMEOUT, max_pages: int = PDF_MAX_PAGES):
+        self.workers = workers
+        self.timeout = timeout
+        self.max_pages = max_pages
+        self._executor: Optional[ProcessPoolExecutor] = None
+        # At most `workers` jobs are submitted at once; the rest wait here instead of in the pool queue,
+        # so the timeout only measures actual extraction time.
+        self._slots = asyncio.Semaphore(workers)
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    async def extract(self, path: str) -> str:
+        with PDF_EXTRACT_SECONDS.time():
+            return await self._extract(path)
+
+    async def _extract(self, path: str) -> str:
+        async with self._slots:
+            for attempt in range(2):
+                loop = asyncio.get_running_loop()
+                executor = self.executor
+                future = loop.run_in_executor(executor, _extract_text, path, self.max_pages)
+                try:
+                    return await asyncio.wait_for(future, timeout=self.timeout)
+
+                except asyncio.TimeoutError:
+                    logger.error(f"⏱️ PDF extraction exceeded {self.timeout}s, recycling worker pool")
+                    self._reset(executor)
+                    raise PDFExtractionError(f"PDF extraction timed out after {self.timeout:.0f}s")
+
+                except BrokenProcessPool:
+                    # Another job's timeout killed the pool under us; retry once on a fresh one
+                    self._reset(executor)
+                    if attempt:
+                        raise PDFExtractionError("PDF extraction worker crashed")
+
+                except ValueError as e:
+                    raise PDFExtractionError(str(e))
+
+    def _reset(self, executor: ProcessPoolExecutor):
+        if self._executor is executor:
+            self._executor = None
+        for process in list((executor._processes or {}).values()):
+            process.kill()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+pdf_extractor = PDFExtractor()
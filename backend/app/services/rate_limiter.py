@@ -0,0 +1,226 @@
+# app/services/rate_limiter.py
+#
+# Process-wide admission control in front of Groq. Each model has its own
+# requests-per-minute and tokens-per-minute buckets (that is how the provider meters us).
+# Callers queue instead of failing: interactive turns go first, background work
+# (bulk parsing) only gets what is left, and within a priority users are served
+# fairly (start-time fair queuing on estimated tokens), so one big upload can't starve others.
+
+import os
+import time
+import heapq
+import asyncio
+import logging
+import itertools
+from typing import Dict, List, Optional, Tuple
+
+from app.utils.tokens import count_tokens
+from app.utils.metrics import LLM_QUEUE_SECONDS
+
+logger = logging.getLogger("rate_limiter")
+
+PRIORITY_INTERACTIVE = 0   # live interview turns
+PRIORITY_NORMAL = 1        # warm-ups, summaries, single uploads
+PRIORITY_BACKGROUND = 2    # bulk parsing
+
+# Default per-model quota (0 disables that bucket). Groq's limits differ per model,
+# override individual models with RATE_LIMITS="model:rpm:tpm,model:rpm:tpm".
+# These are the provider's (per-organization) limits; every worker process enforces its own
+# buckets, so each gets an even share across WEB_CONCURRENCY workers (gunicorn's worker count).
+RATE_LIMIT_WORKERS = max(1, int(os.getenv("WEB_CONCURRENCY", "1")))
+RATE_LIMIT_RPM = int(os.getenv("RATE_LIMIT_RPM", "30"))
+RATE_LIMIT_TPM = int(os.getenv("RATE_LIMIT_TPM", "12000"))
+RATE_LIMITS = os.getenv("RATE_LIMITS", "")
+# Share of each token bucket background work may not touch (kept for live candidates)
+RATE_LIMIT_INTERACTIVE_RESERVE = float(os.getenv("RATE_LIMIT_INTERACTIVE_RESERVE", "0.2"))
+# Completion tokens are unknown upfront; charge this much (at most max_tokens) and settle later
+RATE_LIMIT_COMPLETION_ESTIMATE = int(os.getenv("RATE_LIMIT_COMPLETION_ESTIMATE", "1500"))
+
+# How long a request may wait in the queue, by priority
+QUEUE_TIMEOUTS = {
+    PRIORITY_INTERACTIVE: float(os.getenv("RATE_LIMIT_QUEUE_TIMEOUT_INTERACTIVE", "10")),
+    PRIORITY_NORMAL: float(os.getenv("RATE_LIMIT_QUEUE_TIMEOUT_NORMAL", "60")),
+    PRIORITY_BACKGROUND: float(os.getenv("RATE_LIMIT_QUEUE_TIMEOUT_BACKGROUND", "900")),
+}
+
+
+class RateLimitTimeout(Exception):
+    """The request waited longer than its queue deadline for quota."""
+
+
+def estimate_tokens(messages: List[dict], max_tokens: Optional[int] = None) -> int:
+    prompt = sum(count_tokens(m.get("content") or "") + 4 for m in messages)
+    return prompt + min(max_tokens or RATE_LIMIT_COMPLETION_ESTIMATE, RATE_LIMIT_COMPLETION_ESTIMATE)
+
+
+class _Bucket:
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    @property
+    def unlimited(self) -> bool:
+        return self.capacity <= 0
+
+    def _refill(self, now: float):
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        if self.unlimited:
+            return 0.0
+        self._refill(now)
+        return 0.0 if self.level >= amount else (amount - self.level) / self.rate
+
+    def take(self, amount: float, now: float):
+        if not self.unlimited:
+            self._refill(now)
+            # May go negative when a request was under-estimated (see settle); refunds never overfill it
+            self.level = min(self.capacity, max(-self.capacity, self.level - amount))
+
+
+class _Waiter:
+    __slots__ = ("tokens", "priority", "start_tag", "future")
+
+    def __init__(self, tokens: int, priority: int, start_tag: float, future: asyncio.Future):
+        self.tokens = tokens
+        self.priority = priority
+        self.start_tag = start_tag
+        self.future = future
+
+
+class ModelRateLimiter:
+
+    def __init__(self, model: str, rpm: int, tpm: int):
+        self.model = model
+        self.requests = _Bucket(rpm)
+        self.tokens = _Bucket(tpm)
+        self._queue: List[Tuple[int, float, int, _Waiter]] = []
+        self._seq = itertools.count()
+        self._virtual_time = 0.0
+        self._user_finish: Dict[str, float] = {}
+        self._paused_until = 0.0
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    async def acquire(self, tokens: int, priority: int = PRIORITY_NORMAL, user_id: Optional[str] = None, timeout: Optional[float] = None):
+        """
+        Waits until this request fits in the model's quota. Raises RateLimitTimeout
+        after `timeout` seconds (default depends on the priority).
+        """
+        if not self.tokens.unlimited:
+            tokens = min(tokens, int(self.tokens.capacity))
+
+        # Start-time fair queuing: a user's next request starts where their previous one ended
+        key = user_id or "anonymous"
+        start_tag = max(self._virtual_time, self._user_finish.get(key, 0.0))
+        self._user_finish[key] = start_tag + tokens
+
+        waiter = _Waiter(tokens, priority, start_tag, asyncio.get_running_loop().create_future())
+        heapq.heappush(self._queue, (priority, start_tag, next(self._seq), waiter))
+        self._pump()
+
+        if timeout is None:
+            timeout = QUEUE_TIMEOUTS.get(priority, QUEUE_TIMEOUTS[PRIORITY_NORMAL])
+        queued_at = time.monotonic()
+        try:
+            await asyncio.wait_for(waiter.future, timeout)
+        except asyncio.TimeoutError:
+            raise RateLimitTimeout(f"No {self.model} quota within {timeout:.1f}s") from None
+        finally:
+            if waiter.future.cancelled():
+                # Gave up while queued: it no longer counts against the user's fair share,
+                # and whoever was behind it can go now
+                self._user_finish[key] = max(self._virtual_time, self._user_finish.get(key, 0.0) - tokens)
+                self._pump()
+
+        waited = time.monotonic() - queued_at
+        LLM_QUEUE_SECONDS.observe(waited, model=self.model, priority=priority)
+        if waited > 0.5:
+            logger.info(f"🚦 {self.model}: priority {priority} request waited {waited:.1f}s for quota")
+
+    def pause(self, seconds: float):
+        """Provider said 429 / retry-after: hold every queued request for this model."""
+        until = time.monotonic() + seconds
+        if until > self._paused_until:
+            self._paused_until = until
+            logger.warning(f"⏸️ {self.model}: rate limited by provider, pausing {seconds:.1f}s")
+        self._pump()
+
+    def settle(self, estimated: int, actual: int):
+        """Corrects the token bucket once the real usage is known."""
+        self.tokens.take(actual - estimated, time.monotonic())
+
+    def refund(self, tokens: int):
+        """Gives back an attempt's estimate when the provider rejected it (429/5xx) or never got it."""
+        if not self.tokens.unlimited:
+            self.tokens.take(-min(tokens, int(self.tokens.capacity)), time.monotonic())
+            self._pump()
+
+    def _wait_time(self, waiter: _Waiter, now: float) -> float:
+        needed = waiter.tokens
+        if waiter.priority >= PRIORITY_BACKGROUND and not self.tokens.unlimited:
+            needed = min(self.tokens.capacity, needed + self.tokens.capacity * RATE_LIMIT_INTERACTIVE_RESERVE)
+        return max(
+            self._paused_until - now,
+            self.requests.wait_time(1, now),
+            self.tokens.wait_time(needed, now),
+        )
+
+    def _pump(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        now = time.monotonic()
+        while self._queue:
+            waiter = self._queue[0][3]
+            if waiter.future.done():
+                # Timed out or cancelled while queued
+                heapq.heappop(self._queue)
+                continue
+
+            wait = self._wait_time(waiter, now)
+            if wait > 0:
+                self._timer = asyncio.get_running_loop().call_later(wait, self._pump)
+                return
+
+            heapq.heappop(self._queue)
+            self.requests.take(1, now)
+            self.tokens.take(waiter.tokens, now)
+            self._virtual_time = max(self._virtual_time, waiter.start_tag)
+            waiter.future.set_result(None)
+
+        # Idle: forget users whose tags are already in the past
+        self._user_finish = {k: v for k, v in self._user_finish.items() if v > self._virtual_time}
+
+
+class RateLimiter:
+
+    def __init__(self):
+        self._models: Dict[str, ModelRateLimiter] = {}
+        self._overrides = self._parse_overrides(RATE_LIMITS)
+
+    @staticmethod
+    def _parse_overrides(spec: str) -> Dict[str, Tuple[int, int]]:
+        overrides = {}
+        for item in filter(None, (part.strip() for part in spec.split(","))):
+            try:
+                model, rpm, tpm = item.rsplit(":", 2)
+                overrides[model] = (int(rpm), int(tpm))
+            except ValueError:
+                logger.warning(f"⚠️ Ignoring malformed RATE_LIMITS entry: {item!r}")
+        return overrides
+
+    def for_model(self, model: str) -> ModelRateLimiter:
+        limiter = self._models.get(model)
+        if limiter is None:
+            rpm, tpm = self._overrides.get(model, (RATE_LIMIT_RPM, RATE_LIMIT_TPM))
+            # This worker's share (a limit of 0 stays disabled)
+            rpm, tpm = (max(1, limit // RATE_LIMIT_WORKERS) if limit > 0 else limit for limit in (rpm, tpm))
+            limiter = self._models[model] = ModelRateLimiter(model, rpm, tpm)
+        return limiter
+
+
+rate_limiter = RateLimiter()
@@ -0,0 +1,147 @@
+# app/services/resume_cache.py
+
+import os
+import json
+import time
+import hashlib
+import sqlite3
+import asyncio
+import logging
+import threading
+from typing import Optional
+
+from app.db import crud
+from app.db.models import RESUME_DATA_TABLE, RESUME_PARSED_COLUMNS
+
+logger = logging.getLogger("resume_cache")
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
+
+RESUME_CACHE_PATH = os.getenv("RESUME_CACHE_PATH", os.path.join(BACKEND_DIR, ".cache", "resume_cache.sqlite3"))
+RESUME_CACHE_MAX_BYTES = int(os.getenv("RESUME_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+# Opt-in: also look results up in resume_data.content_hash (requires that column to exist)
+RESUME_CACHE_DB_FALLBACK = os.getenv("RESUME_CACHE_DB_FALLBACK", "false").lower() == "true"
+
+
+class ResumeParseCache:
+    """
+    Content-addressed cache of structured resume parses, stored in a local SQLite file.
+
+    Keys are sha256 digests of either the uploaded bytes or the normalized extracted text,
+    salted with a namespace (model + prompt version) so a model/prompt change never serves stale output.
+    Least-recently-used rows are evicted once the stored payloads exceed `max_bytes`.
+    """
+
+    def __init__(self, path: str = RESUME_CACHE_PATH, max_bytes: int = RESUME_CACHE_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS parse_cache (
+                    key TEXT PRIMARY KEY,
+                    payload TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    last_access REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_parse_cache_access ON parse_cache(last_access)")
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    # ----------------------------------------------------------------------------------
+    #  KEYS
+    # ----------------------------------------------------------------------------------
+    @staticmethod
+    def namespace(model: str, prompt_version: str, *templates: str) -> str:
+        h = hashlib.sha256(f"{model}|{prompt_version}".encode())
+        for template in templates:
+            h.update(template.encode())
+        return h.hexdigest()[:16]
+
+    @staticmethod
+    def bytes_key(namespace: str, sha256_hex: str) -> str:
+        """Key for the raw upload, from its sha256 hex digest (computed while spooling)."""
+        return f"{namespace}:b:{sha256_hex}"
+
+    @staticmethod
+    def text_key(namespace: str, text: str) -> str:
+        normalized = " ".join(text.split())
+        return f"{namespace}:t:{hashlib.sha256(normalized.encode()).hexdigest()}"
+
+    # ----------------------------------------------------------------------------------
+    #  SYNC STORE (runs in a worker thread)
+    # ----------------------------------------------------------------------------------
+    def get(self, key: str) -> Optional[dict]:
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute("SELECT payload FROM parse_cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            conn.execute("UPDATE parse_cache SET last_access = ? WHERE key = ?", (time.time(), key))
+            conn.commit()
+        return json.loads(row[0])
+
+    def put(self, key: str, parsed: dict):
+        payload = json.dumps(parsed)
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO parse_cache (key, payload, size, last_access) VALUES (?, ?, ?, ?)",
+                (key, payload, len(payload), time.time())
+            )
+            self._evict(conn)
+            conn.commit()
+
+    def _evict(self, conn: sqlite3.Connection):
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM parse_cache").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        stale = []
+        for key, size in conn.execute("SELECT key, size FROM parse_cache ORDER BY last_access ASC"):
+            if total <= self.max_bytes:
+                break
+            stale.append((key,))
+            total -= size
+        conn.executemany("DELETE FROM parse_cache WHERE key = ?", stale)
+        logger.info(f"🧹 Evicted {len(stale)} cached resume parses")
+
+    # ----------------------------------------------------------------------------------
+    #  ASYNC API
+    # ----------------------------------------------------------------------------------
+    async def aget(self, key: str) -> Optional[dict]:
+        try:
+            return await asyncio.to_thread(self.get, key)
+        except Exception as e:
+            logger.warning(f"⚠️ Resume cache read failed: {e}")
+            return None
+
+    async def aput(self, key: str, parsed: dict):
+        try:
+            await asyncio.to_thread(self.put, key, parsed)
+        except Exception as e:
+            logger.warning(f"⚠️ Resume cache write failed: {e}")
+
+    async def lookup_db(self, text_key: str) -> Optional[dict]:
+        """
+        Optional second tier: a previously saved resume_data row with the same content hash.
+        """
+        if not RESUME_CACHE_DB_FALLBACK:
+            return None
+
+        try:
+            return await crud.select_one(RESUME_DATA_TABLE, RESUME_PARSED_COLUMNS, {"content_hash": text_key})
+        except Exception as e:
+            logger.warning(f"⚠️ resume_data cache lookup failed: {e}")
+            return None
+
+
+resume_cache = ResumeParseCache()
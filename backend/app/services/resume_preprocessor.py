@@ -0,0 +1,287 @@
+# app/services/resume_preprocessor.py
+#
+# Deterministic, local-only pass over extracted resume text.
+# Pulls out what regexes find reliably (contact fields, section boundaries, a skills list)
+# and compacts the text so the LLM only sees what it actually needs to structure.
+# For long resumes it also plans the per-section chunks parsed in parallel, and merges
+# their results back into one ResumeParsed-shaped dict.
+
+import re
+import json
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from app.utils.tokens import count_tokens, truncate_to_budget
+
+EMAIL_RE = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
+PHONE_RE = re.compile(r"(?<!\w)(\+?\d[\d\s().-]{7,}\d)(?!\w)")
+PAGE_MARKER_RE = re.compile(r"^(page\s*\d+(\s*(of|/)\s*\d+)?|\d+\s*/\s*\d+|-\s*\d+\s*-)$", re.IGNORECASE)
+# Lines at the top/bottom of each page checked for running headers/footers
+RUNNING_LINES = 3
+# Header lines that look like a name but aren't (document titles, job titles)
+NOT_NAME_WORDS = {
+    "curriculum", "vitae", "resume", "résumé", "cv", "profile", "contact", "senior", "junior", "lead",
+    "software", "engineer", "developer", "manager", "analyst", "designer", "consultant", "intern", "student",
+}
+SKILL_SPLIT_RE = re.compile(r"[,;|•·●▪\n]|\s{2,}|\s-\s")
+
+# Canonical section -> headings that introduce it (matched against a whole, short line)
+SECTION_HEADINGS = {
+    "summary": ["summary", "profile", "objective", "about me", "professional summary"],
+    "experience": ["experience", "work experience", "professional experience", "employment", "employment history", "work history", "internships"],
+    "education": ["education", "academic background", "academics", "qualifications"],
+    "skills": ["skills", "technical skills", "core skills", "key skills", "technologies", "tech stack", "tools"],
+    "projects": ["projects", "personal projects", "academic projects", "key projects"],
+    "certifications": ["certifications", "certificates", "courses"],
+    "achievements": ["achievements", "awards", "honors", "honours", "accomplishments"],
+    "publications": ["publications", "research", "papers"],
+}
+_HEADING_LOOKUP = {alias: section for section, aliases in SECTION_HEADINGS.items() for alias in aliases}
+
+RESUME_SCALAR_FIELDS = ("name", "email", "phone")
+RESUME_LIST_FIELDS = ("skills", "education", "experience", "projects")
+
+# Chunked mode: the ResumeParsed field each section is parsed into. Everything else
+# (header, summary, certifications, ...) goes into one "profile" chunk.
+SECTION_FIELDS = {"experience": "experience", "projects": "projects", "education": "education", "skills": "skills"}
+# A non-bullet line mentioning a year usually starts a new entry (role, degree, project); chunks break before one
+ENTRY_START_RE = re.compile(r"^(?![-•*●▪·]).*\b(19|20)\d{2}\b")
+
+
+# --------------------------------------------------------------------------------------
+#  COMPACTION
+# --------------------------------------------------------------------------------------
+def _running_lines(pages: List[List[str]]) -> Tuple[set, set]:
+    """Lines repeated at the top (headers) or bottom (footers) of most pages."""
+    if len(pages) < 2:
+        return set(), set()
+    tops, bottoms = Counter(), Counter()
+    for lines in pages:
+        tops.update({line.lower() for line in lines[:RUNNING_LINES]})
+        bottoms.update({line.lower() for line in lines[-RUNNING_LINES:]})
+    threshold = max(2, len(pages) // 2 + 1)
+    return ({key for key, n in tops.items() if n >= threshold},
+            {key for key, n in bottoms.items() if n >= threshold})
+
+
+def compact_text(text: str) -> str:
+    """
+    Collapses whitespace runs, drops blank lines and page markers, and removes running
+    headers/footers: lines repeated at the top or bottom of most pages (pages are separated
+    by form feeds, as the PDF extractor emits them). Their first occurrence is kept, since
+    page 1's header is often the name. Repeats anywhere else (job titles, dates, identical
+    bullets) are real content and stay.
+    """
+    pages = []
+    for page in text.split("\f"):
+        lines = (" ".join(raw_line.split()) for raw_line in page.split("\n"))
+        pages.append([line for line in lines if line and not PAGE_MARKER_RE.match(line)])
+    headers, footers = _running_lines(pages)
+
+    seen = set()
+    compacted = []
+    for lines in pages:
+        for index, line in enumerate(lines):
+            key = line.lower()
+            running = (index < RUNNING_LINES and key in headers) or (index >= len(lines) - RUNNING_LINES and key in footers)
+            if running:
+                if key in seen:
+                    continue
+                seen.add(key)
+            compacted.append(line)
+    return "\n".join(compacted)
+
+
+# --------------------------------------------------------------------------------------
+#  FIELD EXTRACTION
+# --------------------------------------------------------------------------------------
+def _heading_for(line: str) -> Optional[str]:
+    candidate = line.strip().strip(":").strip().lower()
+    if len(candidate) > 40:
+        return None
+    return _HEADING_LOOKUP.get(candidate)
+
+
+def find_sections(text: str) -> Dict[str, str]:
+    """
+    Splits compacted text on recognised heading lines.
+    Anything before the first heading is returned as "header" (usually name + contact).
+    """
+    sections: Dict[str, List[str]] = {"header": []}
+    current = "header"
+    for line in text.split("\n"):
+        heading = _heading_for(line)
+        if heading:
+            current = heading
+            sections.setdefault(current, [])
+            continue
+        sections[current].append(line)
+    return {name: "\n".join(lines).strip() for name, lines in sections.items() if lines}
+
+
+def extract_contact(text: str, header: str = "") -> Dict[str, Optional[str]]:
+    email = EMAIL_RE.search(text)
+
+    phone = None
+    for match in PHONE_RE.finditer(text):
+        digits = re.sub(r"\D", "", match.group(1))
+        if 10 <= len(digits) <= 15:
+            phone = match.group(1).strip()
+            break
+
+    # Name (a best guess): first short header line made only of letters (e.g. "Jane A. Doe")
+    name = None
+    for line in (header or text).split("\n")[:5]:
+        words = line.split()
+        if 2 <= len(words) <= 4 and all(re.fullmatch(r"[A-Za-z][A-Za-z.'-]*", w) for w in words) \
+                and not any(w.lower().strip(".") in NOT_NAME_WORDS for w in words):
+            name = line.strip()
+            break
+
+    return {
+        "name": name,
+        "email": email.group(0) if email else None,
+        "phone": phone,
+    }
+
+
+def extract_skill_candidates(skills_text: str) -> List[str]:
+    skills, seen = [], set()
+    for piece in SKILL_SPLIT_RE.split(skills_text):
+        # Drop "Languages:"-style labels in front of the actual list
+        piece = piece.split(":")[-1].strip(" .-*")
+        if not piece or len(piece) > 40:
+            continue
+        key = piece.lower()
+        if key not in seen:
+            seen.add(key)
+            skills.append(piece)
+    return skills
+
+
+# --------------------------------------------------------------------------------------
+#  CHUNKING (long resumes)
+# --------------------------------------------------------------------------------------
+def split_to_budget(text: str, max_tokens: int) -> List[str]:
+    """
+    Splits a section into pieces of at most ~max_tokens, on line boundaries.
+    When a piece overflows, it is cut before its last entry-looking line so an entry
+    (title line + bullets) stays together where possible.
+    """
+    chunks: List[str] = []
+    current: List[str] = []
+    used = 0
+    for line in text.split("\n"):
+        cost = count_tokens(line) + 1
+        if current and used + cost > max_tokens:
+            cut = next((i for i in range(len(current) - 1, 0, -1) if ENTRY_START_RE.search(current[i])), len(current))
+            chunks.append("\n".join(current[:cut]))
+            current = current[cut:]
+            used = sum(count_tokens(l) + 1 for l in current)
+        current.append(line)
+        used += cost
+    if current:
+        chunks.append("\n".join(current))
+    return chunks
+
+
+def _plan(sections: Dict[str, str], max_tokens: int) -> List[Tuple[str, List[str], str]]:
+    profile_parts, jobs = [], []
+    for name, body in sections.items():
+        field = SECTION_FIELDS.get(name)
+        if field is None:
+            profile_parts.append(body if name == "header" else f"{name.title()}:\n{body}")
+            continue
+        for index, piece in enumerate(split_to_budget(body, max_tokens)):
+            jobs.append((f"{name}[{index}]", [field], f"{name.title()}:\n{piece}"))
+
+    covered = {fields[0] for _, fields, _ in jobs}
+    profile_fields = [*RESUME_SCALAR_FIELDS, *(f for f in RESUME_LIST_FIELDS if f not in covered)]
+    if profile_parts:
+        pieces = split_to_budget("\n".join(profile_parts), max_tokens)
+        jobs[:0] = [("profile" if len(pieces) == 1 else f"profile[{index}]", profile_fields, piece)
+                    for index, piece in enumerate(pieces)]
+    return jobs
+
+
+def _pack(jobs: List[Tuple[str, List[str], str]], max_tokens: int) -> List[Tuple[str, List[str], str]]:
+    """Merges neighbouring jobs for different fields into one call while they fit the budget."""
+    packed = []
+    for label, fields, text in jobs:
+        if packed:
+            last_label, last_fields, last_text = packed[-1]
+            if not set(fields) & set(last_fields) and count_tokens(last_text) + count_tokens(text) <= max_tokens:
+                packed[-1] = (f"{last_label}+{label}", [*last_fields, *fields], f"{last_text}\n\n{text}")
+                continue
+        packed.append((label, fields, text))
+    return packed
+
+
+def plan_chunks(sections: Dict[str, str], max_tokens: int, max_chunks: int) -> List[Tuple[str, List[str], str]]:
+    """
+    Returns (label, fields, text) jobs for chunked parsing, the profile chunk first.
+    List fields whose section was not found are asked of the profile chunk instead, and
+    small neighbouring sections share a call. Nothing is dropped: if the jobs don't fit in
+    max_chunks, the per-chunk budget is raised until they do (at worst, one job).
+    """
+    if max_chunks < 1:
+        return []
+    budget = max_tokens
+    while True:
+        jobs = _pack(_plan(sections, budget), budget)
+        if len(jobs) <= max_chunks:
+            return jobs
+        budget = int(budget * len(jobs) / max_chunks) + 1
+
+
+def _dedup_key(item) -> str:
+    if isinstance(item, (dict, list)):
+        item = json.dumps(item, sort_keys=True)
+    return " ".join(str(item).lower().split())
+
+
+def merge_chunk_results(results: List[dict]) -> dict:
+    """
+    Folds per-chunk parses (in chunk order) into one: first non-empty value wins for
+    scalar fields, list fields are concatenated with duplicates (case/whitespace-insensitive)
+    dropped, e.g. a skill named in both the summary and the skills section.
+    """
+    merged = {field: None for field in RESUME_SCALAR_FIELDS}
+    merged.update({field: [] for field in RESUME_LIST_FIELDS})
+    seen = {field: set() for field in RESUME_LIST_FIELDS}
+    for result in results:
+        for field in RESUME_SCALAR_FIELDS:
+            if not merged[field] and result.get(field):
+                merged[field] = result[field]
+        for field in RESUME_LIST_FIELDS:
+            items = result.get(field) or []
+            for item in items if isinstance(items, list) else [items]:
+                key = _dedup_key(item)
+                if key and key not in seen[field]:
+                    seen[field].add(key)
+                    merged[field].append(item)
+    return merged
+
+
+# --------------------------------------------------------------------------------------
+#  PIPELINE
+# --------------------------------------------------------------------------------------
+def preprocess_resume(text: str, max_tokens: int) -> dict:
+    """
+    Returns the locally-extracted fields plus the compacted, budget-truncated text for the LLM.
+    """
+    compacted = compact_text(text)
+    sections = find_sections(compacted)
+    contact = extract_contact(compacted, sections.get("header", ""))
+    skills = extract_skill_candidates(sections.get("skills", ""))
+    llm_text = truncate_to_budget(compacted, max_tokens)
+
+    return {
+        "contact": contact,
+        "skills": skills,
+        "sections": sections,
+        "llm_text": llm_text,
+        "tokens_in": count_tokens(text),
+        "tokens_compacted": count_tokens(compacted),
+        "tokens_out": count_tokens(llm_text),
+    }
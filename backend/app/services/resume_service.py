@@ -1,61 +1,67 @@
 # app/services/resume_service.py
 
-import fitz  # PyMuPDF
 import os
 import httpx
+import asyncio
 import logging
 import json
 import time
+from contextlib import nullcontext
+from typing import List, Optional
 
-from app.models.resume import ResumeParsed
-from app.db.database import supabase  
-from app.db.database import create_tables
+from app.models.resume import RESUME_ADAPTER, RESUME_LLM_FIELDS
+from app.services.llm_gateway import llm_gateway
+from app.services.rate_limiter import RateLimitTimeout, PRIORITY_NORMAL
+from app.services.pdf_service import pdf_extractor
+from app.services.resume_preprocessor import preprocess_resume, plan_chunks, merge_chunk_results
+from app.utils.file_utils import spool_upload, remove_file, UploadTooLarge
+from app.utils.validation import repair_json, validate_fields, JSONRepairError
+from app.services.resume_cache import ResumeParseCache, resume_cache, RESUME_CACHE_DB_FALLBACK
+from app.db import crud
+from app.db.models import RESUME_DATA_TABLE
 
 logging.basicConfig(level=logging.DEBUG)
 
 # IMPORTANT: Move API key to .env in production
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
 GROQ_MODEL = "llama-3.3-70b-versatile"
-GROQ_API_URL = "https://api.groq.com/openai/v1/chat/completions"
+# Input budget for the compacted resume text sent to Groq
+RESUME_MAX_INPUT_TOKENS = int(os.getenv("RESUME_MAX_INPUT_TOKENS", "6000"))
 
+# Chunked (map-reduce) mode for long resumes: above this many compacted tokens, sections are
+# parsed by parallel, smaller LLM calls and merged, so wall-clock time tracks the slowest section.
+# Each call is charged ~input + RATE_LIMIT_COMPLETION_ESTIMATE tokens up front, so how many
+# actually run at once is capped by the TPM quota; small sections share a call to save quota.
+RESUME_CHUNKED_ENABLED = os.getenv("RESUME_CHUNKED_ENABLED", "true").lower() in ("1", "true", "yes")
+RESUME_CHUNKED_MIN_TOKENS = int(os.getenv("RESUME_CHUNKED_MIN_TOKENS", "2500"))
+RESUME_CHUNK_INPUT_TOKENS = int(os.getenv("RESUME_CHUNK_INPUT_TOKENS", "1500"))
+RESUME_CHUNK_MAX_TOKENS = int(os.getenv("RESUME_CHUNK_MAX_TOKENS", "2000"))
+RESUME_MAX_CHUNKS = int(os.getenv("RESUME_MAX_CHUNKS", "4"))
+# Fields still missing after local repair + validation are re-asked once, on their own
+RESUME_REASK_ENABLED = os.getenv("RESUME_REASK_ENABLED", "true").lower() in ("1", "true", "yes")
+RESUME_REASK_MAX_TOKENS = int(os.getenv("RESUME_REASK_MAX_TOKENS", "3000"))
 
-# --------------------------------------------------------------------------------------
-#  PARSE RESUME FUNCTION
-# --------------------------------------------------------------------------------------
-async def parse_resume(file):
-    logging.info(f"Starting resume parsing using Groq model: {GROQ_MODEL}")
-
-    if not GROQ_API_KEY:
-        logging.critical("❌ GROQ_API_KEY environment variable is missing")
-        return {"error": "GROQ API Key missing. Set GROQ_API_KEY in .env"}
-
-    # Read PDF file
-    try:
-        file_bytes = await file.read()
-        doc = fitz.open(stream=file_bytes, filetype="pdf")
-        text = "\n".join([page.get_text() for page in doc]).strip()
-        doc.close()
-        logging.debug(f"Extracted text length: {len(text)}")
-    except Exception as e:
-        logging.error(f"Failed to read PDF: {e}")
-        return {"error": f"Failed to read PDF: {e}"}
+# Bump whenever the prompts below change in a way that affects the output
+RESUME_PROMPT_VERSION = "4"
 
-    # LLM prompt
-    system_prompt = """
+RESUME_SYSTEM_PROMPT = """
 You are an expert resume parser. Extract structured information into a single, valid, minified JSON object (no markdown). Include these fields:
 - "name": string (null if missing)
 - "email": string (null if missing)
 - "phone": string (null if missing)
 - "skills": list of strings (empty list if missing)
 - "education": list of strings (empty list if missing)
-- "experience": list of objects (empty list if missing)
-- "projects": list of objects (empty list if missing)
+- "experience": list of strings, one per role (empty list if missing)
+- "projects": list of strings, one per project (empty list if missing)
 
 Ensure consistency in field names and return all available data exactly as in the resume. If any section is missing, include the field with its default value (null or empty list).
 
 """
 
-    user_message = f"""
+RESUME_USER_TEMPLATE = """
+Already extracted locally (return these fields as null unless they are missing here):
+{known}
+
 Resume Text:
 {text}
 
@@ -71,44 +77,161 @@ Extract into valid JSON:
 }}
 """
 
-    headers = {
-        "Content-Type": "application/json",
-        "Authorization": f"Bearer {GROQ_API_KEY}"
-    }
-
-    payload = {
-        "model": GROQ_MODEL,
-        "messages": [
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_message}
-        ],
-        "temperature": 0.0,
-        "max_tokens": 8000,
-        "response_format": {"type": "json_object"}
-    }
-
-    # Call Groq API
+RESUME_SECTION_SYSTEM_PROMPT = """
+You are an expert resume parser. You are given one part of a resume. Extract only the requested fields into a single, valid, minified JSON object (no markdown). Use null for a missing string and an empty list for a missing list. Return the data exactly as in the resume.
+"""
+
+RESUME_SECTION_USER_TEMPLATE = """
+Resume part ({label}):
+{text}
+
+Extract into valid JSON with exactly these keys:
+{fields}
+"""
+
+RESUME_FIELD_TYPES = {
+    "name": "str", "email": "str", "phone": "str",
+    "skills": "list[str]", "education": "list[str]", "experience": "list[str]", "projects": "list[str]",
+}
+
+# Cache namespace: changes automatically with the model or any prompt
+CACHE_NAMESPACE = ResumeParseCache.namespace(
+    GROQ_MODEL, RESUME_PROMPT_VERSION, RESUME_SYSTEM_PROMPT, RESUME_USER_TEMPLATE,
+    RESUME_SECTION_SYSTEM_PROMPT, RESUME_SECTION_USER_TEMPLATE,
+)
+
+
+# --------------------------------------------------------------------------------------
+#  PARSE RESUME FUNCTION
+# --------------------------------------------------------------------------------------
+async def parse_resume(file, user_id: Optional[str] = None):
+    logging.info(f"Starting resume parsing using Groq model: {GROQ_MODEL}")
+
+    # Spool the upload to disk (hashing on the way) instead of reading it all into memory
+    try:
+        pdf_path, file_digest, file_size = await spool_upload(file)
+        logging.debug(f"Spooled upload: {file_size} bytes")
+    except UploadTooLarge as e:
+        return {"error": str(e)}
+    except Exception as e:
+        logging.error(f"Failed to read PDF: {e}")
+        return {"error": f"Failed to read PDF: {e}"}
+
+    try:
+        return await parse_resume_path(pdf_path, file_digest, user_id=user_id)
+    finally:
+        remove_file(pdf_path)
+
+
+async def parse_resume_path(pdf_path: str, file_digest: str, llm_slots: Optional[asyncio.Semaphore] = None,
+                            priority: int = PRIORITY_NORMAL, user_id: Optional[str] = None):
+    """
+    Parses a PDF already spooled to disk. `file_digest` is the sha256 of its bytes.
+    `llm_slots` lets batch callers cap how many of their items hit Groq at once;
+    `priority`/`user_id` place the Groq call in the rate limiter's queue.
+    """
+    # 1. Exact re-upload? Serve the stored parse without touching the PDF or Groq
+    bytes_key = ResumeParseCache.bytes_key(CACHE_NAMESPACE, file_digest)
+    cached = await resume_cache.aget(bytes_key)
+    if cached:
+        logging.info("⚡ Resume cache hit (file bytes)")
+        return cached
+
+    try:
+        text = await pdf_extractor.extract(pdf_path)
+        logging.debug(f"Extracted text length: {len(text)}")
+    except Exception as e:
+        logging.error(f"Failed to read PDF: {e}")
+        return {"error": f"Failed to read PDF: {e}"}
+
+    return await parse_resume_text(text, bytes_key, llm_slots, priority, user_id)
+
+
+async def parse_resume_text(text: str, bytes_key: Optional[str] = None, llm_slots: Optional[asyncio.Semaphore] = None,
+                            priority: int = PRIORITY_NORMAL, user_id: Optional[str] = None):
+    """
+    Structures already-extracted resume text (cache -> local pre-extraction -> Groq).
+    """
+    # 2. Same content in a different file (re-exported PDF, other metadata)?
+    text_key = ResumeParseCache.text_key(CACHE_NAMESPACE, text)
+    cached = await resume_cache.aget(text_key) or await resume_cache.lookup_db(text_key)
+    if cached:
+        logging.info("⚡ Resume cache hit (extracted text)")
+        if bytes_key:
+            await resume_cache.aput(bytes_key, cached)
+        return cached
+
+    # 3. Local fast path: contact fields + skills by regex, compacted text for the LLM
+    local = preprocess_resume(text, RESUME_MAX_INPUT_TOKENS)
+    local_fields = {**local["contact"], "skills": local["skills"]}
+    logging.info(f"Compacted resume text: ~{local['tokens_in']} -> ~{local['tokens_out']} tokens")
+
+    if not GROQ_API_KEY:
+        logging.critical("❌ GROQ_API_KEY environment variable is missing")
+        return {"error": "GROQ API Key missing. Set GROQ_API_KEY in .env", "partial": local_fields}
+
+    # 4. One prompt, or parallel per-section prompts for long resumes
+    if RESUME_CHUNKED_ENABLED and local["tokens_compacted"] >= RESUME_CHUNKED_MIN_TOKENS:
+        parsed_json = await _parse_chunked(local, local_fields, llm_slots, priority, user_id)
+    else:
+        parsed_json = await _parse_single(local, local_fields, llm_slots, priority, user_id)
+
+    # 5. Validate/normalize locally; re-ask only for what is still missing
+    if "error" not in parsed_json or "model_output_raw" in parsed_json or "recovered" in parsed_json:
+        parsed_json = await _complete_fields(parsed_json, local, local_fields, llm_slots, priority, user_id)
+
+    parsed_json["raw_text"] = text
+
+    if "error" not in parsed_json:
+        merge_local_fields(parsed_json, local_fields)
+        if RESUME_CACHE_DB_FALLBACK:
+            parsed_json["content_hash"] = text_key
+        if bytes_key:
+            await resume_cache.aput(bytes_key, parsed_json)
+        await resume_cache.aput(text_key, parsed_json)
+
+    return parsed_json
+
+
+async def _groq_json(messages: List[dict], max_tokens: int, llm_slots: Optional[asyncio.Semaphore],
+                     priority: int, user_id: Optional[str]) -> dict:
+    """One JSON-mode Groq call. Returns the parsed object, or a dict with an "error" key."""
+    # Call Groq API (shared pooled gateway)
     start_time = time.time()
 
     try:
-        async with httpx.AsyncClient(timeout=20.0) as client:
-            response = await client.post(GROQ_API_URL, headers=headers, json=payload)
-            response.raise_for_status()
-            data = response.json()
-            end_time = time.time()
+        async with llm_slots or nullcontext():
+            data = await llm_gateway.chat(
+                messages,
+                model=GROQ_MODEL,
+                temperature=0.0,
+                max_tokens=max_tokens,
+                response_format={"type": "json_object"},
+                timeout=20.0,
+                priority=priority,
+                user_id=user_id,
+            )
+        end_time = time.time()
+    except RateLimitTimeout as e:
+        logging.error(f"Groq quota not available: {e}")
+        return {"error": f"Groq rate limit: {e}"}
     except httpx.RequestError as e:
         logging.error(f"Groq API request error: {e}")
-        return {"error": f"Groq API request error: {e}", "raw_text": text}
+        return {"error": f"Groq API request error: {e}"}
     except httpx.HTTPStatusError as e:
         logging.error(f"Groq API returned error: {e}")
-        return {"error": f"Groq API error: {response.text}", "raw_text": text}
+        return {"error": f"Groq API error: {e.response.text}"}
 
     logging.info(f"Groq API call took: {end_time - start_time:.2f} sec")
 
-    # Parse JSON response
+    # Parse JSON response (repaired locally if it is slightly off)
+    content_text = ""
     try:
-        content_text = data["choices"][0]["message"]["content"].strip()
-        parsed_json = json.loads(content_text)
+        choice = data["choices"][0]
+        content_text = choice["message"]["content"].strip()
+        parsed_json = repair_json(content_text)
+        if not isinstance(parsed_json, dict):
+            raise JSONRepairError(f"expected a JSON object, got {type(parsed_json).__name__}")
 
         total_tokens = data.get("usage", {}).get("total_tokens")
         if total_tokens:
@@ -116,37 +239,148 @@ Extract into valid JSON:
 
     except Exception as e:
         logging.error(f"Failed to parse Groq output: {e}")
-        parsed_json = {
-            "error": f"Failed to parse json: {e}",
-            "model_output_raw": content_text
-        }
+        return {"error": f"Failed to parse json: {e}", "model_output_raw": content_text}
+
+    # Cut off at max_tokens: the field being written when it stopped is incomplete
+    if choice.get("finish_reason") == "length" and parsed_json:
+        dropped = list(parsed_json)[-1]
+        parsed_json.pop(dropped)
+        logging.warning(f"Groq output truncated, dropping incomplete field '{dropped}'")
 
-    parsed_json["raw_text"] = text
     return parsed_json
 
 
+def _section_messages(label: str, fields: List[str], text: str) -> List[dict]:
+    spec = json.dumps({field: RESUME_FIELD_TYPES[field] for field in fields})
+    return [
+        {"role": "system", "content": RESUME_SECTION_SYSTEM_PROMPT},
+        {"role": "user", "content": RESUME_SECTION_USER_TEMPLATE.format(label=label, text=text, fields=spec)},
+    ]
+
+
+async def _complete_fields(parsed_json: dict, local: dict, local_fields: dict, llm_slots: Optional[asyncio.Semaphore],
+                           priority: int, user_id: Optional[str]) -> dict:
+    """
+    Validates the LLM output against ResumeParsed (flattening objects into strings for the
+    TEXT[] columns) and asks again, once, for just the fields that are absent or unusable.
+    Email/phone the regexes already found are not re-asked (the local name and skills are
+    only guesses, used as a fallback afterwards). Unparseable output counts as all missing,
+    except for what a failed chunked parse still `recovered`.
+    """
+    failed = "error" in parsed_json
+    resume, missing = validate_fields(RESUME_ADAPTER, parsed_json.get("recovered", {}) if failed else parsed_json,
+                                      RESUME_LLM_FIELDS)
+    missing = [field for field in missing if not (field in ("email", "phone") and local_fields.get(field))]
+
+    if missing and RESUME_REASK_ENABLED:
+        logging.info(f"Re-asking Groq for missing fields: {', '.join(missing)}")
+        extra = await _groq_json(_section_messages("resume", missing, local["llm_text"]),
+                                 RESUME_REASK_MAX_TOKENS, llm_slots, priority, user_id)
+        if "error" not in extra:
+            combined = {**resume.model_dump(exclude={"raw_text"}), **{field: extra[field] for field in missing if field in extra}}
+            resume, missing = validate_fields(RESUME_ADAPTER, combined, RESUME_LLM_FIELDS)
+            failed = False
+
+    if failed:
+        parsed_json.pop("recovered", None)
+        return parsed_json
+    return resume.model_dump(exclude={"raw_text"})
+
+
+async def _parse_single(local: dict, local_fields: dict, llm_slots: Optional[asyncio.Semaphore],
+                        priority: int, user_id: Optional[str]) -> dict:
+    """The whole (budget-truncated) resume in one prompt."""
+    # Only what the regexes find exactly; the local name is a guess and only fills a gap afterwards
+    known = {k: v for k, v in local["contact"].items() if v and k in ("email", "phone")}
+    user_message = RESUME_USER_TEMPLATE.format(text=local["llm_text"], known=json.dumps(known))
+
+    messages = [
+        {"role": "system", "content": RESUME_SYSTEM_PROMPT},
+        {"role": "user", "content": user_message}
+    ]
+
+    parsed_json = await _groq_json(messages, 8000, llm_slots, priority, user_id)
+    if "error" in parsed_json:
+        parsed_json["partial"] = local_fields
+    return parsed_json
+
+
+async def _parse_chunked(local: dict, local_fields: dict, llm_slots: Optional[asyncio.Semaphore],
+                         priority: int, user_id: Optional[str]) -> dict:
+    """
+    Map-reduce: every section (long ones split further) is parsed by its own small call,
+    all concurrently, and the results are merged with de-duplication.
+    Falls back to the single prompt when the resume has no recognisable sections.
+    """
+    jobs = plan_chunks(local["sections"], RESUME_CHUNK_INPUT_TOKENS, RESUME_MAX_CHUNKS)
+    if len(jobs) < 2:
+        return await _parse_single(local, local_fields, llm_slots, priority, user_id)
+
+    def parse(job):
+        label, fields, text = job
+        return _groq_json(_section_messages(label, fields, text), RESUME_CHUNK_MAX_TOKENS, llm_slots, priority, user_id)
+
+    logging.info(f"Chunked resume parse: {len(jobs)} parts ({', '.join(label for label, _, _ in jobs)})")
+    start_time = time.time()
+    results = await asyncio.gather(*[parse(job) for job in jobs])
+    # One retry for the parts that failed; the others are kept as they are
+    retry = [index for index, result in enumerate(results) if "error" in result]
+    if retry:
+        logging.warning(f"Retrying resume sections: {', '.join(jobs[index][0] for index in retry)}")
+        for index, result in zip(retry, await asyncio.gather(*[parse(jobs[index]) for index in retry])):
+            results[index] = result
+    logging.info(f"Chunked resume parse took: {time.time() - start_time:.2f} sec")
+
+    # Keep only the fields each part was asked for
+    parts = [{field: result.get(field) for field in fields} for (_, fields, _), result in zip(jobs, results) if "error" not in result]
+    merged = merge_chunk_results(parts)
+
+    failed = [(label, fields, result["error"]) for (label, fields, _), result in zip(jobs, results) if "error" in result]
+    if failed:
+        # Fields of the failed parts are dropped (a field split across parts would be incomplete)
+        # and re-asked on their own by _complete_fields; the rest of the parse is kept
+        failed_fields = {field for _, fields, _ in failed for field in fields}
+        return {
+            "error": f"Failed to parse resume sections ({'; '.join(f'{label}: {error}' for label, _, error in failed)})",
+            "recovered": {field: value for field, value in merged.items() if field not in failed_fields},
+            "partial": merge_local_fields(merged, local_fields),
+        }
+    return merged
+
+
+def merge_local_fields(parsed: dict, local_fields: dict):
+    """
+    Regex hits win for email/phone (they are exact); name/skills only fill gaps the LLM left.
+    """
+    for field in ("email", "phone"):
+        if local_fields.get(field):
+            parsed[field] = local_fields[field]
+    for field in ("name", "skills"):
+        if not parsed.get(field) and local_fields.get(field):
+            parsed[field] = local_fields[field]
+    return parsed
+
+
 # --------------------------------------------------------------------------------------
 #  SAVE PARSED RESUME TO SUPABASE
 # --------------------------------------------------------------------------------------
-# Remove file_bytes if not needed
+def _resume_row(parsed: dict, user_id: str) -> dict:
+    # Normalized again here: cached parses from older prompts may still hold objects
+    resume, _ = validate_fields(RESUME_ADAPTER, parsed, ())
+    data = {"user_id": user_id, **resume.model_dump()}
+    if parsed.get("content_hash"):
+        data["content_hash"] = parsed["content_hash"]
+    return data
+
+
 async def save_resume_to_db(parsed: dict, user_id: str):
 
     try:
-        data = {
-      "user_id": user_id,
-        "name": parsed.get("name"),
-        "email": parsed.get("email"),
-        "phone": parsed.get("phone"),
-        "skills": parsed.get("skills") or [],
-        "education": parsed.get("education") or [],
-        "experience": parsed.get("experience") or [],
-        "projects": parsed.get("projects") or [],
-        "raw_text": parsed.get("raw_text")
-        }
+        data = _resume_row(parsed, user_id)
 
-        result = supabase.table("resume_data").insert(data).execute()
-        if result.data and len(result.data) > 0:
-            saved_record = result.data[0]
+        rows = await crud.insert(RESUME_DATA_TABLE, data)
+        if rows:
+            saved_record = rows[0]
             resume_id = saved_record.get('id') 
             # print(f"✅ Resume saved successfully. ID: {resume_id}")
             
@@ -159,3 +393,25 @@ async def save_resume_to_db(parsed: dict, user_id: str):
     except Exception as e:
         print(f"❌ Failed saving resume: {e}")
         return {"error": str(e)}
+
+
+async def save_resumes_to_db(parsed_list: List[dict], user_id: str):
+    """
+    Multi-row insert: one Supabase round-trip for the whole batch.
+    Returns the saved records in input order, or {"error": ...} for the batch.
+    """
+    if not parsed_list:
+        return []
+
+    try:
+        rows = [_resume_row(parsed, user_id) for parsed in parsed_list]
+
+        saved = await crud.insert(RESUME_DATA_TABLE, rows)
+        if len(saved) != len(rows):
+            raise Exception("Batch insert returned an unexpected number of rows from Supabase.")
+
+        return saved
+
+    except Exception as e:
+        print(f"❌ Failed saving resume batch: {e}")
+        return {"error": str(e)}
@@ -0,0 +1,244 @@
+# app/services/session_registry.py
+#
+# Which worker process owns which interview, and a mailbox to reach that worker.
+#
+# Under gunicorn each worker has its own ConnectionManager, so a REST call (or a reconnect)
+# can land on a process that does not hold the interview's websocket/peer connection.
+# The registry records owner affinity and routes small control messages to the owner.
+
+import os
+import json
+import time
+import socket
+import sqlite3
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+logger = logging.getLogger("session_registry")
+
+SESSION_REGISTRY_BACKEND = os.getenv("SESSION_REGISTRY_BACKEND", "memory")
+SESSION_REGISTRY_PATH = os.getenv("SESSION_REGISTRY_PATH", "/tmp/interviewer_sessions.sqlite3")
+SESSION_REGISTRY_POLL_INTERVAL = float(os.getenv("SESSION_REGISTRY_POLL_INTERVAL", "0.1"))
+# An owner that has not refreshed its claims for this long is treated as gone
+SESSION_REGISTRY_LEASE = float(os.getenv("SESSION_REGISTRY_LEASE", "60"))
+
+
+def current_worker_id() -> str:
+    # Computed per call, not at import: gunicorn --preload forks workers after importing the app
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+# (interview_id, message)
+ControlMessage = Tuple[str, dict]
+
+
+class SessionRegistry(ABC):
+    """
+    Backend interface. Every method is scoped to the calling worker (`worker_id`).
+    """
+
+    def __init__(self, worker_id: Optional[str] = None):
+        self.worker_id = worker_id or current_worker_id()
+
+    @abstractmethod
+    async def claim(self, interview_id: str):
+        """Marks this worker as the owner (a newer claim always wins)."""
+        ...
+
+    @abstractmethod
+    async def release(self, interview_id: str):
+        """Drops the claim, but only if this worker still owns it."""
+        ...
+
+    @abstractmethod
+    async def owner(self, interview_id: str) -> Optional[str]:
+        ...
+
+    @abstractmethod
+    async def heartbeat(self, interview_ids: List[str]):
+        """Refreshes the lease on interviews this worker still holds."""
+        ...
+
+    @abstractmethod
+    async def send(self, interview_id: str, message: dict) -> bool:
+        """Queues a control message for the interview's owner. False if nobody owns it."""
+        ...
+
+    @abstractmethod
+    def receive(self) -> AsyncIterator[ControlMessage]:
+        """Yields control messages addressed to this worker, forever."""
+        ...
+
+    async def close(self):
+        pass
+
+
+class InMemorySessionRegistry(SessionRegistry):
+    """
+    Single-process backend (the default): ownership is implicit and messages never leave the process.
+    """
+
+    def __init__(self, worker_id: Optional[str] = None):
+        super().__init__(worker_id)
+        self._owners: Dict[str, str] = {}
+        self._inbox: asyncio.Queue = asyncio.Queue()
+
+    async def claim(self, interview_id: str):
+        self._owners[interview_id] = self.worker_id
+
+    async def release(self, interview_id: str):
+        if self._owners.get(interview_id) == self.worker_id:
+            del self._owners[interview_id]
+
+    async def owner(self, interview_id: str) -> Optional[str]:
+        return self._owners.get(interview_id)
+
+    async def heartbeat(self, interview_ids: List[str]):
+        pass
+
+    async def send(self, interview_id: str, message: dict) -> bool:
+        if interview_id not in self._owners:
+            return False
+        await self._inbox.put((interview_id, message))
+        return True
+
+    async def receive(self) -> AsyncIterator[ControlMessage]:
+        while True:
+            yield await self._inbox.get()
+
+
+class SQLiteSessionRegistry(SessionRegistry):
+    """
+    Shared-file backend for several workers on one box (and for tests).
+    Each call opens a short-lived connection, so it is safe across processes;
+    SQLite's own locking serialises writers.
+    """
+
+    def __init__(self, path: str = SESSION_REGISTRY_PATH, worker_id: Optional[str] = None):
+        super().__init__(worker_id)
+        self.path = path
+        self._run(self._init_schema)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def _run(self, fn, *args):
+        conn = self._connect()
+        try:
+            return fn(conn, *args)
+        finally:
+            conn.close()
+
+    async def _arun(self, fn, *args):
+        return await asyncio.to_thread(self._run, fn, *args)
+
+    @staticmethod
+    def _init_schema(conn: sqlite3.Connection):
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS session_owners (
+                interview_id TEXT PRIMARY KEY,
+                worker_id TEXT NOT NULL,
+                updated_at REAL NOT NULL
+            )
+        """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS control_messages (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                worker_id TEXT NOT NULL,
+                interview_id TEXT NOT NULL,
+                payload TEXT NOT NULL
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_control_worker ON control_messages(worker_id, id)")
+
+    async def claim(self, interview_id: str):
+        def _claim(conn):
+            conn.execute(
+                "INSERT OR REPLACE INTO session_owners (interview_id, worker_id, updated_at) VALUES (?, ?, ?)",
+                (interview_id, self.worker_id, time.time())
+            )
+        await self._arun(_claim)
+
+    async def release(self, interview_id: str):
+        def _release(conn):
+            conn.execute(
+                "DELETE FROM session_owners WHERE interview_id = ? AND worker_id = ?",
+                (interview_id, self.worker_id)
+            )
+        await self._arun(_release)
+
+    async def owner(self, interview_id: str) -> Optional[str]:
+        def _owner(conn):
+            return conn.execute(
+                "SELECT worker_id FROM session_owners WHERE interview_id = ? AND updated_at > ?",
+                (interview_id, time.time() - SESSION_REGISTRY_LEASE)
+            ).fetchone()
+        row = await self._arun(_owner)
+        return row[0] if row else None
+
+    async def heartbeat(self, interview_ids: List[str]):
+        def _heartbeat(conn):
+            now = time.time()
+            conn.executemany(
+                "UPDATE session_owners SET updated_at = ? WHERE interview_id = ? AND worker_id = ?",
+                [(now, interview_id, self.worker_id) for interview_id in interview_ids]
+            )
+            # Housekeeping: forget owners whose worker stopped refreshing
+            conn.execute("DELETE FROM session_owners WHERE updated_at < ?", (now - SESSION_REGISTRY_LEASE,))
+        if interview_ids:
+            await self._arun(_heartbeat)
+
+    async def send(self, interview_id: str, message: dict) -> bool:
+        owner = await self.owner(interview_id)
+        if owner is None:
+            return False
+
+        def _send(conn):
+            conn.execute(
+                "INSERT INTO control_messages (worker_id, interview_id, payload) VALUES (?, ?, ?)",
+                (owner, interview_id, json.dumps(message))
+            )
+        await self._arun(_send)
+        return True
+
+    async def receive(self) -> AsyncIterator[ControlMessage]:
+        def _drain(conn):
+            conn.execute("BEGIN IMMEDIATE")
+            rows = conn.execute(
+                "SELECT id, interview_id, payload FROM control_messages WHERE worker_id = ? ORDER BY id",
+                (self.worker_id,)
+            ).fetchall()
+            if rows:
+                conn.execute("DELETE FROM control_messages WHERE worker_id = ? AND id <= ?", (self.worker_id, rows[-1][0]))
+            conn.execute("COMMIT")
+            return rows
+
+        while True:
+            try:
+                rows = await self._arun(_drain)
+            except sqlite3.Error as e:
+                logger.warning(f"⚠️ Control message poll failed: {e}")
+                rows = []
+
+            for _, interview_id, payload in rows:
+                yield interview_id, json.loads(payload)
+
+            if not rows:
+                await asyncio.sleep(SESSION_REGISTRY_POLL_INTERVAL)
+
+    async def close(self):
+        def _release_all(conn):
+            conn.execute("DELETE FROM session_owners WHERE worker_id = ?", (self.worker_id,))
+        await self._arun(_release_all)
+
+
+def create_session_registry(backend: str = SESSION_REGISTRY_BACKEND) -> SessionRegistry:
+    if backend == "sqlite":
+        return SQLiteSessionRegistry()
+    if backend == "memory":
+        return InMemorySessionRegistry()
+    raise ValueError(f"Unknown SESSION_REGISTRY_BACKEND '{backend}' (expected 'memory' or 'sqlite')")
@@ -0,0 +1,293 @@
+# app/services/transcript_store.py
+#
+# Append-only interview transcripts, kept off the turn path:
+#
+#   append():  entry goes into the session's in-memory log and one JSON line into its local
+#              write-ahead file (no network)
+#   flush:     a background loop upserts pending entries from every due log in one batch,
+#              once a log has TRANSCRIPT_FLUSH_ENTRIES pending or its oldest is
+#              TRANSCRIPT_FLUSH_INTERVAL old, then checkpoints each WAL
+#   close:     the ConnectionManager closes a log when its session ends; it is flushed right
+#              away and its WAL deleted once everything is in Supabase
+#
+# Interim ASR hypotheses are logged too, but one that is superseded (by a newer hypothesis
+# or the final) is collapsed away: in memory right away, and in Supabase if it happens
+# before the next flush, so Supabase mostly sees finals.
+# WAL files left behind by a crashed worker are replayed on startup (recover()); entry ids
+# are unique, so replaying something that was already flushed is harmless.
+
+import os
+import json
+import time
+import uuid
+import asyncio
+import logging
+from typing import Dict, List, Optional
+
+from app.db import crud
+from app.db.models import TRANSCRIPTS_TABLE, TRANSCRIPT_COLUMNS
+
+logger = logging.getLogger("transcripts")
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
+
+TRANSCRIPT_WAL_DIR = os.getenv("TRANSCRIPT_WAL_DIR", os.path.join(BACKEND_DIR, ".cache", "transcripts"))
+TRANSCRIPT_FLUSH_ENTRIES = int(os.getenv("TRANSCRIPT_FLUSH_ENTRIES", "20"))
+TRANSCRIPT_FLUSH_INTERVAL = float(os.getenv("TRANSCRIPT_FLUSH_INTERVAL", "5"))
+TRANSCRIPT_MAX_BATCH = int(os.getenv("TRANSCRIPT_MAX_BATCH", "500"))
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _seq(entry: dict) -> int:
+    return int(entry["id"].rsplit(".", 1)[1])
+
+
+def _collapse(pending: List[dict], entry: dict):
+    """Appends `entry`, dropping a trailing interim hypothesis from the same speaker that it supersedes."""
+    if pending and not pending[-1]["final"] and pending[-1]["role"] == entry["role"]:
+        pending.pop()
+    pending.append(entry)
+
+
+class TranscriptLog:
+    """One session's transcript: every entry in memory, plus the ones not yet in Supabase."""
+
+    def __init__(self, interview_id: str, wal_dir: str = TRANSCRIPT_WAL_DIR):
+        self.interview_id = interview_id
+        self.log_id = uuid.uuid4().hex[:12]
+        self.entries: List[dict] = []
+        self.pending: List[dict] = []
+        self.closed = False
+        self._seq = 0
+        # pid in the name: recovery must not touch a live worker's file
+        self.wal_path = os.path.join(wal_dir, f"{interview_id}.{os.getpid()}.{self.log_id}.jsonl")
+        self._wal = None
+        self._wal_dir = wal_dir
+
+    @property
+    def oldest_pending_age(self) -> float:
+        return time.time() - self.pending[0]["at"] if self.pending else 0.0
+
+    def append(self, role: str, text: str, final: bool = True, interrupted: bool = False) -> Optional[dict]:
+        if self.closed or not text:
+            return None
+        self._seq += 1
+        entry = {
+            "id": f"{self.log_id}.{self._seq}",
+            "interview_id": self.interview_id,
+            "role": role,
+            "text": text,
+            "final": final,
+            "interrupted": interrupted,
+            "at": time.time(),
+        }
+        # Superseded interims are dropped from both, or entries grows at the ASR's interim rate
+        _collapse(self.entries, entry)
+        _collapse(self.pending, entry)
+        self._write({"entry": entry})
+        return entry
+
+    def take_pending(self) -> List[dict]:
+        batch, self.pending = self.pending, []
+        return batch
+
+    def restore_pending(self, batch: List[dict]):
+        """A flush failed: put its entries back in front of anything appended meanwhile."""
+        self.pending[:0] = batch
+
+    def checkpoint(self, batch: List[dict]):
+        if batch:
+            self._write({"flushed": batch[-1]["id"]})
+
+    def _write(self, record: dict):
+        try:
+            if self._wal is None:
+                os.makedirs(self._wal_dir, exist_ok=True)
+                self._wal = open(self.wal_path, "a", encoding="utf-8")
+            self._wal.write(json.dumps(record) + "\n")
+            # Into the OS page cache: survives a worker crash without an fsync per utterance
+            self._wal.flush()
+        except OSError as e:
+            logger.warning(f"⚠️ Transcript WAL write failed for {self.interview_id}: {e}")
+
+    def discard_wal(self):
+        if self._wal is not None:
+            self._wal.close()
+            self._wal = None
+        try:
+            os.remove(self.wal_path)
+        except FileNotFoundError:
+            pass
+
+
+class TranscriptStore:
+
+    def __init__(self, flush_entries: int = TRANSCRIPT_FLUSH_ENTRIES, flush_interval: float = TRANSCRIPT_FLUSH_INTERVAL,
+                 wal_dir: str = TRANSCRIPT_WAL_DIR):
+        self.flush_entries = flush_entries
+        self.flush_interval = flush_interval
+        self.wal_dir = wal_dir
+        self._logs: Dict[str, TranscriptLog] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._flush_lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+
+    def open(self, interview_id: str) -> TranscriptLog:
+        log = TranscriptLog(interview_id, self.wal_dir)
+        self._logs[log.log_id] = log
+        return log
+
+    def append(self, log: TranscriptLog, role: str, text: str, final: bool = True, interrupted: bool = False):
+        if log.append(role, text, final, interrupted) and len(log.pending) >= self.flush_entries:
+            self._wakeup.set()
+
+    def live_log(self, interview_id: str) -> Optional[TranscriptLog]:
+        for log in self._logs.values():
+            if log.interview_id == interview_id and not log.closed:
+                return log
+        return None
+
+    async def close(self, log: TranscriptLog):
+        """Session over: flush what is left now and forget the log (its WAL stays if the flush fails)."""
+        log.closed = True
+        # Closed logs are always due; other sessions' entries ride along only if due anyway
+        await self.flush()
+
+    # ----------------------------------------------------------------------------------
+    #  FLUSH
+    # ----------------------------------------------------------------------------------
+    def _due(self, log: TranscriptLog, force: bool) -> bool:
+        if not log.pending:
+            return False
+        return force or log.closed or len(log.pending) >= self.flush_entries or log.oldest_pending_age >= self.flush_interval
+
+    async def flush(self, force: bool = False):
+        async with self._flush_lock:
+            batches = [(log, log.take_pending()) for log in list(self._logs.values()) if self._due(log, force)]
+            rows = [entry for _, batch in batches for entry in batch]
+            try:
+                for start in range(0, len(rows), TRANSCRIPT_MAX_BATCH):
+                    await crud.upsert(TRANSCRIPTS_TABLE, rows[start:start + TRANSCRIPT_MAX_BATCH], on_conflict="id", ignore_duplicates=True)
+            except Exception as e:
+                logger.error(f"❌ Transcript flush failed ({len(rows)} entries): {e}")
+                for log, batch in batches:
+                    log.restore_pending(batch)
+            else:
+                for log, batch in batches:
+                    log.checkpoint(batch)
+
+            for log_id, log in list(self._logs.items()):
+                if log.closed and not log.pending:
+                    log.discard_wal()
+                    del self._logs[log_id]
+
+    @property
+    def pending(self) -> int:
+        return sum(len(log.pending) for log in self._logs.values())
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            if self.pending:
+                await asyncio.shield(self.flush())
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for log in self._logs.values():
+            log.closed = True
+        # Closed logs are always due; other sessions' entries ride along only if due anyway
+        await self.flush()
+        if self.pending:
+            logger.error(f"❌ {self.pending} transcript entries not flushed on shutdown (kept in {self.wal_dir})")
+
+    # ----------------------------------------------------------------------------------
+    #  RECOVERY
+    # ----------------------------------------------------------------------------------
+    async def recover(self):
+        """Replays WAL files left by workers that died before flushing them."""
+        try:
+            names = os.listdir(self.wal_dir)
+        except FileNotFoundError:
+            return
+
+        own = {os.path.basename(log.wal_path) for log in self._logs.values()}
+        for name in names:
+            parts = name.split(".")
+            if len(parts) != 4 or parts[-1] != "jsonl" or not parts[1].isdigit() or name in own:
+                continue
+            # Same pid but not one of ours: left by an earlier process (e.g. a restarted container)
+            if int(parts[1]) != os.getpid() and _pid_alive(int(parts[1])):
+                continue
+            path = os.path.join(self.wal_dir, name)
+            rows = await asyncio.to_thread(self._read_unflushed, path)
+            try:
+                if rows:
+                    await crud.upsert(TRANSCRIPTS_TABLE, rows, on_conflict="id", ignore_duplicates=True)
+                os.remove(path)
+                logger.info(f"♻️ Recovered {len(rows)} transcript entries from {name}")
+            except Exception as e:
+                logger.error(f"❌ Transcript recovery failed for {name}: {e}")
+
+    @staticmethod
+    def _read_unflushed(path: str) -> List[dict]:
+        pending: List[dict] = []
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # Torn last line from the crash
+                    continue
+                if "entry" in record:
+                    _collapse(pending, record["entry"])
+                elif "flushed" in record:
+                    # Only what the checkpointed batch covered; entries appended while it was being written stay
+                    flushed = _seq({"id": record["flushed"]})
+                    pending = [entry for entry in pending if _seq(entry) > flushed]
+        return pending
+
+    # ----------------------------------------------------------------------------------
+    #  READ
+    # ----------------------------------------------------------------------------------
+    async def read(self, interview_id: str, include_partials: bool = False, since: Optional[float] = None) -> List[dict]:
+        """
+        The interview's transcript in order: what Supabase has, plus entries this worker
+        is still holding for a live session.
+        """
+        rows = await crud.select(TRANSCRIPTS_TABLE, TRANSCRIPT_COLUMNS, {"interview_id": interview_id}, order="at")
+        seen = {row["id"] for row in rows}
+        log = self.live_log(interview_id)
+        if log is not None:
+            rows += [entry for entry in log.entries if entry["id"] not in seen]
+        rows.sort(key=lambda row: row["at"])
+        return [
+            {key: row[key] for key in ("id", "role", "text", "final", "interrupted", "at")}
+            for row in rows
+            if (include_partials or row.get("final", True)) and (since is None or row["at"] > since)
+        ]
+
+
+transcript_store = TranscriptStore()
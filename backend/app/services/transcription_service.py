@@ -0,0 +1,199 @@
+# app/services/transcription_service.py
+
+import os
+import wave
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from typing import Awaitable, Callable, Optional
+
+import numpy as np
+
+logger = logging.getLogger("transcription")
+
+TRANSCRIBER_BACKEND = os.getenv("TRANSCRIBER_BACKEND", "deepgram" if os.getenv("DEEPGRAM_API_KEY") else "echo")
+DEEPGRAM_MODEL = os.getenv("DEEPGRAM_MODEL", "nova-3")
+TRANSCRIPT_FILE_DIR = os.getenv("TRANSCRIPT_FILE_DIR", "/tmp/interview_audio")
+
+# Every backend receives mono PCM16 at this rate
+TRANSCRIBER_SAMPLE_RATE = 16000
+
+# on_transcript(text, is_final)
+TranscriptCallback = Callable[[str, bool], Awaitable[None]]
+
+
+class Transcriber(ABC):
+    """
+    Streaming speech-to-text backend.
+    `send` takes a mono int16 NumPy array at TRANSCRIBER_SAMPLE_RATE; the array is only valid
+    for the duration of the call (the pipeline reuses its buffers), so copy it if you keep it.
+    """
+
+    def __init__(self, interview_id: str, on_transcript: TranscriptCallback):
+        self.interview_id = interview_id
+        self.on_transcript = on_transcript
+
+    async def start(self):
+        pass
+
+    @abstractmethod
+    async def send(self, pcm: np.ndarray):
+        ...
+
+    async def flush(self):
+        """Called at the end of a candidate utterance; finalize whatever is pending."""
+        pass
+
+    async def keep_alive(self):
+        """Called when no audio has been sent for a while (silence is gated out by the VAD)."""
+        pass
+
+    async def close(self):
+        """Must be safe to call on a broken connection; `start` may be called again afterwards."""
+        pass
+
+
+class EchoTranscriber(Transcriber):
+    """
+    Local stand-in: reports how much audio it heard instead of words.
+    Emits a partial every second of audio and a final on flush/close.
+    """
+
+    def __init__(self, interview_id: str, on_transcript: TranscriptCallback):
+        super().__init__(interview_id, on_transcript)
+        self._samples = 0
+        self._reported_seconds = 0
+
+    async def send(self, pcm: np.ndarray):
+        self._samples += len(pcm)
+        seconds = self._samples // TRANSCRIBER_SAMPLE_RATE
+        if seconds > self._reported_seconds:
+            self._reported_seconds = seconds
+            await self.on_transcript(f"[heard {seconds}s of audio]", False)
+
+    async def flush(self):
+        if self._samples:
+            duration = self._samples / TRANSCRIBER_SAMPLE_RATE
+            self._samples = 0
+            self._reported_seconds = 0
+            await self.on_transcript(f"[heard {duration:.1f}s of audio]", True)
+
+    async def close(self):
+        await self.flush()
+
+
+class FileTranscriber(Transcriber):
+    """
+    Local stand-in: records the exact audio the transcriber would receive to a WAV file
+    (one per interview) so it can be inspected or replayed offline. Emits no text.
+    """
+
+    def __init__(self, interview_id: str, on_transcript: TranscriptCallback):
+        super().__init__(interview_id, on_transcript)
+        self.path = os.path.join(TRANSCRIPT_FILE_DIR, f"{interview_id}.wav")
+        self._wav: Optional[wave.Wave_write] = None
+
+    async def start(self):
+        os.makedirs(TRANSCRIPT_FILE_DIR, exist_ok=True)
+        self._wav = wave.open(self.path, "wb")
+        self._wav.setnchannels(1)
+        self._wav.setsampwidth(2)
+        self._wav.setframerate(TRANSCRIBER_SAMPLE_RATE)
+
+    async def send(self, pcm: np.ndarray):
+        if self._wav:
+            self._wav.writeframes(pcm.tobytes())
+
+    async def close(self):
+        if self._wav:
+            self._wav.close()
+            self._wav = None
+            logger.info(f"💾 Audio for {self.interview_id} written to {self.path}")
+
+
+class DeepgramTranscriber(Transcriber):
+    """
+    Deepgram live streaming (linear16 @ 16 kHz) with interim results.
+    """
+
+    def __init__(self, interview_id: str, on_transcript: TranscriptCallback):
+        super().__init__(interview_id, on_transcript)
+        self.api_key = os.getenv("DEEPGRAM_API_KEY")
+        self._connection = None
+        self._socket = None
+        self._reader: Optional[asyncio.Task] = None
+
+    async def start(self):
+        from deepgram import AsyncDeepgramClient
+
+        client = AsyncDeepgramClient(api_key=self.api_key)
+        self._connection = client.listen.v1.connect(
+            model=DEEPGRAM_MODEL,
+            encoding="linear16",
+            sample_rate=TRANSCRIBER_SAMPLE_RATE,
+            channels=1,
+            interim_results="true",
+            punctuate="true",
+            smart_format="true",
+        )
+        self._socket = await self._connection.__aenter__()
+        self._reader = asyncio.create_task(self._read())
+        logger.info(f"🎙️ Deepgram stream opened for {self.interview_id}")
+
+    async def _read(self):
+        try:
+            async for message in self._socket:
+                if getattr(message, "type", None) != "Results":
+                    continue
+                alternatives = message.channel.alternatives
+                text = alternatives[0].transcript if alternatives else ""
+                if text:
+                    await self.on_transcript(text, bool(message.is_final))
+        except Exception as e:
+            logger.error(f"❌ Deepgram stream error for {self.interview_id}: {e}")
+
+    async def send(self, pcm: np.ndarray):
+        if self._socket:
+            await self._socket.send_media(pcm.tobytes())
+
+    async def flush(self):
+        if self._socket:
+            await self._socket.send_finalize()
+
+    async def keep_alive(self):
+        # Deepgram closes a stream that gets no audio for ~10 s
+        if self._socket:
+            await self._socket.send_keep_alive()
+
+    async def close(self):
+        if not self._socket:
+            return
+        try:
+            await self._socket.send_close_stream()
+            if self._reader:
+                await asyncio.wait_for(self._reader, timeout=3)
+        except Exception as e:
+            logger.warning(f"⚠️ Deepgram close for {self.interview_id}: {e}")
+        finally:
+            if self._reader and not self._reader.done():
+                self._reader.cancel()
+            self._reader = None
+            self._socket = None
+            try:
+                await self._connection.__aexit__(None, None, None)
+            except Exception as e:
+                logger.warning(f"⚠️ Deepgram disconnect for {self.interview_id}: {e}")
+
+
+TRANSCRIBERS = {
+    "deepgram": DeepgramTranscriber,
+    "echo": EchoTranscriber,
+    "file": FileTranscriber,
+}
+
+
+def create_transcriber(interview_id: str, on_transcript: TranscriptCallback, backend: str = TRANSCRIBER_BACKEND) -> Transcriber:
+    try:
+        return TRANSCRIBERS[backend](interview_id, on_transcript)
+    except KeyError:
+        raise ValueError(f"Unknown TRANSCRIBER_BACKEND '{backend}' (expected one of {', '.join(TRANSCRIBERS)})")
@@ -0,0 +1,131 @@
+# app/services/tts_service.py
+
+import os
+import zlib
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from typing import AsyncIterator, Optional
+
+import httpx
+import numpy as np
+
+logger = logging.getLogger("tts")
+
+# No real voice configured means no TTS; the synthetic tone generator is for local testing and must be chosen explicitly
+TTS_BACKEND = os.getenv("TTS_BACKEND", "deepgram" if os.getenv("DEEPGRAM_API_KEY") else "")
+DEEPGRAM_TTS_MODEL = os.getenv("DEEPGRAM_TTS_MODEL", "aura-2-thalia-en")
+DEEPGRAM_SPEAK_URL = os.getenv("DEEPGRAM_SPEAK_URL", "https://api.deepgram.com/v1/speak")
+
+# Synthetic backend: delay before the first chunk, speaking rate, and synthesis time per second of audio
+SYNTHETIC_TTS_LATENCY = float(os.getenv("SYNTHETIC_TTS_LATENCY", "0.05"))
+SYNTHETIC_TTS_WORDS_PER_SECOND = float(os.getenv("SYNTHETIC_TTS_WORDS_PER_SECOND", "3"))
+SYNTHETIC_TTS_RTF = float(os.getenv("SYNTHETIC_TTS_RTF", "0.05"))
+
+# Every backend produces mono PCM16 at this rate (Opus's native rate, so the track never resamples)
+TTS_SAMPLE_RATE = 48000
+
+
+class TTSBackend(ABC):
+    """
+    Text-to-speech backend. `synthesize` turns one sentence into mono int16 NumPy chunks at
+    TTS_SAMPLE_RATE, yielded as soon as they are ready. Closing the generator early (barge-in)
+    must stop the synthesis.
+    """
+
+    def __init__(self, interview_id: str):
+        self.interview_id = interview_id
+
+    @abstractmethod
+    def synthesize(self, text: str) -> AsyncIterator[np.ndarray]:
+        ...
+
+    async def close(self):
+        pass
+
+
+class SyntheticTTS(TTSBackend):
+    """
+    Local stand-in: one short tone per word (pitch varies by word) followed by a gap, produced
+    faster than real time after a small first-chunk delay. Enough to exercise pacing,
+    pipelining and barge-in without a provider.
+    """
+
+    def __init__(self, interview_id: str):
+        super().__init__(interview_id)
+        samples = int(TTS_SAMPLE_RATE / SYNTHETIC_TTS_WORDS_PER_SECOND)
+        voiced = int(samples * 0.8)
+        self._t = np.arange(voiced, dtype=np.float32) / TTS_SAMPLE_RATE
+        # Short fade in/out so word boundaries don't click
+        fade = min(480, voiced // 2)
+        self._envelope = np.ones(voiced, dtype=np.float32)
+        self._envelope[:fade] = np.linspace(0, 1, fade, dtype=np.float32)
+        self._envelope[-fade:] = np.linspace(1, 0, fade, dtype=np.float32)
+        self._word_samples = samples
+
+    async def synthesize(self, text: str) -> AsyncIterator[np.ndarray]:
+        await asyncio.sleep(SYNTHETIC_TTS_LATENCY)
+        for word in text.split():
+            pitch = 140 + zlib.crc32(word.lower().encode()) % 120
+            pcm = np.zeros(self._word_samples, dtype=np.int16)
+            tone = np.sin(2 * np.pi * pitch * self._t) * self._envelope * 0.2 * 32767
+            pcm[:len(tone)] = tone.astype(np.int16)
+            yield pcm
+            await asyncio.sleep(self._word_samples / TTS_SAMPLE_RATE * SYNTHETIC_TTS_RTF)
+
+
+class DeepgramTTS(TTSBackend):
+    """
+    Deepgram Aura over the streaming REST endpoint (raw linear16 @ 48 kHz, no container),
+    so audio starts arriving before the whole sentence is synthesized.
+    """
+
+    def __init__(self, interview_id: str):
+        super().__init__(interview_id)
+        self.api_key = os.getenv("DEEPGRAM_API_KEY")
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(timeout=httpx.Timeout(10.0, connect=5.0))
+        return self._client
+
+    async def synthesize(self, text: str) -> AsyncIterator[np.ndarray]:
+        params = {
+            "model": DEEPGRAM_TTS_MODEL,
+            "encoding": "linear16",
+            "sample_rate": TTS_SAMPLE_RATE,
+            "container": "none",
+        }
+        headers = {"Authorization": f"Token {self.api_key}", "Content-Type": "application/json"}
+        leftover = b""
+        async with self.client.stream("POST", DEEPGRAM_SPEAK_URL, params=params, headers=headers, json={"text": text}) as response:
+            response.raise_for_status()
+            async for data in response.aiter_bytes():
+                data = leftover + data
+                # Chunks can split a sample in half; carry the odd byte over
+                usable = len(data) - len(data) % 2
+                leftover = data[usable:]
+                if usable:
+                    yield np.frombuffer(data[:usable], dtype=np.int16)
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+TTS_BACKENDS = {
+    "deepgram": DeepgramTTS,
+    "synthetic": SyntheticTTS,
+}
+
+
+def create_tts(interview_id: str, backend: str = TTS_BACKEND) -> TTSBackend:
+    if not backend:
+        raise ValueError("No TTS backend configured (set DEEPGRAM_API_KEY, or TTS_BACKEND=synthetic for local testing)")
+    try:
+        return TTS_BACKENDS[backend](interview_id)
+    except KeyError:
+        raise ValueError(f"Unknown TTS_BACKEND '{backend}' (expected one of {', '.join(TTS_BACKENDS)})")
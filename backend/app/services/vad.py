@@ -0,0 +1,134 @@
+# app/services/vad.py
+#
+# Energy + zero-crossing voice activity detection with an adaptive noise floor,
+# evaluated on whole chunks at once (one row per 20 ms frame) rather than sample by sample.
+
+import os
+from typing import List, Tuple
+
+import numpy as np
+
+VAD_FRAME_MS = int(os.getenv("VAD_FRAME_MS", "20"))
+VAD_ENERGY_RATIO = float(os.getenv("VAD_ENERGY_RATIO", "3.0"))       # speech = energy > floor * ratio
+VAD_MIN_ENERGY = float(os.getenv("VAD_MIN_ENERGY", "1e-5"))          # absolute floor (mean square, [-1, 1) scale)
+VAD_MAX_ZCR = float(os.getenv("VAD_MAX_ZCR", "0.45"))                # hiss/static crosses zero far more than speech
+VAD_MIN_SPEECH_MS = int(os.getenv("VAD_MIN_SPEECH_MS", "60"))        # ignore clicks shorter than this
+VAD_HANGOVER_MS = int(os.getenv("VAD_HANGOVER_MS", "300"))           # keep the gate open across short pauses
+VAD_END_OF_TURN_MS = int(os.getenv("VAD_END_OF_TURN_MS", "700"))     # silence that ends the candidate's turn
+VAD_FLOOR_ADAPT = float(os.getenv("VAD_FLOOR_ADAPT", "0.05"))
+VAD_PRE_ROLL_MS = int(os.getenv("VAD_PRE_ROLL_MS", "200"))          # gated-out audio sent ahead of a speech start
+
+SPEECH_START = "speech_start"
+END_OF_TURN = "end_of_turn"
+
+
+def frame_features(pcm: np.ndarray, frame_len: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Per-frame mean-square energy and zero-crossing rate for a mono int16 chunk.
+    Trailing samples that do not fill a frame are ignored.
+    """
+    n_frames = len(pcm) // frame_len
+    frames = pcm[:n_frames * frame_len].reshape(n_frames, frame_len).astype(np.float32) / 32768
+    energy = np.einsum("ij,ij->i", frames, frames) / frame_len
+    signs = np.signbit(frames)
+    zcr = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / (frame_len - 1)
+    return energy, zcr
+
+
+class VoiceActivityDetector:
+    """
+    Stateful per-stream detector.
+
+    `process(pcm)` returns (forward, events): whether the chunk should reach the transcriber
+    (speech, or within the hangover after it), and any SPEECH_START / END_OF_TURN events it triggered.
+    Onsets are detected a little late (quiet first syllables, VAD_MIN_SPEECH_MS), so the detector
+    keeps the last VAD_PRE_ROLL_MS of gated-out audio; `take_pre_roll()` returns it on SPEECH_START.
+    """
+
+    def __init__(self, sample_rate: int = 16000):
+        self.frame_len = sample_rate * VAD_FRAME_MS // 1000
+        self.min_speech_frames = max(1, VAD_MIN_SPEECH_MS // VAD_FRAME_MS)
+        self.hangover_frames = VAD_HANGOVER_MS // VAD_FRAME_MS
+        self.end_of_turn_frames = VAD_END_OF_TURN_MS // VAD_FRAME_MS
+        self.noise_floor = None
+        self.speaking = False
+        self._speech_run = 0
+        self._silence_run = 0
+        self._pending = np.zeros(0, dtype=np.int16)
+        self._pre_roll = np.zeros(sample_rate * VAD_PRE_ROLL_MS // 1000, dtype=np.int16)
+        self._pre_roll_len = 0
+
+    def reset(self):
+        self.speaking = False
+        self._speech_run = 0
+        self._silence_run = 0
+
+    def take_pre_roll(self) -> np.ndarray:
+        """The gated-out audio right before the current chunk (a copy; empties the buffer)."""
+        pre_roll = self._pre_roll[len(self._pre_roll) - self._pre_roll_len:].copy()
+        self._pre_roll_len = 0
+        return pre_roll
+
+    def _remember(self, pcm: np.ndarray):
+        capacity = len(self._pre_roll)
+        n = min(len(pcm), capacity)
+        if n == 0:
+            return
+        self._pre_roll[:capacity - n] = self._pre_roll[n:]
+        self._pre_roll[capacity - n:] = pcm[len(pcm) - n:]
+        self._pre_roll_len = min(capacity, self._pre_roll_len + n)
+
+    def process(self, pcm: np.ndarray) -> Tuple[bool, List[str]]:
+        forward, events = self._process(pcm)
+        if not forward:
+            self._remember(pcm)
+        elif SPEECH_START not in events:
+            # Already sent; only audio gated out after this counts as pre-roll
+            self._pre_roll_len = 0
+        return forward, events
+
+    def _process(self, pcm: np.ndarray) -> Tuple[bool, List[str]]:
+        if len(self._pending):
+            pcm = np.concatenate((self._pending, pcm))
+        usable = len(pcm) - len(pcm) % self.frame_len
+        self._pending = pcm[usable:].copy()
+        if usable == 0:
+            return self.speaking, []
+
+        energy, zcr = frame_features(pcm[:usable], self.frame_len)
+
+        if self.noise_floor is None:
+            # First chunk calibrates the floor (candidates rarely start talking within 100 ms)
+            self.noise_floor = max(float(np.median(energy)), VAD_MIN_ENERGY)
+
+        threshold = max(self.noise_floor * VAD_ENERGY_RATIO, VAD_MIN_ENERGY)
+        is_speech = (energy > threshold) & (zcr < VAD_MAX_ZCR)
+
+        # Adapt the floor only from frames judged to be background
+        background = energy[~is_speech]
+        if len(background):
+            self.noise_floor += VAD_FLOOR_ADAPT * (float(background.mean()) - self.noise_floor)
+            self.noise_floor = max(self.noise_floor, VAD_MIN_ENERGY)
+
+        events = []
+        forward = False
+        for speech in is_speech.tolist():
+            if speech:
+                self._speech_run += 1
+                self._silence_run = 0
+                if not self.speaking and self._speech_run >= self.min_speech_frames:
+                    self.speaking = True
+                    events.append(SPEECH_START)
+            else:
+                self._speech_run = 0
+                if self.speaking:
+                    self._silence_run += 1
+                    if self._silence_run >= self.end_of_turn_frames:
+                        self.speaking = False
+                        self._silence_run = 0
+                        events.append(END_OF_TURN)
+
+            if self.speaking and self._silence_run <= self.hangover_frames:
+                forward = True
+
+        return forward, events
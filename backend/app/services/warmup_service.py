@@ -0,0 +1,101 @@
+# app/services/warmup_service.py
+#
+# Speculative work done right after /create-session, while the candidate is still
+# loading the interview page: load the context, compile the system prompt, and
+# pre-generate the interviewer's opening question so the websocket can send it instantly.
+
+import os
+import asyncio
+import logging
+from typing import Dict, Optional
+
+from app.services.interview_flow_service import flow_service
+from app.services.llm_service import llm_service, FALLBACK_REPLY
+from app.services.rate_limiter import PRIORITY_NORMAL
+from app.utils.cache import TTLCache
+
+logger = logging.getLogger("warmup")
+
+# Results are dropped if nobody connects within this window
+WARMUP_TTL = float(os.getenv("WARMUP_TTL", "600"))
+# A warm-up still running after this long (slot wait included) is abandoned: its LLM call is stuck
+WARMUP_TIMEOUT = float(os.getenv("WARMUP_TIMEOUT", "30"))
+WARMUP_MAX_CONCURRENCY = int(os.getenv("WARMUP_MAX_CONCURRENCY", "4"))
+# How long a connecting websocket waits for a warm-up that is still running
+WARMUP_WAIT = float(os.getenv("WARMUP_WAIT", "5"))
+
+OPENING_INSTRUCTION = (
+    "The candidate has just joined the call. Welcome them by name in one sentence "
+    "and ask your first interview question."
+)
+
+
+class WarmupService:
+
+    def __init__(self):
+        self._jobs: Dict[str, asyncio.Task] = {}
+        self._openings = TTLCache(maxsize=1024, ttl=WARMUP_TTL)
+        self._slots = asyncio.Semaphore(WARMUP_MAX_CONCURRENCY)
+
+    def schedule(self, interview_id: str):
+        """Starts (or restarts) the warm-up for an interview. Never blocks the caller."""
+        self.cancel(interview_id)
+        task = asyncio.create_task(self._run(interview_id))
+        self._jobs[interview_id] = task
+        task.add_done_callback(lambda t: self._jobs.get(interview_id) is t and self._jobs.pop(interview_id))
+
+    async def _run(self, interview_id: str):
+        try:
+            await asyncio.wait_for(self._warm(interview_id), timeout=WARMUP_TIMEOUT)
+        except asyncio.TimeoutError:
+            logger.info(f"⌛ Warm-up for {interview_id} abandoned after {WARMUP_TIMEOUT:.0f}s")
+        except asyncio.CancelledError:
+            logger.info(f"🛑 Warm-up for {interview_id} cancelled")
+            raise
+        except Exception as e:
+            logger.error(f"❌ Warm-up for {interview_id} failed: {e}")
+
+    async def _warm(self, interview_id: str):
+        async with self._slots:
+            # Both calls populate flow_service's caches for the first real turn
+            context = await flow_service.fetch_interview_context(interview_id)
+            if not context:
+                return
+            system_prompt = await flow_service.get_system_prompt(interview_id, context)
+
+            # Speculative, so it yields to live turns for quota
+            opening = await llm_service.get_ai_response(
+                system_prompt, OPENING_INSTRUCTION,
+                priority=PRIORITY_NORMAL, user_id=context["interview"].get("user_id"),
+            )
+            if opening and opening != FALLBACK_REPLY:
+                self._openings.set(interview_id, opening)
+                logger.info(f"🔥 Opening question ready for {interview_id}")
+
+    async def take_opening(self, interview_id: str, wait: float = WARMUP_WAIT) -> Optional[str]:
+        """
+        Returns (and consumes) the pre-generated opening, waiting up to `wait`
+        seconds if the warm-up is still running. None if there is nothing to serve.
+        """
+        job = self._jobs.get(interview_id)
+        if job is not None and not job.done():
+            # shield: a caller timing out must not cancel the shared warm-up
+            await asyncio.wait({asyncio.shield(job)}, timeout=wait)
+        return self._openings.pop(interview_id)
+
+    def cancel(self, interview_id: str):
+        """Drops an interview's warm-up, e.g. when the session is ended or abandoned."""
+        job = self._jobs.pop(interview_id, None)
+        if job is not None and not job.done():
+            job.cancel()
+        self._openings.pop(interview_id)
+
+    async def shutdown(self):
+        jobs = list(self._jobs.values())
+        for job in jobs:
+            job.cancel()
+        await asyncio.gather(*jobs, return_exceptions=True)
+        self._jobs.clear()
+
+
+warmup_service = WarmupService()
@@ -1,63 +1,595 @@
+import os
+import time
+import asyncio
 import logging
-from typing import Dict, Optional
+from contextlib import aclosing
+from typing import Dict, List, Optional, Set
 from fastapi import WebSocket
+from starlette.websockets import WebSocketState
 from aiortc import RTCPeerConnection, RTCSessionDescription
+from aiortc.sdp import candidate_from_sdp, candidate_to_sdp
+from app.services.interview_flow_service import flow_service
+from app.services.llm_service import llm_service, FALLBACK_REPLY, StreamInterrupted
+from app.services.conversation_memory import conversation_store
+from app.services.warmup_service import warmup_service
+from app.services.audio_pipeline import AudioPipeline
+from app.services.transcription_service import create_transcriber
+from app.services.audio_output import OutboundAudioTrack, SpeechPipeline
+from app.services.tts_service import create_tts, TTS_BACKEND
+from app.services.transcript_store import transcript_store
+from app.services.vad import SPEECH_START, END_OF_TURN
+from app.services.session_registry import SessionRegistry, InMemorySessionRegistry, create_session_registry
+from app.utils.metrics import ACTIVE_SESSIONS, WEBRTC_OFFER_SECONDS, WEBRTC_CONNECT_SECONDS
 
 logging.basicConfig(level=logging.INFO)
 logging.getLogger("aiortc").setLevel(logging.WARNING)
 logging.getLogger("aioice").setLevel(logging.WARNING)
 logger = logging.getLogger("webrtc")
 
+# How long to wait for the transcriber's final result after the VAD ends a turn
+TURN_FINALIZE_GRACE = float(os.getenv("TURN_FINALIZE_GRACE", "0.3"))
+
+# Speak replies on an outbound audio track (see audio_output.py); on by default only when a TTS backend is configured
+TTS_ENABLED = os.getenv("TTS_ENABLED", "true" if TTS_BACKEND else "false").lower() in ("1", "true", "yes")
+if TTS_ENABLED and not TTS_BACKEND:
+    logger.warning("⚠️ TTS_ENABLED is set but no TTS backend is configured; replies will not be spoken")
+    TTS_ENABLED = False
+
+# Candidate speech while the interviewer is replying cancels the reply (barge-in)
+BARGE_IN_ENABLED = os.getenv("BARGE_IN_ENABLED", "true").lower() in ("1", "true", "yes")
+
+# Non-trickle clients wait at most this long for ICE gathering before we fall back to trickling
+ICE_GATHER_TIMEOUT = float(os.getenv("ICE_GATHER_TIMEOUT", "2.0"))
+
+# Lifecycle limits (per worker process)
+MAX_SESSIONS_PER_WORKER = int(os.getenv("MAX_SESSIONS_PER_WORKER", "50"))
+SESSION_IDLE_TIMEOUT = float(os.getenv("SESSION_IDLE_TIMEOUT", "120"))
+SESSION_REAPER_INTERVAL = float(os.getenv("SESSION_REAPER_INTERVAL", "15"))
+
+# Websocket close codes
+WS_CLOSE_ENDED = 1000
+WS_CLOSE_TRY_AGAIN_LATER = 1013
+WS_CLOSE_IDLE = 4408
+WS_CLOSE_REPLACED = 4409
+
 class InterviewSession:
     def __init__(self, interview_id: str, websocket: WebSocket):
         self.interview_id = interview_id
         self.websocket = websocket
         self.pc = RTCPeerConnection()
+        self.audio_pipeline: Optional[AudioPipeline] = None
+        self.transcript = transcript_store.open(interview_id)
+        # Added before any offer arrives, so the answer negotiates audio in both directions
+        self.speech: Optional[SpeechPipeline] = None
+        if TTS_ENABLED:
+            track = OutboundAudioTrack()
+            self.pc.addTrack(track)
+            self.speech = SpeechPipeline(interview_id, track, create_tts(interview_id))
+            self.speech.start()
+        self.pc.on("track", self._on_track)
+        self.pc.on("connectionstatechange", self._on_connection_state)
+        self._offer_at: Optional[float] = None
+        self.last_activity = time.monotonic()
+        self.closed = False
+        self._tasks: Set[asyncio.Task] = set()
+
+        # Candidate's current spoken turn
+        self._final_parts: List[str] = []
+        self._interim_text = ""
+        self._final_received = asyncio.Event()
+
+        # Interviewer's in-flight reply (at most one)
+        self._reply_task: Optional[asyncio.Task] = None
+
+    def _on_track(self, track):
+        if track.kind != "audio" or self.audio_pipeline is not None:
+            return
+        transcriber = create_transcriber(self.interview_id, self._on_transcript)
+        self.audio_pipeline = AudioPipeline(self.interview_id, transcriber, self._on_audio_event)
+        self.audio_pipeline.start(track)
+
+    async def _on_connection_state(self):
+        if self.pc.connectionState == "connected" and self._offer_at is not None:
+            WEBRTC_CONNECT_SECONDS.observe(time.perf_counter() - self._offer_at)
+            self._offer_at = None
+
+    async def _on_transcript(self, text: str, is_final: bool):
+        transcript_store.append(self.transcript, "user", text, final=is_final)
+        if is_final:
+            self._final_parts.append(text)
+            self._interim_text = ""
+            self._final_received.set()
+        else:
+            self._interim_text = text
+
+        try:
+            await self.websocket.send_json({"type": "transcript", "text": text, "is_final": is_final})
+        except Exception as e:
+            logger.warning(f"⚠️ [Session] Could not forward transcript for {self.interview_id}: {e}")
+
+    async def _on_audio_event(self, event: str):
+        self.touch()
+        if event == SPEECH_START:
+            self._final_received.clear()
+            await self.websocket.send_json({"type": "vad", "event": SPEECH_START})
+            if BARGE_IN_ENABLED:
+                await self.interrupt("barge_in")
+        elif event == END_OF_TURN:
+            await self.websocket.send_json({"type": "vad", "event": END_OF_TURN})
+            # Reply off the audio path so transcription keeps flowing
+            self.spawn(self._reply_to_turn())
+
+    def spawn(self, coro) -> asyncio.Task:
+        """Starts a task owned by this session (cancelled on close)."""
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    def touch(self):
+        self.last_activity = time.monotonic()
+
+    @property
+    def idle_seconds(self) -> float:
+        # A live audio track counts as activity: the frontend only messages the websocket for the offer
+        last = self.last_activity
+        if self.audio_pipeline is not None and self.audio_pipeline.last_frame_at is not None:
+            last = max(last, self.audio_pipeline.last_frame_at)
+        return time.monotonic() - last
+
+    @property
+    def is_dead(self) -> bool:
+        return self.pc.connectionState in ("failed", "closed")
+
+    async def _reply_to_turn(self):
+        """
+        The VAD says the candidate stopped talking: answer with what they said.
+        Waits briefly for the transcriber to finalize, then falls back to the latest interim text.
+        """
+        if not self._final_received.is_set():
+            try:
+                await asyncio.wait_for(self._final_received.wait(), timeout=TURN_FINALIZE_GRACE)
+            except asyncio.TimeoutError:
+                pass
+
+        utterance = " ".join(self._final_parts + ([self._interim_text] if self._interim_text else [])).strip()
+        self._final_parts = []
+        self._interim_text = ""
+        self._final_received.clear()
+
+        if utterance:
+            # Already in the transcript as the transcriber's final results
+            self.start_reply(utterance, mode="sentence", record=False)
+
+    async def send_opening(self):
+        """
+        Sends the pre-generated opening question (see WarmupService) as soon as the candidate connects.
+        """
+        opening = await warmup_service.take_opening(self.interview_id)
+        if opening:
+            conversation_store.get(self.interview_id).add("assistant", opening)
+            transcript_store.append(self.transcript, "assistant", opening)
+            if self.speech:
+                self.speech.say(opening)
+            await self.websocket.send_json({"type": "ai_done", "text": opening, "opening": True})
 
-    async def close(self):
+    @property
+    def replying(self) -> bool:
+        return self._reply_task is not None and not self._reply_task.done()
+
+    def start_reply(self, user_message: str, mode: str = "token", record: bool = True) -> asyncio.Task:
+        """
+        Starts the reply in the background so the websocket keeps reading (and can interrupt it).
+        A newer message supersedes a reply that is still streaming.
+        record=False skips logging the message to the transcript (spoken turns are logged as they are transcribed).
+        """
+        if record:
+            transcript_store.append(self.transcript, "user", user_message)
+        previous = self._reply_task if self.replying else None
+        self._reply_task = self.spawn(self._run_reply(user_message, mode, previous))
+        return self._reply_task
+
+    async def _run_reply(self, user_message: str, mode: str, previous: Optional[asyncio.Task]):
+        if previous is not None:
+            previous.cancel()
+            await asyncio.gather(previous, return_exceptions=True)
+            if self.speech:
+                await self.speech.cancel()
+        try:
+            await self.respond(user_message, mode)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"❌ [Session] Reply failed for {self.interview_id}: {e}")
+
+    async def interrupt(self, reason: str = "interrupt") -> bool:
+        """
+        Cancels the in-flight reply: the LLM stream is closed (no more tokens billed) and
+        nothing else is sent for it. respond() records the part that was already delivered.
+        Speech still queued or playing is dropped too, even if the text already finished.
+        """
+        replying = self.replying
+        if replying:
+            task = self._reply_task
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        # After the reply is gone, so nothing new gets fed in behind the cancel
+        speaking = await self.speech.cancel() if self.speech else False
+        if replying or speaking:
+            logger.info(f"✋ [Session] Reply interrupted for {self.interview_id} ({reason})")
+        return replying or speaking
+
+    async def respond(self, user_message: str, mode: str = "token"):
+        """
+        Streams the interviewer's reply back over the websocket as it is generated.
+        Sends one 'ai_chunk' per token (or sentence) and a final 'ai_done' with the full text.
+        With TTS on, each sentence is also spoken as soon as it is complete.
+        Recent turns go along verbatim; older ones only as the summary in the system prompt.
+        """
+        self.touch()
+        context = await flow_service.fetch_interview_context(self.interview_id)
+        if not context:
+            await self.websocket.send_json({"type": "error", "detail": "Interview ID not found"})
+            return None
+
+        memory = conversation_store.get(self.interview_id)
+        system_prompt = await flow_service.get_system_prompt(self.interview_id, context, memory.summary)
+        history = memory.messages()
+        user_id = context["interview"].get("user_id")
+
+        if mode == "sentence":
+            chunks = llm_service.stream_ai_sentences(system_prompt, user_message, history, user_id=user_id)
+        else:
+            chunks = llm_service.stream_ai_response(system_prompt, user_message, history, user_id=user_id)
+
+        separator = " " if mode == "sentence" else ""
+        parts = []
+        cut_short = False
+        try:
+            async with aclosing(chunks):
+                async for chunk in chunks:
+                    if self.speech:
+                        self.speech.feed(chunk + separator)
+                    await self.websocket.send_json({"type": "ai_chunk", "text": chunk})
+                    parts.append(chunk)
+        except StreamInterrupted:
+            # The candidate already has part of the reply: keep it, and say it was cut short
+            cut_short = True
+            await self.websocket.send_json({"type": "error", "detail": "Reply interrupted, please repeat your answer"})
+        except asyncio.CancelledError:
+            # Barge-in: keep exactly what the candidate received, so the next turn has the right context
+            partial = separator.join(parts)
+            memory.add("user", user_message)
+            memory.add("assistant", partial)
+            transcript_store.append(self.transcript, "assistant", partial, interrupted=True)
+            if not self.closed:
+                try:
+                    await self.websocket.send_json({"type": "ai_interrupted", "text": partial})
+                except Exception:
+                    pass
+            raise
+
+        full_reply = separator.join(parts)
+        if self.speech:
+            self.speech.finish()
+
+        memory.add("user", user_message)
+        if full_reply != FALLBACK_REPLY:
+            memory.add("assistant", full_reply)
+        transcript_store.append(self.transcript, "assistant", full_reply, interrupted=cut_short)
+
+        await self.websocket.send_json({"type": "ai_done", "text": full_reply})
+        self.touch()
+        return full_reply
+
+    async def close(self, code: Optional[int] = None, reason: str = ""):
+        """
+        Tears everything down exactly once: session tasks, audio pipeline, peer connection
+        (ICE sockets + DTLS), and optionally the websocket with a close code.
+        """
+        if self.closed:
+            return
+        self.closed = True
+
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+        if self.audio_pipeline:
+            await self.audio_pipeline.stop()
+            self.audio_pipeline = None
+        if self.speech:
+            await self.speech.stop()
+            self.speech = None
         if self.pc:
             await self.pc.close()
 
+        if code is not None and self.websocket.client_state == WebSocketState.CONNECTED:
+            try:
+                await self.websocket.close(code=code, reason=reason)
+            except Exception:
+                pass
+
 class ConnectionManager:
-    def __init__(self):
+    def __init__(self, max_sessions: int = MAX_SESSIONS_PER_WORKER):
         self.active_sessions: Dict[str, InterviewSession] = {}
+        self.max_sessions = max_sessions
+        # Connects past the capacity check but not yet in active_sessions
+        self._admitting = 0
+        # Replaced with the configured backend in start(), once we are inside the worker process
+        self.registry: SessionRegistry = InMemorySessionRegistry()
+        self._reaper: Optional[asyncio.Task] = None
+        self._control_listener: Optional[asyncio.Task] = None
+        ACTIVE_SESSIONS.set_function(lambda: len(self.active_sessions))
+
+    @property
+    def at_capacity(self) -> bool:
+        return len(self.active_sessions) + self._admitting >= self.max_sessions
+
+    async def connect(self, interview_id: str, websocket: WebSocket) -> Optional[InterviewSession]:
+        """
+        Admits a websocket. A reconnect for the same interview cleanly replaces the old session;
+        a brand-new interview beyond the worker's capacity is rejected with 1013 (try again later).
+        """
+        previous = self.active_sessions.get(interview_id)
+
+        if previous is None and self.at_capacity:
+            await websocket.accept()
+            await websocket.close(code=WS_CLOSE_TRY_AGAIN_LATER, reason="Server at capacity")
+            logger.warning(f"🚫 [Manager] Rejected {interview_id}: {len(self.active_sessions)} sessions active")
+            return None
 
-    async def connect(self, interview_id: str, websocket: WebSocket):
-        await websocket.accept()
-        session = InterviewSession(interview_id, websocket)
-        self.active_sessions[interview_id] = session
+        # Hold the slot before the first await, so concurrent connects can't all pass the check above
+        self._admitting += 1
+        try:
+            if previous is not None:
+                logger.info(f"🔁 [Manager] Reconnect for {interview_id}, replacing previous session")
+                await self.disconnect(interview_id, previous, code=WS_CLOSE_REPLACED, reason="Replaced by a new connection")
+            else:
+                # The interview may still be live on another worker (reconnect routed elsewhere)
+                owner = await self.registry.owner(interview_id)
+                if owner and owner != self.registry.worker_id:
+                    logger.info(f"🔁 [Manager] {interview_id} owned by {owner}, asking it to release")
+                    await self.registry.send(interview_id, {"type": "evict"})
+
+            await websocket.accept()
+            session = InterviewSession(interview_id, websocket)
+            self.active_sessions[interview_id] = session
+        finally:
+            self._admitting -= 1
+
+        try:
+            await self.registry.claim(interview_id)
+        except BaseException:
+            await self.disconnect(interview_id, session)
+            raise
+        session.spawn(session.send_opening())
         logger.info(f"✅ [Manager] User connected: {interview_id}")
         return session
 
-    def disconnect(self, interview_id: str):
-        if interview_id in self.active_sessions:
+    async def disconnect(self, interview_id: str, session: Optional[InterviewSession] = None, code: Optional[int] = None, reason: str = ""):
+        """
+        Removes and closes a session. Passing `session` makes this a no-op if the interview
+        has since been taken over by a newer connection.
+        """
+        current = self.active_sessions.get(interview_id)
+        if session is None:
+            session = current
+        if session is None:
+            return
+
+        if current is session:
             del self.active_sessions[interview_id]
+            try:
+                await self.registry.release(interview_id)
+            except Exception as e:
+                # The claim expires on its own; still tear the session down
+                logger.warning(f"⚠️ [Manager] Registry release failed for {interview_id}: {e}")
+            if code != WS_CLOSE_REPLACED:
+                # Candidate left (or the interview ended): a warm-up still running is wasted work
+                warmup_service.cancel(interview_id)
             logger.info(f"❌ [Manager] User disconnected: {interview_id}")
 
-    async def handle_offer(self, interview_id: str, sdp: str, type: str):
-        logger.info(f"🔄 [Manager] Received Offer for {interview_id}...")
+        await session.close(code, reason)
+        # After close, so the transcriber's last finals are in the log
+        await transcript_store.close(session.transcript)
+
+    async def _reap(self):
+        while True:
+            await asyncio.sleep(SESSION_REAPER_INTERVAL)
+            for interview_id, session in list(self.active_sessions.items()):
+                # One failing teardown must not take the reaper down with it
+                try:
+                    if session.is_dead:
+                        logger.info(f"🧹 [Manager] Reaping dead peer connection: {interview_id}")
+                        await self.disconnect(interview_id, session, code=WS_CLOSE_IDLE, reason="Peer connection closed")
+                    elif session.idle_seconds > SESSION_IDLE_TIMEOUT:
+                        logger.info(f"🧹 [Manager] Reaping idle session: {interview_id} ({session.idle_seconds:.0f}s)")
+                        await self.disconnect(interview_id, session, code=WS_CLOSE_IDLE, reason="Idle timeout")
+                except Exception as e:
+                    logger.error(f"❌ [Manager] Reaping {interview_id} failed: {e}")
+
+            try:
+                await self.registry.heartbeat(list(self.active_sessions))
+            except Exception as e:
+                logger.warning(f"⚠️ [Manager] Registry heartbeat failed: {e}")
+
+    # ----------------------------------------------------------------------------------
+    #  CROSS-WORKER ROUTING
+    # ----------------------------------------------------------------------------------
+    async def dispatch(self, interview_id: str, message: dict) -> Optional[str]:
+        """
+        Delivers a control message to whichever worker owns the interview.
+        Returns "local", "routed", or None when no worker holds the interview.
+        """
+        if interview_id in self.active_sessions:
+            await self._handle_control(interview_id, message)
+            return "local"
+        if await self.registry.send(interview_id, message):
+            return "routed"
+        return None
+
+    async def _handle_control(self, interview_id: str, message: dict):
+        session = self.active_sessions.get(interview_id)
+        if session is None:
+            return
+
+        kind = message.get("type")
+        if kind == "evict":
+            await self.disconnect(interview_id, session, code=WS_CLOSE_REPLACED, reason="Reconnected on another worker")
+        elif kind == "end":
+            await self.disconnect(interview_id, session, code=WS_CLOSE_ENDED, reason="Interview ended")
+        elif kind == "chat":
+            session.touch()
+            session.start_reply(message["message"], message.get("mode", "token"))
+        elif kind == "interrupt":
+            await session.interrupt(message.get("reason", "interrupt"))
+        elif kind == "notify":
+            await session.websocket.send_json(message.get("payload", {}))
+        else:
+            logger.warning(f"⚠️ [Manager] Unknown control message for {interview_id}: {kind}")
+
+    async def _listen_for_control(self):
+        async for interview_id, message in self.registry.receive():
+            try:
+                await self._handle_control(interview_id, message)
+            except Exception as e:
+                logger.error(f"❌ [Manager] Control message for {interview_id} failed: {e}")
+
+    def start(self):
+        if self._reaper is None:
+            self.registry = create_session_registry()
+            self._reaper = asyncio.create_task(self._reap())
+            self._control_listener = asyncio.create_task(self._listen_for_control())
+
+    async def shutdown(self):
+        for task in (self._reaper, self._control_listener):
+            if task is not None:
+                task.cancel()
+        self._reaper = None
+        self._control_listener = None
+        await asyncio.gather(*[
+            self.disconnect(interview_id, session, code=1001, reason="Server shutting down")
+            for interview_id, session in list(self.active_sessions.items())
+        ], return_exceptions=True)
+        await self.registry.close()
+
+    async def handle_offer(self, interview_id: str, sdp: str, type: str, trickle: bool = False):
+        """
+        Answers an SDP offer.
+
+        With trickle=True the answer is returned right away (it already carries the ICE
+        credentials and DTLS fingerprint) and local candidates follow as 'candidate' messages
+        once gathering finishes. Otherwise the answer includes every candidate, unless gathering
+        takes longer than ICE_GATHER_TIMEOUT, in which case we fall back to trickling.
+        """
+        logger.info(f"🔄 [Manager] Received Offer for {interview_id} (trickle={trickle})...")
         
         session = self.active_sessions.get(interview_id)
         if not session:
             logger.error(f"⚠️ [Manager] Session not found: {interview_id}")
             return None
 
+        session._offer_at = time.perf_counter()
         try:
-            offer = RTCSessionDescription(sdp=sdp, type=type)
-            await session.pc.setRemoteDescription(offer)
+            with WEBRTC_OFFER_SECONDS.time(trickle=trickle):
+                offer = RTCSessionDescription(sdp=sdp, type=type)
+                await session.pc.setRemoteDescription(offer)
             
-            answer = await session.pc.createAnswer()
-            await session.pc.setLocalDescription(answer)
+                answer = await session.pc.createAnswer()
+                # setLocalDescription is where aiortc gathers candidates; run it in the background
+                gathering = session.spawn(session.pc.setLocalDescription(answer))
 
-            logger.info("✅ [Manager] Handshake Complete. Returning Answer.")
-            
-            return {
-                "sdp": session.pc.localDescription.sdp,
-                "type": session.pc.localDescription.type
-            }
+                if not trickle:
+                    done, _ = await asyncio.wait({gathering}, timeout=ICE_GATHER_TIMEOUT)
+                    if gathering in done:
+                        gathering.result()
+                        logger.info("✅ [Manager] Handshake Complete. Returning Answer.")
+                        return {
+                            "sdp": session.pc.localDescription.sdp,
+                            "type": session.pc.localDescription.type
+                        }
+                    logger.warning(f"⏱️ [Manager] ICE gathering exceeded {ICE_GATHER_TIMEOUT}s for {interview_id}, trickling candidates")
+
+                session.spawn(self._send_local_candidates(session, gathering))
+                logger.info("✅ [Manager] Answer sent early, candidates will trickle.")
+
+                return {
+                    "sdp": answer.sdp,
+                    "type": answer.type
+                }
         
         except Exception as e:
             logger.error(f"❌ [Manager] Error during handshake: {str(e)}")
             return None
 
+    async def _send_local_candidates(self, session: InterviewSession, gathering: asyncio.Task):
+        """
+        Streams our ICE candidates to the client once gathering completes,
+        then signals end-of-candidates with candidate=None.
+        """
+        try:
+            await gathering
+        except Exception as e:
+            logger.error(f"❌ [Manager] ICE gathering failed for {session.interview_id}: {e}")
+            return
+
+        sent_gatherers = set()
+        for index, transceiver in enumerate(session.pc.getTransceivers()):
+            gatherer = transceiver.receiver.transport.transport.iceGatherer
+            # With BUNDLE every m-line shares one transport; send its candidates once
+            if id(gatherer) in sent_gatherers:
+                continue
+            sent_gatherers.add(id(gatherer))
+
+            for candidate in gatherer.getLocalCandidates():
+                await session.websocket.send_json({
+                    "type": "candidate",
+                    "candidate": f"candidate:{candidate_to_sdp(candidate)}",
+                    "sdpMid": transceiver.mid,
+                    "sdpMLineIndex": index,
+                })
+
+        await session.websocket.send_json({"type": "candidate", "candidate": None})
+
+    async def add_ice_candidate(self, interview_id: str, message: dict):
+        """
+        Applies a trickled remote candidate. candidate=None (or "") means end-of-candidates.
+        """
+        session = self.active_sessions.get(interview_id)
+        if not session:
+            logger.error(f"⚠️ [Manager] Session not found: {interview_id}")
+            return
+
+        raw = message.get("candidate")
+        if not raw:
+            await session.pc.addIceCandidate(None)
+            return
+
+        try:
+            candidate = candidate_from_sdp(raw.split(":", 1)[1] if raw.startswith("candidate:") else raw)
+            candidate.sdpMid = message.get("sdpMid")
+            candidate.sdpMLineIndex = message.get("sdpMLineIndex")
+            await session.pc.addIceCandidate(candidate)
+        except Exception as e:
+            logger.warning(f"⚠️ [Manager] Ignoring bad ICE candidate for {interview_id}: {e}")
+
+    async def stream_reply(self, interview_id: str, user_message: str, mode: str = "token"):
+        """
+        Starts streaming the interviewer's reply for a typed chat message (see InterviewSession.respond).
+        Returns the reply task; the caller does not wait for it so it can still receive 'interrupt'.
+        """
+        session = self.active_sessions.get(interview_id)
+        if not session:
+            logger.error(f"⚠️ [Manager] Session not found: {interview_id}")
+            return None
+
+        return session.start_reply(user_message, mode)
+
+    async def interrupt(self, interview_id: str, reason: str = "interrupt") -> bool:
+        session = self.active_sessions.get(interview_id)
+        if not session:
+            return False
+        return await session.interrupt(reason)
+
 manager = ConnectionManager()
\ No newline at end of file
@@ -0,0 +1,101 @@
+import os
+import hashlib
+import tempfile
+import zlib
+import zipfile
+import logging
+
+logger = logging.getLogger("file_utils")
+
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1 MB
+MAX_UPLOAD_BYTES = int(os.getenv("RESUME_MAX_UPLOAD_BYTES", str(10 * 1024 * 1024)))
+
+
+class UploadTooLarge(Exception):
+    pass
+
+
+class InvalidArchive(Exception):
+    pass
+
+
+async def spool_upload(file, max_bytes: int = MAX_UPLOAD_BYTES, suffix: str = ".pdf"):
+    """
+    Streams an UploadFile to a temp file on disk in fixed-size chunks,
+    hashing as it goes, so the whole upload never sits in memory.
+
+    Returns (path, sha256_hexdigest, size). The caller owns the file and must remove it.
+    """
+    digest = hashlib.sha256()
+    size = 0
+    tmp = tempfile.NamedTemporaryFile(prefix="upload_", suffix=suffix, delete=False)
+
+    try:
+        with tmp:
+            while True:
+                chunk = await file.read(UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLarge(f"File exceeds the {max_bytes // (1024 * 1024)} MB upload limit")
+                digest.update(chunk)
+                tmp.write(chunk)
+    except BaseException:
+        remove_file(tmp.name)
+        raise
+
+    return tmp.name, digest.hexdigest(), size
+
+
+def remove_file(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logger.warning(f"⚠️ Could not remove temp file {path}: {e}")
+
+
+def expand_zip(zip_path: str, max_files: int, max_member_bytes: int = MAX_UPLOAD_BYTES, suffix: str = ".pdf"):
+    """
+    Blocking: unpacks every `suffix` member of a zip into its own temp file, hashing as it goes.
+    Member sizes are enforced on the bytes actually read (not the header), so zip bombs stop early.
+
+    Returns a list of (member_name, path, sha256_hexdigest, size).
+    Raises InvalidArchive for corrupt or encrypted archives.
+    """
+    entries = []
+    try:
+        with zipfile.ZipFile(zip_path) as archive:
+            for info in archive.infolist():
+                name = os.path.basename(info.filename)
+                if info.is_dir() or not name.lower().endswith(suffix) or name.startswith("."):
+                    continue
+                if len(entries) >= max_files:
+                    raise UploadTooLarge(f"Archive contains more than {max_files} files")
+
+                digest = hashlib.sha256()
+                size = 0
+                tmp = tempfile.NamedTemporaryFile(prefix="upload_", suffix=suffix, delete=False)
+                entries.append((name, tmp.name, None, 0))
+                with tmp, archive.open(info) as member:
+                    while True:
+                        chunk = member.read(UPLOAD_CHUNK_SIZE)
+                        if not chunk:
+                            break
+                        size += len(chunk)
+                        if size > max_member_bytes:
+                            raise UploadTooLarge(f"{name} exceeds the {max_member_bytes // (1024 * 1024)} MB upload limit")
+                        digest.update(chunk)
+                        tmp.write(chunk)
+                entries[-1] = (name, tmp.name, digest.hexdigest(), size)
+    except BaseException as e:
+        for _, path, _, _ in entries:
+            remove_file(path)
+        # zipfile reports encrypted members as RuntimeError, unknown compression as NotImplementedError
+        if isinstance(e, (zipfile.BadZipFile, zlib.error, RuntimeError, NotImplementedError, EOFError)):
+            raise InvalidArchive(f"Invalid or encrypted zip archive: {e}") from e
+        raise
+
+    return entries
@@ -0,0 +1,73 @@
+# app/utils/logging.py
+#
+# Per-request trace ids. The id lives in a contextvar, so it follows the request through
+# every await and into tasks spawned from it (asyncio copies the context), shows up in
+# every log line, and is forwarded to Groq as X-Request-ID.
+
+import uuid
+import logging
+from contextvars import ContextVar
+
+TRACE_HEADER = "x-request-id"
+LOG_FORMAT = "%(levelname)s:%(name)s:[%(trace_id)s] %(message)s"
+
+trace_id_var: ContextVar[str] = ContextVar("trace_id", default="-")
+
+
+def new_trace_id() -> str:
+    return uuid.uuid4().hex[:16]
+
+
+def get_trace_id() -> str:
+    return trace_id_var.get()
+
+
+def set_trace_id(trace_id: str):
+    """Sets the trace id for the current context (and any task started from it)."""
+    return trace_id_var.set(trace_id)
+
+
+class TraceIdFilter(logging.Filter):
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.trace_id = trace_id_var.get()
+        return True
+
+
+def configure_logging(level: int = logging.INFO):
+    """Adds the trace id to every record handled by the root logger's handlers."""
+    root = logging.getLogger()
+    if not root.handlers:
+        logging.basicConfig(level=level)
+    for handler in root.handlers:
+        if not any(isinstance(f, TraceIdFilter) for f in handler.filters):
+            handler.addFilter(TraceIdFilter())
+        handler.setFormatter(logging.Formatter(LOG_FORMAT))
+
+
+class TraceMiddleware:
+    """
+    ASGI middleware: takes the caller's X-Request-ID (or makes one), binds it for the
+    request/websocket, and echoes it on HTTP responses.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] not in ("http", "websocket"):
+            return await self.app(scope, receive, send)
+
+        incoming = dict(scope.get("headers") or []).get(TRACE_HEADER.encode())
+        trace_id = incoming.decode("latin-1")[:64] if incoming else new_trace_id()
+        token = set_trace_id(trace_id)
+
+        async def send_with_trace(message):
+            if message["type"] == "http.response.start":
+                message.setdefault("headers", [])
+                message["headers"] = [*message["headers"], (TRACE_HEADER.encode(), trace_id.encode("latin-1"))]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_trace)
+        finally:
+            trace_id_var.reset(token)
@@ -0,0 +1,288 @@
+# app/utils/metrics.py
+#
+# Minimal in-process metrics (counters, gauges, histograms with labels) rendered in the
+# Prometheus text exposition format for GET /metrics. No client library needed; with several
+# uvicorn/gunicorn workers each process reports its own numbers (scrape them per worker).
+
+import time
+import threading
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# Seconds. Spans sub-10ms DB hits up to slow LLM completions.
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric(ABC):
+    kind = ""
+
+    def __init__(self, name: str, help: str, labels: Iterable[str] = ()):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.label_names)
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}", *self._samples()]
+
+    @abstractmethod
+    def _samples(self) -> List[str]:
+        ...
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: Iterable[str] = ()):
+        super().__init__(name, help, labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}{_format_labels(self.label_names, key)} {value}" for key, value in items]
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, labels: Iterable[str] = (), function: Optional[Callable[[], float]] = None):
+        super().__init__(name, help, labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        # Unlabelled gauges can be computed at scrape time instead of maintained
+        self._function = function
+
+    def set(self, value: float, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels):
+        self.inc(-amount, **labels)
+
+    def set_function(self, function: Callable[[], float]):
+        self._function = function
+
+    def _samples(self) -> List[str]:
+        if self._function is not None:
+            return [f"{self.name} {float(self._function())}"]
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}{_format_labels(self.label_names, key)} {value}" for key, value in items]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: Iterable[str] = (), buckets: Iterable[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+        # key -> [per-bucket counts..., +Inf count, sum]
+        self._values: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            state[index] += 1
+            state[-1] += value
+
+    def time(self, **labels) -> "Timer":
+        return Timer(self, labels)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = [(key, list(state)) for key, state in self._values.items()]
+
+        lines = []
+        for key, state in items:
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float("inf")), state[:-1]):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                labels = _format_labels(self.label_names, key, 'le="%s"' % le)
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.label_names, key)} {state[-1]}")
+            lines.append(f"{self.name}_count{_format_labels(self.label_names, key)} {cumulative}")
+        return lines
+
+
+class Timer:
+    """
+    Times a block into a histogram; works as `with` and `async with`.
+    Labels can be added or changed inside the block (e.g. the outcome) via `timer.labels`.
+    An exception escaping the block sets outcome="error" if the histogram has that label.
+    """
+
+    def __init__(self, histogram: Histogram, labels: dict):
+        self.histogram = histogram
+        self.labels = dict(labels)
+        self.started = 0.0
+
+    def __enter__(self) -> "Timer":
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None and "outcome" in self.histogram.label_names:
+            # CancelledError / GeneratorExit: the caller walked away (barge-in, hedge loser)
+            cancelled = exc_type.__name__ in ("CancelledError", "GeneratorExit")
+            self.labels["outcome"] = "cancelled" if cancelled else "error"
+        self.labels.setdefault("outcome", "ok")
+        self.histogram.observe(time.perf_counter() - self.started, **self.labels)
+        return False
+
+    async def __aenter__(self) -> "Timer":
+        return self.__enter__()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return self.__exit__(exc_type, exc, tb)
+
+
+class Registry:
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            # Re-importing a module (tests, reload) must not duplicate series
+            return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name: str, help: str, labels: Iterable[str] = ()) -> Counter:
+        return self._register(Counter(name, help, labels))
+
+    def gauge(self, name: str, help: str, labels: Iterable[str] = ()) -> Gauge:
+        return self._register(Gauge(name, help, labels))
+
+    def histogram(self, name: str, help: str, labels: Iterable[str] = (), buckets: Iterable[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, help, labels, buckets))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+# --------------------------------------------------------------------------------------
+#  HOT-PATH METRICS
+# --------------------------------------------------------------------------------------
+HTTP_REQUEST_SECONDS = registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency", ["method", "route", "status"])
+
+PDF_EXTRACT_SECONDS = registry.histogram(
+    "pdf_extract_duration_seconds", "PDF text extraction time (worker pool)", ["outcome"])
+
+LLM_REQUEST_SECONDS = registry.histogram(
+    "llm_request_duration_seconds", "Full LLM call time including retries", ["model", "kind", "outcome"])
+LLM_TTFT_SECONDS = registry.histogram(
+    "llm_time_to_first_token_seconds", "Time until the first streamed token", ["model"])
+LLM_TOKENS = registry.counter(
+    "llm_tokens_total", "Tokens reported by the provider's usage block", ["model", "direction"])
+LLM_RETRIES = registry.counter(
+    "llm_retries_total", "Retried LLM attempts", ["model", "reason"])
+LLM_QUEUE_SECONDS = registry.histogram(
+    "llm_rate_limit_wait_seconds", "Time spent waiting for rate-limit quota", ["model", "priority"])
+
+DB_REQUEST_SECONDS = registry.histogram(
+    "db_request_duration_seconds", "Supabase/PostgREST round-trip time", ["table", "op", "outcome"])
+WRITE_BEHIND_DROPPED = registry.counter(
+    "db_write_behind_dropped_total", "Buffered writes given up on (rejected or out of retries)", ["table", "op"])
+
+WEBRTC_OFFER_SECONDS = registry.histogram(
+    "webrtc_offer_duration_seconds", "Offer received -> answer returned", ["trickle", "outcome"])
+WEBRTC_CONNECT_SECONDS = registry.histogram(
+    "webrtc_connect_duration_seconds", "Offer received -> peer connection connected")
+
+TTS_FIRST_AUDIO_SECONDS = registry.histogram(
+    "tts_time_to_first_audio_seconds", "Sentence queued -> first synthesized audio", ["backend"])
+TTS_UNDERRUNS = registry.counter(
+    "tts_playout_underruns_total", "Outbound audio frames padded with silence mid-reply")
+
+WS_MESSAGE_SECONDS = registry.histogram(
+    "ws_message_duration_seconds", "Websocket message handling time", ["type", "outcome"])
+
+ACTIVE_SESSIONS = registry.gauge("interview_sessions_active", "Interview sessions held by this worker")
+
+
+def _route_template(scope) -> str:
+    """
+    Full path template of the matched route, e.g. "/api/interview/{interview_id}/transcript".
+    The route in the scope is the one inside the included router, whose path lacks the
+    include_router prefix, so the prefix is taken back from the request path.
+    """
+    route = scope.get("route")
+    template = getattr(route, "path_format", None) or getattr(route, "path", None)
+    if template is None:
+        return "unmatched"
+    try:
+        concrete = template.format(**(scope.get("path_params") or {}))
+    except (KeyError, IndexError, ValueError):
+        return template
+    path = scope.get("path", "")
+    if concrete and path.endswith(concrete):
+        return path[:len(path) - len(concrete)] + template
+    return template
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording HTTP latency per route template (not raw path, to bound cardinality)."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        status = {"code": 500}
+
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = _route_template(scope)
+            HTTP_REQUEST_SECONDS.observe(
+                time.perf_counter() - started, method=scope["method"], route=route, status=status["code"]
+            )
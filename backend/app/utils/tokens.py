@@ -0,0 +1,28 @@
+# app/utils/tokens.py
+#
+# Local token estimates for budgeting prompts without a tokenizer dependency.
+
+import re
+import math
+
+TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+
+
+def count_tokens(text: str) -> int:
+    """
+    Cheap local token estimate: one token per word/punctuation piece,
+    plus one for every extra 6 characters of a long word (close enough to BPE for budgeting).
+    """
+    return sum(max(1, math.ceil(len(piece) / 6)) for piece in TOKEN_RE.findall(text))
+
+
+def truncate_to_budget(text: str, max_tokens: int) -> str:
+    """Keeps whole lines, in order, until the token budget is spent."""
+    kept, used = [], 0
+    for line in text.split("\n"):
+        cost = count_tokens(line) + 1
+        if used + cost > max_tokens:
+            break
+        kept.append(line)
+        used += cost
+    return "\n".join(kept)
@@ -0,0 +1,172 @@
+# app/utils/validation.py
+#
+# Local clean-up of LLM JSON output, so a slightly broken reply doesn't cost another round-trip:
+# repair_json() fixes the usual breakage (markdown fences, chatter around the object, trailing
+# commas, output cut off at max_tokens), the coercers turn whatever shape the model picked
+# into what the TEXT[] columns hold, and validate_fields() reports which fields still need asking for.
+
+import re
+import json
+from typing import Any, Iterable, List, Optional, Tuple
+
+from pydantic import TypeAdapter, ValidationError
+
+FENCE_RE = re.compile(r"^```[a-zA-Z]*\s*|\s*```$")
+# Inside a cut-off object: a key (with or without its colon) that never got a value
+DANGLING_KEY_RE = re.compile(r'([{,])\s*"(?:[^"\\]|\\.)*"\s*:?\s*$')
+
+
+class JSONRepairError(ValueError):
+    pass
+
+
+def _scan(text: str) -> Tuple[List[int], bool, bool]:
+    """
+    Indexes of the characters outside JSON strings (opening quotes included), and whether
+    the text ends inside a string / right after a backslash in one.
+    """
+    outside, in_string, escaped = [], False, False
+    for index, char in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+            continue
+        if char == '"':
+            in_string = True
+        outside.append(index)
+    return outside, in_string, escaped
+
+
+def _strip_trailing_commas(text: str) -> str:
+    """Drops commas directly before a closing bracket, leaving string contents alone."""
+    outside, _, _ = _scan(text)
+    structural = [index for index in outside if not text[index].isspace()]
+    drop = {index for index, following in zip(structural, structural[1:])
+            if text[index] == "," and text[following] in "}]"}
+    if not drop:
+        return text
+    return "".join(char for index, char in enumerate(text) if index not in drop)
+
+
+def _close_truncated(text: str) -> str:
+    """Closes an unterminated string and every bracket left open, in order."""
+    outside, in_string, escaped = _scan(text)
+    stack = []
+    for index in outside:
+        char = text[index]
+        if char in "{[":
+            stack.append("}" if char == "{" else "]")
+        elif char in "}]" and stack:
+            stack.pop()
+
+    if in_string:
+        # Drop a lone trailing escape so the closing quote isn't swallowed
+        text = (text[:-1] if escaped else text) + '"'
+    if stack:
+        text = text.rstrip()
+        if stack[-1] == "}":
+            # A key whose value never arrived
+            text = DANGLING_KEY_RE.sub(r"\1", text)
+        text = text.rstrip().rstrip(",:").rstrip()
+    return text + "".join(reversed(stack))
+
+
+def repair_json(text: str) -> Any:
+    """
+    Parses model output as JSON, repairing it locally if needed.
+    Raises JSONRepairError when nothing usable can be recovered.
+    """
+    try:
+        return json.loads(text)
+    except (json.JSONDecodeError, TypeError):
+        pass
+
+    candidate = FENCE_RE.sub("", (text or "").strip())
+    start = min((i for i in (candidate.find("{"), candidate.find("[")) if i >= 0), default=-1)
+    if start < 0:
+        raise JSONRepairError("no JSON object in model output")
+    candidate = _strip_trailing_commas(candidate[start:])
+
+    try:
+        return json.loads(candidate)
+    except json.JSONDecodeError:
+        pass
+    # Chatter after the object: take the first complete value and ignore the rest
+    try:
+        return json.JSONDecoder().raw_decode(candidate)[0]
+    except json.JSONDecodeError:
+        pass
+    try:
+        return json.loads(_strip_trailing_commas(_close_truncated(candidate)))
+    except json.JSONDecodeError:
+        raise JSONRepairError("model output is not valid JSON and could not be repaired") from None
+
+
+# --------------------------------------------------------------------------------------
+#  COERCION (used as pydantic BeforeValidators)
+# --------------------------------------------------------------------------------------
+def flatten_to_text(value: Any) -> str:
+    """One readable line for a nested value, e.g. an experience object -> "Engineer | Acme | 2021-2023"."""
+    if value is None:
+        return ""
+    if isinstance(value, dict):
+        return " | ".join(text for text in (flatten_to_text(v) for v in value.values()) if text)
+    if isinstance(value, (list, tuple)):
+        return ", ".join(text for text in (flatten_to_text(v) for v in value) if text)
+    return " ".join(str(value).split())
+
+
+def as_text_list(value: Any) -> List[str]:
+    """Coerces a list field to list[str]: objects are flattened, blanks dropped, a lone string wrapped."""
+    if value is None:
+        return []
+    if isinstance(value, str):
+        value = [value]
+    elif isinstance(value, dict):
+        value = list(value.values())
+    elif not isinstance(value, (list, tuple)):
+        value = [value]
+    return [text for text in (flatten_to_text(item) for item in value) if text]
+
+
+def as_term_list(value: Any) -> List[str]:
+    """Like as_text_list, for lists of short terms: grouped or comma-joined entries become separate items."""
+    if isinstance(value, str):
+        value = value.split(",")
+    elif isinstance(value, dict):
+        # {"languages": [...], "tools": [...]}
+        value = [item for group in value.values() for item in (group if isinstance(group, list) else [group])]
+    terms = []
+    for item in as_text_list(value):
+        terms.extend(term.strip() for term in item.split(",") if term.strip())
+    return terms
+
+
+def as_optional_text(value: Any) -> Optional[str]:
+    """Scalar field: blank becomes None, anything structured is flattened."""
+    return flatten_to_text(value) or None
+
+
+# --------------------------------------------------------------------------------------
+#  VALIDATION
+# --------------------------------------------------------------------------------------
+def validate_fields(adapter: TypeAdapter, data: Any, fields: Iterable[str]) -> Tuple[Any, List[str]]:
+    """
+    Validates model output with a prebuilt TypeAdapter. Returns the validated value and
+    the fields that were absent or unusable (those are left at their defaults), so the
+    caller can re-ask for just those.
+    """
+    data = dict(data) if isinstance(data, dict) else {}
+    missing = [field for field in fields if field not in data]
+    try:
+        return adapter.validate_python(data), missing
+    except ValidationError as e:
+        bad = {str(error["loc"][0]) for error in e.errors() if error["loc"]}
+        for field in bad:
+            data.pop(field, None)
+        missing += [field for field in fields if field in bad and field not in missing]
+        return adapter.validate_python(data), missing
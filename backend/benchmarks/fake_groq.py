@@ -0,0 +1,123 @@
+# benchmarks/fake_groq.py
+#
+# OpenAI-compatible /chat/completions stand-in for load tests. Latency is configurable
+# (time to first token, per-token delay, jitter, error rate), streaming works like Groq's
+# (SSE chunks, usage in the final chunk's x_groq block), and JSON-mode requests get a
+# plausible parsed resume back.
+#
+#   python -m benchmarks.fake_groq --port 9101 --ttft 0.25 --token-delay 0.01
+
+import json
+import time
+import random
+import asyncio
+import argparse
+from dataclasses import dataclass
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+
+@dataclass
+class FakeLLMConfig:
+    ttft: float = 0.25          # seconds before the first token
+    token_delay: float = 0.01   # seconds between streamed tokens
+    tokens: int = 40            # tokens per chat reply
+    jitter: float = 0.2         # +/- fraction applied to every delay
+    error_rate: float = 0.0     # share of requests answered with 503
+
+
+REPLY_WORDS = (
+    "Thanks for walking me through that. Could you tell me more about the trade-offs "
+    "you considered, how you measured the impact, and what you would change if you "
+    "built it again today with a larger team and a tighter deadline?"
+).split()
+
+RESUME_JSON = {
+    "name": "Benchmark Candidate",
+    "email": None,
+    "phone": None,
+    "skills": ["Python", "FastAPI", "PostgreSQL", "Docker"],
+    "education": ["B.Tech Computer Science, 2022"],
+    "experience": ["Backend Engineer at Example Corp (2022-2024): built APIs"],
+    "projects": ["Interview bot: WebRTC + LLM voice interviewer"],
+}
+
+
+def create_app(config: FakeLLMConfig) -> FastAPI:
+    app = FastAPI(title="Fake Groq")
+
+    def jittered(seconds: float) -> float:
+        return max(0.0, seconds * random.uniform(1 - config.jitter, 1 + config.jitter))
+
+    def usage(body: dict, completion_tokens: int) -> dict:
+        prompt_tokens = sum(len(str(m.get("content", "")).split()) for m in body.get("messages", []))
+        return {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        }
+
+    @app.post("/{path:path}")
+    async def chat_completions(path: str, request: Request):
+        body = await request.json()
+        model = body.get("model", "fake")
+
+        if random.random() < config.error_rate:
+            return JSONResponse({"error": {"message": "overloaded"}}, status_code=503)
+
+        if (body.get("response_format") or {}).get("type") == "json_object":
+            content = json.dumps(RESUME_JSON)
+        else:
+            content = " ".join(REPLY_WORDS[:config.tokens])
+        words = content.split(" ")
+
+        if not body.get("stream"):
+            await asyncio.sleep(jittered(config.ttft + config.token_delay * len(words)))
+            return {
+                "id": "chatcmpl-fake",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+                "usage": usage(body, len(words)),
+            }
+
+        async def events():
+            await asyncio.sleep(jittered(config.ttft))
+            for index, word in enumerate(words):
+                delta = word if index == 0 else " " + word
+                chunk = {"model": model, "choices": [{"index": 0, "delta": {"content": delta}}]}
+                yield f"data: {json.dumps(chunk)}\n\n"
+                await asyncio.sleep(jittered(config.token_delay))
+            final = {
+                "model": model,
+                "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+                "x_groq": {"usage": usage(body, len(words))},
+            }
+            yield f"data: {json.dumps(final)}\n\n"
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    return app
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Fake OpenAI-compatible chat server")
+    parser.add_argument("--port", type=int, default=9101)
+    parser.add_argument("--ttft", type=float, default=FakeLLMConfig.ttft)
+    parser.add_argument("--token-delay", type=float, default=FakeLLMConfig.token_delay)
+    parser.add_argument("--tokens", type=int, default=FakeLLMConfig.tokens)
+    parser.add_argument("--jitter", type=float, default=FakeLLMConfig.jitter)
+    parser.add_argument("--error-rate", type=float, default=FakeLLMConfig.error_rate)
+    args = parser.parse_args()
+
+    config = FakeLLMConfig(args.ttft, args.token_delay, args.tokens, args.jitter, args.error_rate)
+    uvicorn.run(create_app(config), host="127.0.0.1", port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
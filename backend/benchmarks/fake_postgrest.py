@@ -0,0 +1,170 @@
+# benchmarks/fake_postgrest.py
+#
+# In-memory PostgREST stand-in (just the subset supabase-py uses here): select with
+# column lists, eq filters, order, limit and the interviews -> resume_data embed; insert,
+# upsert (ignore-duplicates) and update returning the affected rows. Every call waits
+# `latency` seconds first, to model the round-trip to a hosted Supabase project.
+#
+#   SUPABASE_URL=http://127.0.0.1:9102  python -m benchmarks.fake_postgrest --port 9102 --latency 0.03
+
+import re
+import uuid
+import random
+import asyncio
+import argparse
+import itertools
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+# (table, embedded table) -> foreign key column on `table`
+FOREIGN_KEYS = {("interviews", "resume_data"): "resume_id"}
+# Tables keyed by uuid; everything else gets a serial integer id
+UUID_TABLES = {"interviews"}
+
+EMBED_RE = re.compile(r"^(\w+)\((.*)\)$")
+
+
+@dataclass
+class FakeDBConfig:
+    latency: float = 0.03
+    jitter: float = 0.2
+
+
+def split_columns(select: str) -> List[str]:
+    """Splits a PostgREST select list on top-level commas (embeds contain their own)."""
+    parts, depth, current = [], 0, ""
+    for char in select:
+        if char == "," and depth == 0:
+            parts.append(current.strip())
+            current = ""
+            continue
+        depth += char == "("
+        depth -= char == ")"
+        current += char
+    if current.strip():
+        parts.append(current.strip())
+    return parts
+
+
+class Store:
+
+    def __init__(self):
+        self.tables: Dict[str, List[dict]] = {}
+        self._serial = itertools.count(1)
+
+    def rows(self, table: str) -> List[dict]:
+        return self.tables.setdefault(table, [])
+
+    def insert(self, table: str, row: dict) -> dict:
+        row = dict(row)
+        row.setdefault("id", str(uuid.uuid4()) if table in UUID_TABLES else next(self._serial))
+        self.rows(table).append(row)
+        return row
+
+    def find(self, table: str, filters: Dict[str, str]) -> List[dict]:
+        return [
+            row for row in self.rows(table)
+            if all(str(row.get(column)) == value for column, value in filters.items())
+        ]
+
+    def project(self, table: str, row: dict, select: str) -> dict:
+        if select in ("", "*"):
+            return dict(row)
+        out = {}
+        for column in split_columns(select):
+            embed = EMBED_RE.match(column)
+            if embed:
+                child_table, child_select = embed.groups()
+                key = FOREIGN_KEYS.get((table, child_table))
+                children = self.find(child_table, {"id": str(row.get(key))}) if key and row.get(key) is not None else []
+                out[child_table] = self.project(child_table, children[0], child_select) if children else None
+            elif column == "*":
+                out.update(row)
+            else:
+                out[column] = row.get(column)
+        return out
+
+
+def parse_filters(request: Request) -> Dict[str, str]:
+    filters = {}
+    for key, value in request.query_params.items():
+        if key in ("select", "limit", "order", "offset", "columns", "on_conflict"):
+            continue
+        if value.startswith("eq."):
+            filters[key] = value[3:]
+    return filters
+
+
+def create_app(config: FakeDBConfig, store: Optional[Store] = None) -> FastAPI:
+    app = FastAPI(title="Fake PostgREST")
+    app.state.store = store = store or Store()
+
+    async def round_trip():
+        await asyncio.sleep(max(0.0, config.latency * random.uniform(1 - config.jitter, 1 + config.jitter)))
+
+    def respond(request: Request, rows: List[dict], status: int = 200):
+        # Without return=representation PostgREST answers with an empty body
+        if request.method != "GET" and "return=representation" not in request.headers.get("prefer", ""):
+            return JSONResponse([], status_code=status)
+        return JSONResponse(rows, status_code=status)
+
+    @app.get("/rest/v1/{table}")
+    async def select(table: str, request: Request):
+        await round_trip()
+        rows = store.find(table, parse_filters(request))
+        order = request.query_params.get("order")
+        if order:
+            column, _, direction = order.partition(".")
+            rows = sorted(rows, key=lambda row: row.get(column), reverse=direction.startswith("desc"))
+        limit = request.query_params.get("limit")
+        if limit:
+            rows = rows[:int(limit)]
+        select_list = request.query_params.get("select", "*")
+        return JSONResponse([store.project(table, row, select_list) for row in rows])
+
+    @app.post("/rest/v1/{table}")
+    async def insert(table: str, request: Request):
+        await round_trip()
+        body = await request.json()
+        rows = body if isinstance(body, list) else [body]
+        # Upsert with resolution=ignore-duplicates: skip rows whose conflict columns already exist
+        on_conflict = request.query_params.get("on_conflict")
+        if on_conflict and "ignore-duplicates" in request.headers.get("prefer", ""):
+            columns = on_conflict.split(",")
+            rows = [row for row in rows if not store.find(table, {c: str(row.get(c)) for c in columns})]
+        return respond(request, [store.insert(table, row) for row in rows], status=201)
+
+    @app.patch("/rest/v1/{table}")
+    async def update(table: str, request: Request):
+        await round_trip()
+        values = await request.json()
+        rows = store.find(table, parse_filters(request))
+        for row in rows:
+            row.update(values)
+        return respond(request, rows)
+
+    @app.post("/rest/v1/rpc/{function}")
+    async def rpc(function: str):
+        await round_trip()
+        return JSONResponse(None)
+
+    return app
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Fake PostgREST server")
+    parser.add_argument("--port", type=int, default=9102)
+    parser.add_argument("--latency", type=float, default=FakeDBConfig.latency)
+    parser.add_argument("--jitter", type=float, default=FakeDBConfig.jitter)
+    args = parser.parse_args()
+
+    uvicorn.run(create_app(FakeDBConfig(args.latency, args.jitter)), host="127.0.0.1", port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
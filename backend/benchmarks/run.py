@@ -0,0 +1,402 @@
+# benchmarks/run.py
+#
+# Offline load test. Starts the fake Groq and PostgREST servers plus the real backend
+# (pointed at them), drives the hot paths at a fixed concurrency, and prints throughput
+# and p50/p95/p99 per scenario, compared against benchmarks/baseline.json.
+#
+#   cd backend
+#   python -m benchmarks.run                        # all scenarios, compare to baseline
+#   python -m benchmarks.run -s chat_test -c 32     # one scenario, more concurrency
+#   python -m benchmarks.run --save-baseline        # record the current numbers
+#
+# Exits with status 1 when a scenario regresses by more than --tolerance.
+
+import os
+import sys
+import json
+import time
+import uuid
+import socket
+import asyncio
+import argparse
+import tempfile
+import subprocess
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import httpx
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+SCENARIOS = ("upload_resume", "create_session", "chat_test", "webrtc_handshake")
+
+
+# --------------------------------------------------------------------------------------
+#  RESULTS
+# --------------------------------------------------------------------------------------
+@dataclass
+class ScenarioResult:
+    name: str
+    latencies: List[float] = field(default_factory=list)
+    errors: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def count(self) -> int:
+        return len(self.latencies) + self.errors
+
+    def percentile(self, q: float) -> float:
+        if not self.latencies:
+            return float("nan")
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, max(0, int(round(q * len(ordered))) - 1))]
+
+    def summary(self) -> dict:
+        return {
+            "requests": self.count,
+            "error_rate": round(self.errors / self.count, 4) if self.count else 0.0,
+            "rps": round(len(self.latencies) / self.elapsed, 2) if self.elapsed else 0.0,
+            "p50_ms": round(self.percentile(0.50) * 1000, 1),
+            "p95_ms": round(self.percentile(0.95) * 1000, 1),
+            "p99_ms": round(self.percentile(0.99) * 1000, 1),
+        }
+
+
+async def drive(name: str, operation: Callable[[int], Awaitable[None]], requests: int, concurrency: int) -> ScenarioResult:
+    """
+    Runs `operation(i)` for i in range(requests) with at most `concurrency` in flight.
+    An operation may return its own latency (to exclude setup it does first).
+    """
+    result = ScenarioResult(name)
+    counter = iter(range(requests))
+
+    async def worker():
+        for index in counter:
+            started = time.perf_counter()
+            try:
+                measured = await operation(index)
+                result.latencies.append(measured if measured is not None else time.perf_counter() - started)
+            except Exception as e:
+                result.errors += 1
+                if result.errors <= 3:
+                    print(f"   ! {name} #{index}: {e!r}")
+
+    started = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    result.elapsed = time.perf_counter() - started
+    return result
+
+
+# --------------------------------------------------------------------------------------
+#  PROCESSES
+# --------------------------------------------------------------------------------------
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_process(args: List[str], env: dict, log_path: str) -> subprocess.Popen:
+    log = open(log_path, "w")
+    return subprocess.Popen(args, cwd=BACKEND_DIR, env=env, stdout=log, stderr=subprocess.STDOUT)
+
+
+def wait_until_up(url: str, process: subprocess.Popen, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"{url} exited with code {process.returncode}")
+        try:
+            httpx.get(url, timeout=1.0)
+            return
+        except httpx.TransportError:
+            time.sleep(0.2)
+    raise RuntimeError(f"{url} did not come up within {timeout:.0f}s")
+
+
+class Stack:
+    """Fake Groq + fake PostgREST + the backend, as subprocesses."""
+
+    def __init__(self, args):
+        self.args = args
+        self.workdir = tempfile.mkdtemp(prefix="interviewer-bench-")
+        self.processes: List[subprocess.Popen] = []
+        self.groq_port, self.db_port, self.app_port = free_port(), free_port(), free_port()
+        self.base_url = f"http://127.0.0.1:{self.app_port}"
+
+    def __enter__(self) -> "Stack":
+        python = sys.executable
+        env = {**os.environ, "PYTHONUNBUFFERED": "1"}
+
+        groq = start_process([
+            python, "-m", "benchmarks.fake_groq", "--port", str(self.groq_port),
+            "--ttft", str(self.args.llm_ttft), "--token-delay", str(self.args.llm_token_delay),
+        ], env, os.path.join(self.workdir, "fake_groq.log"))
+        db = start_process([
+            python, "-m", "benchmarks.fake_postgrest", "--port", str(self.db_port),
+            "--latency", str(self.args.db_latency),
+        ], env, os.path.join(self.workdir, "fake_postgrest.log"))
+        self.processes += [groq, db]
+
+        backend_env = {
+            **env,
+            "SUPABASE_URL": f"http://127.0.0.1:{self.db_port}",
+            # supabase-py only checks that the key looks like a JWT
+            "SUPABASE_KEY": "eyJhbGciOiJIUzI1NiJ9.eyJyb2xlIjoiYmVuY2gifQ.bench",
+            "GROQ_API_KEY": "bench",
+            "GROQ_API_URL": f"http://127.0.0.1:{self.groq_port}/openai/v1/chat/completions",
+            "RESUME_CACHE_PATH": os.path.join(self.workdir, "resume_cache.sqlite3"),
+            "TRANSCRIBER_BACKEND": "echo",
+            # Measure the backend, not our own quota throttling
+            "RATE_LIMIT_RPM": "0",
+            "RATE_LIMIT_TPM": "0",
+        }
+        backend = start_process([
+            python, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(self.app_port),
+            "--log-level", "warning",
+        ], backend_env, os.path.join(self.workdir, "backend.log"))
+        self.processes.append(backend)
+
+        wait_until_up(f"http://127.0.0.1:{self.groq_port}/docs", groq)
+        wait_until_up(f"http://127.0.0.1:{self.db_port}/docs", db)
+        wait_until_up(f"{self.base_url}/readyz", backend)
+        print(f"🧪 Stack up (logs in {self.workdir})")
+        return self
+
+    def __exit__(self, *exc):
+        for process in reversed(self.processes):
+            process.terminate()
+        for process in self.processes:
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+
+# --------------------------------------------------------------------------------------
+#  SCENARIOS
+# --------------------------------------------------------------------------------------
+def make_pdfs(count: int) -> List[bytes]:
+    """Distinct PDFs so every upload misses the resume cache."""
+    import fitz
+
+    pdfs = []
+    for index in range(count):
+        doc = fitz.open()
+        page = doc.new_page()
+        page.insert_text((72, 72), "\n".join([
+            f"Candidate {index} {uuid.uuid4().hex[:8]}",
+            f"candidate{index}@example.com   +1 555 010 {index:04d}",
+            "SKILLS", "Python, FastAPI, PostgreSQL, Docker, Kubernetes",
+            "EXPERIENCE", "Backend Engineer, Example Corp (2022-2024)", "Built REST APIs serving 2k rps",
+            "PROJECTS", "Interview bot: WebRTC voice interviewer with LLM follow-ups",
+            "EDUCATION", "B.Tech Computer Science, 2022",
+        ]))
+        pdfs.append(doc.tobytes())
+        doc.close()
+    return pdfs
+
+
+async def create_interview(client: httpx.AsyncClient, resume_id: Optional[int] = None) -> str:
+    response = await client.post("/api/interview/create-session", json={
+        "user_id": "bench-user",
+        "role": "Backend Engineer",
+        "job_type": "job",
+        "rounds": ["Technical Deep Dive"],
+        "job_description": "Build and scale Python APIs.",
+        "resume_id": resume_id,
+    })
+    response.raise_for_status()
+    return response.json()["interview_id"]
+
+
+async def webrtc_handshake(ws_url: str, timeout: float = 15.0):
+    """Offer -> answer -> ICE connected, the way the frontend does it (non-trickle)."""
+    import websockets
+    from aiortc import RTCPeerConnection, RTCSessionDescription
+
+    pc = RTCPeerConnection()
+    connected = asyncio.Event()
+
+    @pc.on("connectionstatechange")
+    async def on_state():
+        if pc.connectionState == "connected":
+            connected.set()
+
+    try:
+        pc.addTransceiver("audio", direction="sendrecv")
+        async with websockets.connect(ws_url) as ws:
+            await pc.setLocalDescription(await pc.createOffer())
+            await ws.send(json.dumps({"type": "offer", "sdp": pc.localDescription.sdp}))
+
+            async def answer():
+                while True:
+                    message = json.loads(await ws.recv())
+                    if "sdp" in message:
+                        return message
+
+            reply = await asyncio.wait_for(answer(), timeout=timeout)
+            await pc.setRemoteDescription(RTCSessionDescription(sdp=reply["sdp"], type=reply["type"]))
+            await asyncio.wait_for(connected.wait(), timeout=timeout)
+    finally:
+        await pc.close()
+
+
+async def run_scenarios(stack: Stack, args) -> Dict[str, ScenarioResult]:
+    results: Dict[str, ScenarioResult] = {}
+    limits = httpx.Limits(max_connections=args.concurrency * 2)
+
+    async with httpx.AsyncClient(base_url=stack.base_url, timeout=60.0, limits=limits) as client:
+        # Interviews used by chat_test / webrtc_handshake (created outside the timed runs)
+        upload = await client.post(
+            "/api/resume/upload-resume",
+            files={"file": ("resume.pdf", make_pdfs(1)[0], "application/pdf")},
+            data={"user_id": "bench-user"},
+        )
+        resume_id = upload.json().get("resume_id")
+        interview_ids = [await create_interview(client, resume_id) for _ in range(max(args.concurrency, 4))]
+
+        if "upload_resume" in args.scenarios:
+            pdfs = make_pdfs(args.requests)
+
+            async def upload_resume(index: int):
+                response = await client.post(
+                    "/api/resume/upload-resume",
+                    files={"file": (f"resume-{index}.pdf", pdfs[index], "application/pdf")},
+                    data={"user_id": f"bench-user-{index % 8}"},
+                )
+                response.raise_for_status()
+                if response.json().get("status") != "success":
+                    raise RuntimeError(response.text[:200])
+
+            results["upload_resume"] = await drive("upload_resume", upload_resume, args.requests, args.concurrency)
+
+        if "create_session" in args.scenarios:
+            async def create_session(index: int):
+                await create_interview(client, resume_id)
+
+            results["create_session"] = await drive("create_session", create_session, args.requests, args.concurrency)
+
+        if "chat_test" in args.scenarios:
+            async def chat_test(index: int):
+                response = await client.post("/api/test/chat/test", json={
+                    "interview_id": interview_ids[index % len(interview_ids)],
+                    "user_message": "I built the ingestion pipeline and cut p95 latency in half.",
+                })
+                response.raise_for_status()
+
+            results["chat_test"] = await drive("chat_test", chat_test, args.requests, args.concurrency)
+
+    if "webrtc_handshake" in args.scenarios:
+        ws_base = stack.base_url.replace("http://", "ws://")
+        sessions = args.webrtc_sessions
+
+        async def handshake(index: int):
+            # Fresh interview per handshake so reconnect replacement doesn't skew the numbers
+            async with httpx.AsyncClient(base_url=stack.base_url, timeout=30.0) as client:
+                interview_id = await create_interview(client, resume_id)
+            started = time.perf_counter()
+            await webrtc_handshake(f"{ws_base}/ws/interview/{interview_id}")
+            return time.perf_counter() - started
+
+        results["webrtc_handshake"] = await drive(
+            "webrtc_handshake", handshake, sessions, min(args.concurrency, sessions)
+        )
+
+    return results
+
+
+# --------------------------------------------------------------------------------------
+#  REPORT
+# --------------------------------------------------------------------------------------
+def compare(summaries: Dict[str, dict], baseline: Dict[str, dict], tolerance: float) -> List[str]:
+    regressions = []
+    for name, current in summaries.items():
+        previous = baseline.get(name)
+        if not previous:
+            continue
+        for metric in ("p50_ms", "p95_ms"):
+            if previous[metric] and current[metric] > previous[metric] * (1 + tolerance):
+                regressions.append(f"{name}: {metric} {previous[metric]} -> {current[metric]}")
+        if previous["rps"] and current["rps"] < previous["rps"] * (1 - tolerance):
+            regressions.append(f"{name}: rps {previous['rps']} -> {current['rps']}")
+        if current["error_rate"] > previous["error_rate"] + 0.01:
+            regressions.append(f"{name}: error_rate {previous['error_rate']} -> {current['error_rate']}")
+    return regressions
+
+
+def run_config(args) -> dict:
+    """The options that shape the numbers; a baseline is only comparable under the same ones."""
+    return {
+        "concurrency": args.concurrency, "requests": args.requests, "webrtc_sessions": args.webrtc_sessions,
+        "llm_ttft": args.llm_ttft, "llm_token_delay": args.llm_token_delay, "db_latency": args.db_latency,
+    }
+
+
+def print_report(summaries: Dict[str, dict], baseline: Dict[str, dict]):
+    header = f"{'scenario':<18}{'reqs':>6}{'err%':>7}{'rps':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}   baseline p95"
+    print("\n" + header)
+    print("-" * len(header))
+    for name, s in summaries.items():
+        base = baseline.get(name, {}).get("p95_ms", "-")
+        print(f"{name:<18}{s['requests']:>6}{s['error_rate'] * 100:>6.1f}%{s['rps']:>9.1f}"
+              f"{s['p50_ms']:>10.1f}{s['p95_ms']:>10.1f}{s['p99_ms']:>10.1f}   {base}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline load test against fake Groq/Supabase")
+    parser.add_argument("-s", "--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("-c", "--concurrency", type=int, default=8)
+    parser.add_argument("-n", "--requests", type=int, default=100, help="requests per HTTP scenario")
+    parser.add_argument("--webrtc-sessions", type=int, default=20)
+    parser.add_argument("--llm-ttft", type=float, default=0.25)
+    parser.add_argument("--llm-token-delay", type=float, default=0.01)
+    parser.add_argument("--db-latency", type=float, default=0.03)
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative slowdown vs baseline")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true")
+    args = parser.parse_args()
+
+    stored = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            stored = json.load(f)
+    config = run_config(args)
+    same_config = stored.get("config", config) == config
+    if not same_config and not args.save_baseline:
+        differing = ", ".join(f"{key} {stored['config'].get(key)} -> {value}"
+                              for key, value in config.items() if stored["config"].get(key) != value)
+        print(f"❌ Baseline was recorded with different options ({differing}); not comparing.")
+        print("   Re-run with the baseline's options, or record a new baseline with --save-baseline.")
+        sys.exit(2)
+
+    with Stack(args) as stack:
+        results = asyncio.run(run_scenarios(stack, args))
+
+    summaries = {name: result.summary() for name, result in results.items()}
+    # Scenarios recorded under other options are not comparable (and are dropped when saving)
+    baseline = stored.get("scenarios", {}) if same_config else {}
+
+    print_report(summaries, baseline)
+
+    if args.save_baseline:
+        stored["config"] = config
+        stored["scenarios"] = {**baseline, **summaries}
+        with open(args.baseline, "w") as f:
+            json.dump(stored, f, indent=2)
+            f.write("\n")
+        print(f"\n💾 Baseline saved to {args.baseline}")
+        return
+
+    regressions = compare(summaries, baseline, args.tolerance)
+    if regressions:
+        print("\n❌ Regressions beyond {:.0%}:".format(args.tolerance))
+        for line in regressions:
+            print(f"   - {line}")
+        sys.exit(1)
+    print("\n✅ No regressions" if baseline else "\nℹ️ No baseline yet (run with --save-baseline)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,13 @@
 # main.py
-from fastapi import FastAPI
+from fastapi import FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response, JSONResponse
 from contextlib import asynccontextmanager
 
-# Database init
-from app.db.database import create_tables
+# Service container (clients are built lazily; schema setup is `python -m app.db.migrate`)
+from app.dependencies import services, get_services, ServiceContainer
+from app.utils.logging import configure_logging, TraceMiddleware
+from app.utils import metrics
 
 # Import Routes
 from app.routes.resume_routes import router as resume_router
@@ -14,8 +17,11 @@ from app.routes.test_routes import router as test_router
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    create_tables()
+    await services.startup()
     yield
+    await services.shutdown()
+
+configure_logging()
 
 app = FastAPI(title="Interviewer AI Backend", lifespan=lifespan)
 
@@ -30,7 +36,11 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Request-ID"],
 )
+app.add_middleware(metrics.MetricsMiddleware)
+# Added last so it runs first: everything below (including CORS) sees the trace id
+app.add_middleware(TraceMiddleware)
 
 # Register Routes
 app.include_router(resume_router, prefix="/api/resume", tags=["Resume Parsing"])
@@ -42,6 +52,21 @@ app.include_router(test_router, prefix="/api/test", tags=["Debug"])
 def read_root():
     return {"status": "Backend is running", "docs_url": "/docs"}
 
+@app.get("/healthz", tags=["Health"])
+def liveness():
+    """Liveness: the process is up and serving. Never touches external services."""
+    return {"status": "ok"}
+
+@app.get("/readyz", tags=["Health"])
+async def readiness(container: ServiceContainer = Depends(get_services)):
+    """Readiness: this worker should get traffic (started, configured, below capacity, DB reachable)."""
+    report = await container.readiness()
+    return JSONResponse(report, status_code=200 if report["ready"] else 503)
+
+@app.get("/metrics", include_in_schema=False)
+def prometheus_metrics():
+    return Response(metrics.registry.render(), media_type=metrics.CONTENT_TYPE)
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
@@ -0,0 +1,47 @@
+import asyncio
+
+from app.services import transcript_store as ts
+
+
+def test_append_during_flush_survives_a_crash(tmp_path, monkeypatch):
+    """An entry appended while a flush's upsert is in flight must still be replayed from the WAL."""
+
+    async def scenario():
+        written = asyncio.Event()
+        release = asyncio.Event()
+
+        async def slow_upsert(table, rows, **kwargs):
+            written.set()
+            await release.wait()
+
+        monkeypatch.setattr(ts.crud, "upsert", slow_upsert)
+        store = ts.TranscriptStore(wal_dir=str(tmp_path))
+        log = store.open("interview-1")
+        for text in ("one", "two", "three"):
+            store.append(log, "user", text)
+
+        flush = asyncio.create_task(store.flush(force=True))
+        await written.wait()
+        store.append(log, "assistant", "four")
+        release.set()
+        await flush
+
+        # Worker dies here: the WAL is all that is left
+        log._wal.close()
+        return log
+
+    log = asyncio.run(scenario())
+    assert [entry["text"] for entry in log.pending] == ["four"]
+    assert [entry["text"] for entry in ts.TranscriptStore._read_unflushed(log.wal_path)] == ["four"]
+
+
+def test_checkpoint_drops_flushed_entries(tmp_path):
+    log = ts.TranscriptLog("interview-2", str(tmp_path))
+    log.append("user", "hello")
+    log.append("user", "partial", final=False)
+    log.checkpoint(log.take_pending())
+    log.append("user", "partial answer", final=False)
+    log.append("user", "final answer")
+    log._wal.close()
+
+    assert [entry["text"] for entry in ts.TranscriptStore._read_unflushed(log.wal_path)] == ["final answer"]
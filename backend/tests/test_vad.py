@@ -0,0 +1,46 @@
+import numpy as np
+
+from app.services import vad
+from app.services.vad import VoiceActivityDetector, SPEECH_START
+
+RATE = 16000
+CHUNK = RATE // 10
+
+
+def _noise(n: int, amplitude: int) -> np.ndarray:
+    return (np.random.default_rng(0).standard_normal(n) * amplitude).astype(np.int16)
+
+
+def _tone(n: int) -> np.ndarray:
+    return (np.sin(2 * np.pi * 220 * np.arange(n) / RATE) * 8000).astype(np.int16)
+
+
+def test_speech_start_comes_with_the_gated_out_pre_roll():
+    detector = VoiceActivityDetector(RATE)
+    for _ in range(5):
+        forward, events = detector.process(_noise(CHUNK, 30))
+        assert not forward and not events
+
+    # The word starts in the last 40 ms of a chunk: too short to open the gate there
+    onset = np.concatenate((_noise(CHUNK - 640, 30), _tone(640)))
+    forward, events = detector.process(onset)
+    assert not forward
+
+    forward, events = detector.process(_tone(CHUNK))
+    assert forward and events == [SPEECH_START]
+    pre_roll = detector.take_pre_roll()
+    assert len(pre_roll) == RATE * vad.VAD_PRE_ROLL_MS // 1000
+    assert np.array_equal(pre_roll[-640:], onset[-640:])
+    assert len(detector.take_pre_roll()) == 0
+
+
+def test_forwarded_audio_is_not_replayed_as_pre_roll():
+    detector = VoiceActivityDetector(RATE)
+    detector.process(_noise(CHUNK, 30))
+    forward, events = detector.process(_tone(CHUNK))
+    assert events == [SPEECH_START]
+    detector.take_pre_roll()
+
+    forward, events = detector.process(_tone(CHUNK))
+    assert forward and not events
+    assert len(detector.take_pre_roll()) == 0
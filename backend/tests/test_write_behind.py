@@ -0,0 +1,74 @@
+import asyncio
+
+from app.db import crud
+
+
+class _APIError(Exception):
+    def __init__(self, code: str):
+        super().__init__(code)
+        self.code = code
+
+
+def _dropped(table: str, op: str) -> float:
+    return crud.WRITE_BEHIND_DROPPED._values.get((table, op), 0.0)
+
+
+def test_failing_update_is_dropped_after_max_attempts(monkeypatch):
+    async def scenario():
+        calls = []
+
+        async def failing_update(table, values, filters):
+            calls.append(values)
+            raise ConnectionError("PostgREST unreachable")
+
+        monkeypatch.setattr(crud, "update", failing_update)
+        queue = crud.WriteBehindQueue(max_attempts=3)
+        before = _dropped("wb_retry", "update")
+        flushed = []
+        for n in range(5):
+            queue.enqueue_update("wb_retry", {"id": 1}, {"n": n}, on_flushed=lambda: flushed.append(1))
+
+        for _ in range(3):
+            await queue.flush()
+
+        assert len(calls) == 3
+        assert calls[-1] == {"n": 4}
+        assert queue.pending == 0
+        assert _dropped("wb_retry", "update") == before + 1
+        assert not queue._on_flushed and not flushed
+
+    asyncio.run(scenario())
+
+
+def test_rejected_update_is_not_retried(monkeypatch):
+    async def scenario():
+        async def rejected_update(table, values, filters):
+            raise _APIError("PGRST204")
+
+        monkeypatch.setattr(crud, "update", rejected_update)
+        queue = crud.WriteBehindQueue()
+        before = _dropped("wb_rejected", "update")
+        queue.enqueue_update("wb_rejected", {"id": 1}, {"missing_column": 1})
+        await queue.flush()
+
+        assert queue.pending == 0
+        assert _dropped("wb_rejected", "update") == before + 1
+
+    asyncio.run(scenario())
+
+
+def test_on_flushed_runs_once_per_write(monkeypatch):
+    async def scenario():
+        async def ok_update(table, values, filters):
+            return [values]
+
+        monkeypatch.setattr(crud, "update", ok_update)
+        queue = crud.WriteBehindQueue()
+        flushed = []
+        for n in range(3):
+            queue.enqueue_update("wb_ok", {"id": 1}, {"n": n}, on_flushed=lambda: flushed.append(1))
+        await queue.flush()
+
+        assert flushed == [1]
+
+    asyncio.run(scenario())
@@ -9,6 +9,7 @@ export default function ActiveSession({ interviewId }: { interviewId: string })
   // Refs to hold connections across renders
   const socketRef = useRef<WebSocket | null>(null);
   const pcRef = useRef<RTCPeerConnection | null>(null);
+  const heartbeatRef = useRef<ReturnType<typeof setInterval> | null>(null);
 
   useEffect(() => {
     // Start the call immediately on mount
@@ -16,6 +17,7 @@ export default function ActiveSession({ interviewId }: { interviewId: string })
 
     // Cleanup function: Closes connections when leaving the page
     return () => {
+      if (heartbeatRef.current) clearInterval(heartbeatRef.current);
       if (socketRef.current) socketRef.current.close();
       if (pcRef.current) pcRef.current.close();
     };
@@ -47,6 +49,13 @@ export default function ActiveSession({ interviewId }: { interviewId: string })
       // 3. Setup WebRTC
       ws.onopen = async () => {
         setStatus("Connected! Starting Handshake...");
+
+        // Heartbeat: keeps the session from being reaped as idle between messages
+        heartbeatRef.current = setInterval(() => {
+          if (ws.readyState === WebSocket.OPEN) {
+            ws.send(JSON.stringify({ type: "ping" }));
+          }
+        }, 30000);
         
         const pc = new RTCPeerConnection({
           iceServers: [{ urls: "stun:stun.l.google.com:19302" }]
@@ -56,6 +65,14 @@ export default function ActiveSession({ interviewId }: { interviewId: string })
         // Add local tracks to PeerConnection
         stream.getTracks().forEach(track => pc.addTrack(track, stream));
 
+        // Play the interviewer's voice
+        pc.ontrack = (event) => {
+          if (event.track.kind !== "audio") return;
+          const audio = new Audio();
+          audio.srcObject = event.streams[0] ?? new MediaStream([event.track]);
+          audio.play().catch(err => console.error("Audio playback blocked:", err));
+        };
+
         // Create Offer
         const offer = await pc.createOffer();
         await pc.setLocalDescription(offer);